@@ -4,20 +4,32 @@ soy-server TCP 클라이언트. Worker CRUD + card_read 푸시.
 """
 from api.client import (
     WorkerCreateConflict,
+    WorkerDelta,
     WorkerNotFound,
+    cached_workers,
     create_worker,
+    create_workers,
     delete_worker,
+    export_workers_csv,
     get_first_admin_id,
+    import_workers_csv,
     list_workers,
+    sync_workers,
     update_worker,
 )
 
 __all__ = [
     "get_first_admin_id",
     "list_workers",
+    "sync_workers",
+    "cached_workers",
     "create_worker",
+    "create_workers",
     "update_worker",
     "delete_worker",
+    "import_workers_csv",
+    "export_workers_csv",
     "WorkerNotFound",
     "WorkerCreateConflict",
+    "WorkerDelta",
 ]
@@ -1,13 +1,29 @@
 """
-soy-server TCP 클라이언트. Worker CRUD + card_read 푸시 수신.
+soy-server TCP 클라이언트. Worker CRUD + card_read / worker_changed 푸시 수신.
 환경변수: SOY_SERVER_HOST(기본 127.0.0.1), SOY_SERVER_TCP_PORT(기본 9001).
+SOY_PC_PROTOCOL=msgpack 이면 접속 시 hello 로 길이 prefix MessagePack 프레임 전환을 요청 (서버가 거절하면 NDJSON 유지).
 """
-import json
 import logging
 import os
 import socket
 import threading
-from typing import Any, Callable
+import uuid
+from typing import Any, Callable, NamedTuple, TextIO
+
+from api.codec import (
+    HAS_MSGPACK,
+    PROTOCOL_MSGPACK,
+    PROTOCOL_NDJSON,
+    CardRead,
+    ExportChunk,
+    Hello,
+    Response,
+    WorkerChanged,
+    decode_message,
+    dumps,
+    pack,
+)
+from api.framing import DEFAULT_MAX_LINE, FrameReader, FramingError, LineFramer, frame
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +31,8 @@ logger = logging.getLogger(__name__)
 _HOST = os.environ.get("SOY_SERVER_HOST", "127.0.0.1")
 _PORT = int(os.environ.get("SOY_SERVER_TCP_PORT", "9001"))
 _TIMEOUT = 10.0
+_MAX_LINE = int(os.environ.get("SOY_PC_MAX_LINE", str(DEFAULT_MAX_LINE)))
+_PROTOCOL = os.environ.get("SOY_PC_PROTOCOL", PROTOCOL_NDJSON).strip().lower()
 
 
 def get_server_address() -> str:
@@ -22,13 +40,19 @@ def get_server_address() -> str:
     return f"{_HOST}:{_PORT}"
 
 _socket: socket.socket | None = None
+_wire_protocol = PROTOCOL_NDJSON  # 현재 연결에서 협상된 프로토콜
 _socket_lock = threading.Lock()
+# 여러 스레드가 동시에 요청해도 한 줄이 섞이지 않도록 전송 직렬화 (응답은 id로 매칭되므로 순서 무관)
+_send_lock = threading.Lock()
 _reader_thread: threading.Thread | None = None
 _request_id = 0
 _id_lock = threading.Lock()
 _pending: dict[int, tuple[threading.Event, list[tuple[bool, Any, str]]]] = {}
 _pending_lock = threading.Lock()
+# export_chunk 처럼 응답 전에 여러 번 오는 메시지를 받을 요청: id -> 콜백 (_pending_lock 으로 보호)
+_stream_handlers: dict[int, Callable[[str], None]] = {}
 _card_read_callback: Callable[[str], None] | None = None
+_worker_changed_callback: Callable[[], None] | None = None
 _reader_running = threading.Event()
 _auth_token: str | None = None
 _auth_token_lock = threading.Lock()
@@ -53,8 +77,38 @@ def _next_id() -> int:
         return _request_id
 
 
+def _encode(obj: Any) -> bytes:
+    if _wire_protocol == PROTOCOL_MSGPACK:
+        return frame(pack(obj))
+    return dumps(obj) + b"\n"
+
+
+def _handshake(s: socket.socket) -> tuple[str, LineFramer]:
+    """SOY_PC_PROTOCOL=msgpack 이면 hello 교환. (협상된 프로토콜, hello 이후 남은 바이트가 든 framer)."""
+    framer = LineFramer(_MAX_LINE)
+    if _PROTOCOL != PROTOCOL_MSGPACK or not HAS_MSGPACK:
+        return (PROTOCOL_NDJSON, framer)
+    s.sendall(dumps({"type": "hello", "protocol": PROTOCOL_MSGPACK}) + b"\n")
+    try:
+        while True:
+            chunk = s.recv(65536)
+            if not chunk:
+                raise ConnectionResetError("서버가 hello 응답 전에 연결을 닫았습니다.")
+            framer.feed(chunk)
+            while (line := framer.next_line()) is not None:
+                msg = decode_message(line)
+                if isinstance(msg, Hello):
+                    return (msg.protocol, framer)
+                # hello 응답 전에 도착한 푸시(card_read 등)
+                _dispatch_message(msg)
+    except socket.timeout:
+        # hello 를 모르는 이전 서버: NDJSON 유지
+        logger.warning("[TCP] no hello reply from server -> ndjson")
+        return (PROTOCOL_NDJSON, framer)
+
+
 def _ensure_connected() -> socket.socket:
-    global _socket, _reader_thread
+    global _socket, _reader_thread, _wire_protocol
     with _socket_lock:
         if _socket is not None:
             try:
@@ -90,77 +144,96 @@ def _ensure_connected() -> socket.socket:
                 ) from e
             s.close()
             raise
+        try:
+            protocol, framer = _handshake(s)
+        except OSError:
+            s.close()
+            raise
         s.settimeout(None)
         _socket = s
+        _wire_protocol = protocol
         _reader_running.set()
-        if _reader_thread is None or not _reader_thread.is_alive():
-            _reader_thread = threading.Thread(target=_reader_loop, daemon=True)
-            _reader_thread.start()
+        # 리더 스레드는 연결마다 하나 (이전 연결의 리더는 소켓이 닫히면 종료)
+        _reader_thread = threading.Thread(target=_reader_loop, args=(s, protocol, framer), daemon=True)
+        _reader_thread.start()
         return _socket
 
 
-def _reader_loop() -> None:
-    """한 줄씩 읽어 response면 pending에 넣고, card_read면 콜백. buf는 유지해 잘린 메시지 손실 방지."""
+def _dispatch_message(msg: Any) -> None:
+    """response면 pending에 넣고, card_read / worker_changed 면 콜백."""
+    if isinstance(msg, Response):
+        with _pending_lock:
+            if msg.id in _pending:
+                ev, res = _pending.pop(msg.id)
+                res.append((msg.ok, msg.body, msg.error or ""))
+                ev.set()
+    elif isinstance(msg, CardRead):
+        uid = msg.uid
+        logger.info("[RFID] card_read received from server uid=%r callback=%s", uid, _card_read_callback is not None)
+        if uid and _card_read_callback:
+            try:
+                _card_read_callback(uid)
+                logger.info("[RFID] card_read callback done uid=%r", uid)
+            except Exception as e:
+                logger.warning("[RFID] card_read callback error: %s", e)
+        elif not uid:
+            logger.warning("[RFID] card_read ignored: uid empty")
+        else:
+            logger.warning("[RFID] card_read ignored: no callback registered")
+    elif isinstance(msg, ExportChunk):
+        with _pending_lock:
+            handler = _stream_handlers.get(msg.id)
+        if handler:
+            handler(msg.csv)
+    elif isinstance(msg, WorkerChanged):
+        # 로컬 사본이 이미 이 버전이면 (내가 바꾼 뒤 동기화한 경우 등) 알리지 않음
+        if (msg.epoch, msg.version) == (_replica_epoch, _replica_version):
+            return
+        cb = _worker_changed_callback
+        if cb:
+            try:
+                cb()
+            except Exception as e:
+                logger.warning("[TCP] worker_changed callback error: %s", e)
+
+
+def _reader_loop(sock: socket.socket, protocol: str, framer: LineFramer) -> None:
+    """한 연결의 수신 루프. 잘린 메시지는 framer에 남아 다음 청크와 합쳐짐 (hello 이후 남은 바이트 포함)."""
     global _socket
-    buf = b""
+    frames: FrameReader | None = None
+    if protocol == PROTOCOL_MSGPACK:
+        frames = FrameReader(_MAX_LINE)
+        frames.feed(framer.take_pending())
     while _reader_running.is_set():
         try:
-            s = _socket
-            if s is None:
-                break
+            if frames is not None:
+                while (payload := frames.next_frame()) is not None:
+                    _dispatch_message(decode_message(payload, binary=True))
+            else:
+                while (line := framer.next_line()) is not None:
+                    _dispatch_message(decode_message(line))
             try:
-                chunk = s.recv(4096)
+                chunk = sock.recv(65536)
             except (ConnectionResetError, BrokenPipeError, OSError):
                 chunk = b""
             if not chunk:
                 break
-            buf += chunk
-            # 한 줄씩 처리 (나머지는 buf에 유지)
-            while b"\n" in buf:
-                line, buf = buf.split(b"\n", 1)
-                line_str = line.decode("utf-8", errors="ignore").strip()
-                if not line_str:
-                    continue
-                try:
-                    msg = json.loads(line_str)
-                except json.JSONDecodeError:
-                    continue
-                if not isinstance(msg, dict):
-                    continue
-                if msg.get("type") == "response":
-                    rid = msg.get("id")
-                    ok = msg.get("ok", False)
-                    body = msg.get("body")
-                    err = msg.get("error") or ""
-                    with _pending_lock:
-                        if rid in _pending:
-                            ev, res = _pending.pop(rid)
-                            res.append((ok, body, err))
-                            ev.set()
-                elif msg.get("type") == "card_read":
-                    uid = msg.get("uid") or ""
-                    logger.info("[RFID] card_read received from server uid=%r callback=%s", uid, _card_read_callback is not None)
-                    if uid and _card_read_callback:
-                        try:
-                            _card_read_callback(uid)
-                            logger.info("[RFID] card_read callback done uid=%r", uid)
-                        except Exception as e:
-                            logger.warning("[RFID] card_read callback error: %s", e)
-                    elif not uid:
-                        logger.warning("[RFID] card_read ignored: uid empty")
-                    else:
-                        logger.warning("[RFID] card_read ignored: no callback registered")
-            # 버퍼 비정상 증가 방지 (한 줄은 보통 수백 바이트 미만)
-            if len(buf) > 65536:
-                buf = b""
+            if frames is not None:
+                frames.feed(chunk)
+            else:
+                framer.feed(chunk)
+        except FramingError as e:
+            # 메시지 경계를 잃었으므로 이어서 읽지 않고 연결을 닫음 (다음 요청 시 재연결)
+            logger.warning("[TCP] %s -> reconnect", e)
+            break
         except Exception:
             break
     with _socket_lock:
-        if _socket:
-            try:
-                _socket.close()
-            except Exception:
-                pass
+        try:
+            sock.close()
+        except Exception:
+            pass
+        if _socket is sock:
             _socket = None
 
 
@@ -193,8 +266,11 @@ def admin_logout() -> None:
         set_auth_token(None)
 
 
-def _request(action: str, body: dict[str, Any]) -> tuple[bool, Any, str]:
-    """요청 한 번 보내고 응답 대기. (ok, body, error)."""
+def _request(
+    action: str, body: dict[str, Any], on_chunk: Callable[[str], None] | None = None
+) -> tuple[bool, Any, str]:
+    """요청 한 번 보내고 응답 대기. (ok, body, error).
+    on_chunk 가 있으면 응답 전에 오는 export_chunk 를 reader 스레드에서 넘겨주고, 조각이 오는 동안은 타임아웃을 연장."""
     body = dict(body)
     with _auth_token_lock:
         tok = _auth_token
@@ -203,20 +279,38 @@ def _request(action: str, body: dict[str, Any]) -> tuple[bool, Any, str]:
     req_id = _next_id()
     ev = threading.Event()
     res: list[tuple[bool, Any, str]] = []
+    chunks_seen = [0]
     with _pending_lock:
         _pending[req_id] = (ev, res)
+        if on_chunk is not None:
+
+            def handler(data: str) -> None:
+                chunks_seen[0] += 1
+                on_chunk(data)
+
+            _stream_handlers[req_id] = handler
     try:
-        sock = _ensure_connected()
-        req = {"type": "request", "id": req_id, "action": action, "body": body}
-        sock.sendall((json.dumps(req, ensure_ascii=False) + "\n").encode("utf-8"))
-    except Exception as e:
-        with _pending_lock:
-            _pending.pop(req_id, None)
-        raise
-    if not ev.wait(timeout=_TIMEOUT):
-        with _pending_lock:
-            _pending.pop(req_id, None)
-        raise TimeoutError("Server did not respond")
+        try:
+            sock = _ensure_connected()
+            req = {"type": "request", "id": req_id, "action": action, "body": body}
+            data = _encode(req)
+            with _send_lock:
+                sock.sendall(data)
+        except Exception as e:
+            with _pending_lock:
+                _pending.pop(req_id, None)
+            raise
+        seen = 0
+        while not ev.wait(timeout=_TIMEOUT):
+            if chunks_seen[0] == seen:
+                with _pending_lock:
+                    _pending.pop(req_id, None)
+                raise TimeoutError("Server did not respond")
+            seen = chunks_seen[0]
+    finally:
+        if on_chunk is not None:
+            with _pending_lock:
+                _stream_handlers.pop(req_id, None)
     if not res:
         return (False, None, "No response")
     ok, body, err = res[0]
@@ -229,6 +323,13 @@ def set_card_read_callback(cb: Callable[[str], None] | None) -> None:
     _card_read_callback = cb
 
 
+def set_worker_changed_callback(cb: Callable[[], None] | None) -> None:
+    """다른 PC 등에서 작업자가 바뀌었다는 푸시(worker_changed) 수신 시 호출할 콜백 (reader 스레드에서 호출).
+    콜백에서는 sync_workers 로 변경분을 가져오면 됨."""
+    global _worker_changed_callback
+    _worker_changed_callback = cb
+
+
 def admin_count() -> int:
     """관리자 수. 서버 연결 실패 시 예외."""
     ok, body, err = _request("admin_count", {})
@@ -269,6 +370,55 @@ def list_workers() -> list[dict]:
     return body if isinstance(body, list) else []
 
 
+class WorkerDelta(NamedTuple):
+    """sync_workers 결과. full 이면 사본을 통째로 바꾼 것 (upserts = 전체 목록, worker_id 순)."""
+    full: bool
+    upserts: list[dict]
+    deleted: list[int]
+
+
+# 작업자 목록 로컬 사본: worker_id -> worker. 서버의 (epoch, version) 기준으로 변경분만 받아 갱신
+_replica: dict[int, dict] = {}
+_replica_epoch = ""
+_replica_version = 0
+_replica_lock = threading.Lock()
+
+
+def sync_workers() -> WorkerDelta:
+    """로컬 작업자 사본을 서버와 맞추고 바뀐 부분 반환 (list_workers_since). 서버 재시작 등이면 전체 목록."""
+    global _replica_epoch, _replica_version
+    with _replica_lock:
+        ok, body, err = _request(
+            "list_workers_since", {"epoch": _replica_epoch, "version": _replica_version}
+        )
+        if not ok:
+            raise RuntimeError(err or "list_workers_since failed")
+        if not isinstance(body, dict):
+            raise RuntimeError("list_workers_since: invalid response")
+        if body.get("full"):
+            rows = body.get("workers") or []
+            _replica.clear()
+            _replica.update((w["worker_id"], w) for w in rows)
+            delta = WorkerDelta(True, rows, [])
+        else:
+            upserts = body.get("upserts") or []
+            deleted = body.get("deleted") or []
+            for w in upserts:
+                _replica[w["worker_id"]] = w
+            for wid in deleted:
+                _replica.pop(wid, None)
+            delta = WorkerDelta(False, upserts, deleted)
+        _replica_epoch = body.get("epoch") or ""
+        _replica_version = int(body.get("version") or 0)
+        return delta
+
+
+def cached_workers() -> list[dict]:
+    """마지막 sync_workers 기준 작업자 목록 (worker_id 순). 서버에 요청하지 않음."""
+    with _replica_lock:
+        return [_replica[k] for k in sorted(_replica)]
+
+
 def create_worker(admin_id: int, name: str, card_uid: str) -> dict:
     """작업자 등록. card_uid 중복 시 WorkerCreateConflict."""
     ok, body, err = _request(
@@ -282,6 +432,66 @@ def create_worker(admin_id: int, name: str, card_uid: str) -> dict:
     return body or {}
 
 
+def create_workers(admin_id: int, rows: list[tuple[str, str]]) -> dict:
+    """작업자 여러 명 일괄 등록 (서버에서 한 트랜잭션). rows = [(name, card_uid), ...].
+    반환: {"created": [작업자...], "conflicts": [{"index", "card_uid", "error"}...]}."""
+    ok, body, err = _request(
+        "create_workers",
+        {"admin_id": admin_id, "workers": [{"name": n, "card_uid": u} for n, u in rows]},
+    )
+    if not ok:
+        raise RuntimeError(err or "create_workers failed")
+    return body or {"created": [], "conflicts": []}
+
+
+_IMPORT_CHUNK_CHARS = 64 * 1024
+
+
+def import_workers_csv(
+    admin_id: int,
+    source: str | os.PathLike | TextIO,
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """CSV(name,card_uid) 파일 또는 텍스트 스트림을 나눠 보내 작업자 일괄 등록 (import_workers).
+    progress 가 있으면 chunk 마다 서버 응답 body 를 넘김.
+    반환: {"lines", "created", "conflicts": [{"line", "card_uid", "error"}...]}."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8-sig", newline="") as f:
+            return import_workers_csv(admin_id, f, progress)
+    import_id = uuid.uuid4().hex
+    conflicts: list[dict] = []
+    out: dict = {}
+    seq = 0
+    data = source.read(_IMPORT_CHUNK_CHARS)
+    while True:
+        nxt = source.read(_IMPORT_CHUNK_CHARS)
+        body: dict[str, Any] = {"import_id": import_id, "seq": seq, "csv": data, "final": not nxt}
+        if seq == 0:
+            body["admin_id"] = admin_id
+        ok, out, err = _request("import_workers", body)
+        if not ok:
+            raise RuntimeError(err or "import_workers failed")
+        conflicts.extend(out.get("conflicts") or [])
+        if progress:
+            progress(out)
+        if not nxt:
+            break
+        data = nxt
+        seq += 1
+    return {"lines": out.get("lines", 0), "created": out.get("created", 0), "conflicts": conflicts}
+
+
+def export_workers_csv(dest: str | os.PathLike | TextIO, header: bool = True) -> int:
+    """작업자 전체를 CSV 로 저장 (export_workers). 서버가 보내는 조각을 받는 대로 씀. 행 수 반환."""
+    if isinstance(dest, (str, os.PathLike)):
+        with open(dest, "w", encoding="utf-8", newline="") as f:
+            return export_workers_csv(f, header)
+    ok, body, err = _request("export_workers", {"header": header}, on_chunk=dest.write)
+    if not ok:
+        raise RuntimeError(err or "export_workers failed")
+    return int((body or {}).get("rows", 0))
+
+
 def update_worker(
     worker_id: int, *, name: str | None = None, card_uid: str | None = None
 ) -> dict:
@@ -308,3 +518,40 @@ def delete_worker(worker_id: int) -> None:
         if "not found" in (err or "").lower() or "찾을 수 없" in (err or ""):
             raise WorkerNotFound()
         raise RuntimeError(err or "delete_worker failed")
+
+
+def warehouse_stock() -> list[dict]:
+    """창고 현황. [{"product_id", "warehouse", "count"}]."""
+    ok, body, err = _request("warehouse_stock", {})
+    if not ok:
+        raise RuntimeError(err or "warehouse_stock failed")
+    return body if isinstance(body, list) else []
+
+
+def classify_box(inbound_item_id: int, warehouse: str) -> dict:
+    """미분류 상자 하나를 분류완료로 (warehouse: 국내 / 해외 / 미분류). 바뀐 상자
+    {"inbound_item_id", "inbound_id", "product_id", "status", "warehouse", "classified_at", "outbound_at"}.
+    없는 상자이거나 이미 분류된 상자면 RuntimeError."""
+    ok, body, err = _request("classify_box", {"inbound_item_id": inbound_item_id, "warehouse": warehouse})
+    if not ok:
+        raise RuntimeError(err or "classify_box failed")
+    return body or {}
+
+
+def ship_box(inbound_item_id: int) -> dict:
+    """분류완료 상자 하나를 출고됨으로 (창고 재고 -1). 바뀐 상자 (classify_box 와 같은 형식).
+    없는 상자이거나 분류완료가 아니면 RuntimeError."""
+    ok, body, err = _request("ship_box", {"inbound_item_id": inbound_item_id})
+    if not ok:
+        raise RuntimeError(err or "ship_box failed")
+    return body or {}
+
+
+def register_inbound(qr: str) -> dict:
+    """입고 송장 QR 원문으로 입고 등록 (inbound_id 기준 멱등).
+    {"inbound_id", "status", "boxes", "products": [{"product_id", "quantity"}], "created"}.
+    이미 등록된 송장이면 created=False 와 기존 내용."""
+    ok, body, err = _request("register_inbound", {"qr": qr})
+    if not ok:
+        raise RuntimeError(err or "register_inbound failed")
+    return body or {}
@@ -0,0 +1,195 @@
+"""
+NDJSON 메시지 JSON 코덱 (서버·Soy-PC 공통). soy-server/app/codec.py 와 동일하게 유지.
+
+설치된 라이브러리 중 orjson → msgspec → 표준 json 순으로 사용 (pyproject 의 `fast` extra).
+  loads(data)  bytes/str → 객체 (bytes 를 먼저 str 로 디코드하지 않음)
+  dumps(obj)   객체 → UTF-8 bytes (비ASCII 그대로, 공백 없음, 줄바꿈 미포함)
+decode_message(data) 는 hello / request / response / card_read / worker_changed / export_chunk 를 타입이 있는 메시지로 디코드.
+msgspec 이 있으면 디코드와 검증을 한 번에 수행하고, 없으면 loads 후 필드를 검사.
+MessagePack(바이너리 프레임 프로토콜)은 msgspec 또는 msgpack 패키지가 있을 때만 사용 가능 (HAS_MSGPACK).
+  pack(obj) / unpack(data), decode_message(data, binary=True)
+"""
+import functools
+import json
+from typing import Any, NamedTuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None  # type: ignore[assignment]
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    DecodeError: tuple[type[Exception], ...] = (orjson.JSONDecodeError,)
+
+    def loads(data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    DecodeError = (msgspec.DecodeError,)
+    _json_decoder = msgspec.json.Decoder()
+    _json_encoder = msgspec.json.Encoder()
+
+    def loads(data: bytes | str) -> Any:
+        return _json_decoder.decode(data)
+
+    def dumps(obj: Any) -> bytes:
+        return _json_encoder.encode(obj)
+
+else:
+    BACKEND = "json"
+    DecodeError = (json.JSONDecodeError, UnicodeDecodeError)
+
+    def loads(data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+PROTOCOL_NDJSON = "ndjson"
+PROTOCOL_MSGPACK = "msgpack"
+
+if msgspec is not None:
+    HAS_MSGPACK = True
+    pack = msgspec.msgpack.Encoder().encode
+    unpack = msgspec.msgpack.Decoder().decode
+else:
+    try:
+        import msgpack
+    except ImportError:
+        msgpack = None  # type: ignore[assignment]
+    HAS_MSGPACK = msgpack is not None
+    if msgpack is not None:
+        pack = functools.partial(msgpack.packb, use_bin_type=True)
+        unpack = functools.partial(msgpack.unpackb, raw=False)
+    else:
+
+        def pack(obj: Any) -> bytes:
+            raise RuntimeError("MessagePack 미지원 (msgspec 또는 msgpack 설치 필요)")
+
+        unpack = pack
+
+
+if msgspec is not None:
+
+    class Hello(msgspec.Struct, tag="hello", tag_field="type"):
+        protocol: str = PROTOCOL_NDJSON
+
+    class Request(msgspec.Struct, tag="request", tag_field="type"):
+        id: int | str | None = None
+        action: str = ""
+        body: dict[str, Any] | None = None
+
+    class Response(msgspec.Struct, tag="response", tag_field="type"):
+        id: int | str | None = None
+        ok: bool = False
+        body: Any = None
+        error: str | None = None
+
+    class CardRead(msgspec.Struct, tag="card_read", tag_field="type"):
+        uid: str = ""
+        source: str = ""
+
+    class WorkerChanged(msgspec.Struct, tag="worker_changed", tag_field="type"):
+        epoch: str = ""
+        version: int = 0
+
+    class ExportChunk(msgspec.Struct, tag="export_chunk", tag_field="type"):
+        id: int | str | None = None
+        csv: str = ""
+
+    _Message = Hello | Request | Response | CardRead | WorkerChanged | ExportChunk
+    _message_decoder = msgspec.json.Decoder(_Message)
+    _message_unpacker = msgspec.msgpack.Decoder(_Message)
+
+    def decode_message(
+        data: bytes | str, binary: bool = False
+    ) -> "Hello | Request | Response | CardRead | WorkerChanged | ExportChunk | None":
+        """한 줄(binary 면 MessagePack 프레임)을 메시지로 디코드. 형식이 틀리거나 알 수 없는 type 이면 None."""
+        try:
+            if binary:
+                return _message_unpacker.decode(data)
+            return _message_decoder.decode(data)
+        except (msgspec.DecodeError, msgspec.ValidationError):
+            return None
+
+else:
+
+    class Hello(NamedTuple):  # type: ignore[no-redef]
+        protocol: str = PROTOCOL_NDJSON
+
+    class Request(NamedTuple):  # type: ignore[no-redef]
+        id: int | str | None = None
+        action: str = ""
+        body: dict[str, Any] | None = None
+
+    class Response(NamedTuple):  # type: ignore[no-redef]
+        id: int | str | None = None
+        ok: bool = False
+        body: Any = None
+        error: str | None = None
+
+    class CardRead(NamedTuple):  # type: ignore[no-redef]
+        uid: str = ""
+        source: str = ""
+
+    class WorkerChanged(NamedTuple):  # type: ignore[no-redef]
+        epoch: str = ""
+        version: int = 0
+
+    class ExportChunk(NamedTuple):  # type: ignore[no-redef]
+        id: int | str | None = None
+        csv: str = ""
+
+    def decode_message(
+        data: bytes | str, binary: bool = False
+    ) -> "Hello | Request | Response | CardRead | WorkerChanged | ExportChunk | None":
+        """한 줄(binary 면 MessagePack 프레임)을 메시지로 디코드. 형식이 틀리거나 알 수 없는 type 이면 None."""
+        try:
+            obj = unpack(data) if binary else loads(data)
+        except Exception:
+            return None
+        if not isinstance(obj, dict):
+            return None
+        kind = obj.get("type")
+        if kind == "hello":
+            protocol = obj.get("protocol", PROTOCOL_NDJSON)
+            return Hello(protocol) if isinstance(protocol, str) else None
+        if kind == "request":
+            action = obj.get("action", "")
+            body = obj.get("body")
+            if not isinstance(action, str) or not (body is None or isinstance(body, dict)):
+                return None
+            return Request(obj.get("id"), action, body)
+        if kind == "response":
+            ok = obj.get("ok", False)
+            if not isinstance(ok, bool):
+                return None
+            return Response(obj.get("id"), ok, obj.get("body"), obj.get("error"))
+        if kind == "card_read":
+            uid = obj.get("uid", "")
+            source = obj.get("source", "")
+            if not isinstance(uid, str) or not isinstance(source, str):
+                return None
+            return CardRead(uid, source)
+        if kind == "worker_changed":
+            epoch = obj.get("epoch", "")
+            version = obj.get("version", 0)
+            if not isinstance(epoch, str) or not isinstance(version, int) or isinstance(version, bool):
+                return None
+            return WorkerChanged(epoch, version)
+        if kind == "export_chunk":
+            data = obj.get("csv", "")
+            return ExportChunk(obj.get("id"), data) if isinstance(data, str) else None
+        return None
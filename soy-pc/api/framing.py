@@ -0,0 +1,163 @@
+"""
+NDJSON 줄 단위 / 길이 prefix 프레이밍 (서버·Soy-PC 공통). soy-server/app/framing.py 와 동일하게 유지.
+
+수신 바이트를 bytearray 하나에 이어 붙이고 읽기 위치(_start)만 옮겨 가며 줄을 꺼냄.
+`buf = buf.split(b"\\n", 1)` 처럼 줄마다 남은 버퍼 전체를 복사하지 않고,
+소비한 앞부분은 버퍼 절반 이상이 찼을 때만 한 번에 잘라 냄 (분할 상환 O(n)).
+LF 탐색은 이전에 본 위치부터 이어서 하므로 긴 줄이 여러 청크로 나뉘어 와도 재탐색 없음.
+한 줄이 max_line 을 넘으면 LineTooLong (버퍼를 무한정 키우지 않음).
+
+MessagePack 프로토콜(hello 협상 후)은 4바이트 big-endian 길이 + 페이로드 프레임. FrameReader / frame().
+"""
+import struct
+
+DEFAULT_MAX_LINE = 8 * 1024 * 1024
+
+_LENGTH = struct.Struct(">I")
+
+
+class FramingError(ValueError):
+    """프레임 경계를 잃음. 호출 측은 연결을 끊어야 함."""
+
+
+class LineTooLong(FramingError):
+    """한 줄이 max_line 바이트를 넘음. 호출 측은 연결을 끊어야 함 (이후 버퍼 상태는 비워짐)."""
+
+    def __init__(self, size: int, max_line: int):
+        self.size = size
+        self.max_line = max_line
+        super().__init__(f"NDJSON line exceeds {max_line} bytes (got >= {size})")
+
+
+class LineFramer:
+    """바이트 스트림 → LF로 끝나는 줄(bytes, LF 제외).
+
+    사용:
+        framer.feed(chunk)
+        while (line := framer.next_line()) is not None:
+            ...
+    """
+
+    __slots__ = ("max_line", "_buf", "_start", "_scan")
+
+    def __init__(self, max_line: int = DEFAULT_MAX_LINE):
+        self.max_line = max_line
+        self._buf = bytearray()
+        self._start = 0  # 아직 꺼내지 않은 데이터의 시작
+        self._scan = 0  # _start 이후 이 위치 전까지는 LF 없음
+
+    def feed(self, data: bytes) -> None:
+        """수신한 바이트를 버퍼 끝에 추가."""
+        if data:
+            self._buf += data
+
+    def next_line(self) -> bytes | None:
+        """완성된 줄 하나 (LF 제외). 아직 없으면 None. 줄이 max_line 을 넘으면 LineTooLong."""
+        buf = self._buf
+        start = self._start
+        nl = buf.find(b"\n", self._scan)
+        if nl < 0:
+            pending = len(buf) - start
+            if pending > self.max_line:
+                self.clear()
+                raise LineTooLong(pending, self.max_line)
+            self._scan = len(buf)
+            self._compact()
+            return None
+        if nl - start > self.max_line:
+            self.clear()
+            raise LineTooLong(nl - start, self.max_line)
+        line = bytes(buf[start:nl])
+        self._start = self._scan = nl + 1
+        return line
+
+    def pending(self) -> int:
+        """아직 줄로 꺼내지 않은 바이트 수."""
+        return len(self._buf) - self._start
+
+    def take_pending(self) -> bytes:
+        """남은 바이트를 모두 꺼내고 버퍼를 비움 (hello 후 프레임 프로토콜로 전환할 때 사용)."""
+        rest = bytes(self._buf[self._start:])
+        self.clear()
+        return rest
+
+    def clear(self) -> None:
+        self._buf.clear()
+        self._start = self._scan = 0
+
+    def _compact(self) -> None:
+        """소비한 앞부분 제거. 다 읽었으면 비우고, 절반 이상 소비했을 때만 앞당김."""
+        start = self._start
+        if not start:
+            return
+        buf = self._buf
+        if start >= len(buf):
+            buf.clear()
+            self._start = self._scan = 0
+        elif start >= len(buf) // 2:
+            del buf[:start]
+            self._scan -= start
+            self._start = 0
+
+
+class FrameTooLarge(FramingError):
+    """길이 prefix 가 max_frame 을 넘음."""
+
+    def __init__(self, size: int, max_frame: int):
+        self.size = size
+        self.max_frame = max_frame
+        super().__init__(f"frame exceeds {max_frame} bytes (got {size})")
+
+
+def frame(payload: bytes) -> bytes:
+    """페이로드 앞에 4바이트 길이를 붙임."""
+    return _LENGTH.pack(len(payload)) + payload
+
+
+class FrameReader:
+    """바이트 스트림 → 길이 prefix 프레임의 페이로드(bytes). LineFramer 와 같은 버퍼 방식."""
+
+    __slots__ = ("max_frame", "_buf", "_start")
+
+    def __init__(self, max_frame: int = DEFAULT_MAX_LINE):
+        self.max_frame = max_frame
+        self._buf = bytearray()
+        self._start = 0
+
+    def feed(self, data: bytes) -> None:
+        if data:
+            self._buf += data
+
+    def next_frame(self) -> bytes | None:
+        """완성된 프레임 페이로드 하나. 아직 없으면 None. 길이가 max_frame 을 넘으면 FrameTooLarge."""
+        buf = self._buf
+        start = self._start
+        avail = len(buf) - start
+        if avail >= _LENGTH.size:
+            (size,) = _LENGTH.unpack_from(buf, start)
+            if size > self.max_frame:
+                self.clear()
+                raise FrameTooLarge(size, self.max_frame)
+            end = start + _LENGTH.size + size
+            if end <= len(buf):
+                payload = bytes(buf[start + _LENGTH.size : end])
+                self._start = end
+                return payload
+        self._compact()
+        return None
+
+    def clear(self) -> None:
+        self._buf.clear()
+        self._start = 0
+
+    def _compact(self) -> None:
+        start = self._start
+        if not start:
+            return
+        buf = self._buf
+        if start >= len(buf):
+            buf.clear()
+            self._start = 0
+        elif start >= len(buf) // 2:
+            del buf[:start]
+            self._start = 0
@@ -9,10 +9,11 @@ from db.admin import (
     hash_password,
     verify_admin_password,
 )
-from db.connection import get_connection
+from db.connection import close_pool, get_connection, pool_stats
 from db.worker import create_worker
 
 __all__ = [
+    "close_pool",
     "count_admins",
     "create_admin",
     "create_worker",
@@ -20,5 +21,6 @@ __all__ = [
     "get_first_admin_id",
     "get_first_admin_password_hash",
     "hash_password",
+    "pool_stats",
     "verify_admin_password",
 ]
@@ -1,12 +1,28 @@
 """
 DB 연결. 환경변수 SOY_DATABASE_URL 또는 MYSQL_* 사용.
+
+get_connection() 은 프로세스 공용 연결 풀에서 연결을 빌려 줌 (매번 TCP 연결·인증을 하지 않음).
+- 최대 SOY_PC_DB_POOL_SIZE 개까지 열고, 모두 사용 중이면 SOY_PC_DB_POOL_TIMEOUT 초까지 반납을 기다림.
+- 상태 확인: SOY_PC_DB_PING_IDLE 초 이상 쉬었던 연결은 빌려 주기 전에 ping, 실패하면 버리고 새로 연결.
+- 유휴 정리: SOY_PC_DB_POOL_IDLE 초 이상 쓰이지 않은 연결은 빌리거나 반납할 때 닫음 (백그라운드 스레드 없음).
+- 블록 안에서 예외가 나면 rollback 후 반납. rollback 조차 실패한 연결은 풀에 돌려놓지 않음 (올라가는 예외는 블록의 원래 예외).
+환경변수: SOY_PC_DB_POOL_SIZE(기본 4), SOY_PC_DB_POOL_TIMEOUT(초, 기본 10),
+          SOY_PC_DB_PING_IDLE(초, 기본 30), SOY_PC_DB_POOL_IDLE(초, 기본 300)
 """
+import atexit
 import os
+import threading
+import time
 from contextlib import contextmanager
 from typing import Generator
 
 import pymysql
 
+POOL_SIZE = max(1, int(os.environ.get("SOY_PC_DB_POOL_SIZE", "4")))
+POOL_TIMEOUT = float(os.environ.get("SOY_PC_DB_POOL_TIMEOUT", "10"))
+PING_IDLE = float(os.environ.get("SOY_PC_DB_PING_IDLE", "30"))
+IDLE_TIMEOUT = float(os.environ.get("SOY_PC_DB_POOL_IDLE", "300"))
+
 
 def _get_connection_params() -> dict:
     from urllib.parse import unquote
@@ -36,15 +52,144 @@ def _get_connection_params() -> dict:
     }
 
 
+def _close_quietly(conn: pymysql.Connection) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class _Pool:
+    """스레드 안전 연결 풀. 유휴 연결은 LIFO (최근 쓴 연결부터 재사용 → 오래된 연결이 자연스럽게 유휴 정리됨)."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: list[tuple[pymysql.Connection, float]] = []  # (연결, 마지막 반납 시각)
+        self._open = 0  # 빌려 준 연결 + 유휴 연결
+        self._cond = threading.Condition()
+        self.connects = 0
+        self.reuses = 0
+        self.ping_failures = 0
+        self.evicted = 0
+
+    def _evict_idle_locked(self, now: float) -> list[pymysql.Connection]:
+        """IDLE_TIMEOUT 을 넘긴 유휴 연결을 목록에서 빼서 반환 (닫기는 락 밖에서)."""
+        if IDLE_TIMEOUT < 0:
+            return []
+        keep = [(c, t) for c, t in self._idle if now - t < IDLE_TIMEOUT]
+        dead = [c for c, t in self._idle if now - t >= IDLE_TIMEOUT]
+        if dead:
+            self._idle = keep
+            self._open -= len(dead)
+            self.evicted += len(dead)
+            self._cond.notify(len(dead))
+        return dead
+
+    def acquire(self) -> pymysql.Connection:
+        deadline = time.monotonic() + POOL_TIMEOUT
+        with self._cond:
+            while True:
+                dead = self._evict_idle_locked(time.monotonic())
+                if self._idle:
+                    conn, last = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    conn, last = None, 0.0
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"DB 연결 풀 대기 시간 초과 ({POOL_TIMEOUT}s)")
+                self._cond.wait(remaining)
+        for c in dead:
+            _close_quietly(c)
+        try:
+            if conn is not None and PING_IDLE >= 0 and time.monotonic() - last >= PING_IDLE:
+                try:
+                    conn.ping(reconnect=False)
+                except Exception:
+                    self.ping_failures += 1
+                    _close_quietly(conn)
+                    conn = None
+            if conn is None:
+                conn = pymysql.connect(**_get_connection_params())
+                self.connects += 1
+            else:
+                self.reuses += 1
+            return conn
+        except BaseException:
+            self._discard_slot()
+            raise
+
+    def release(self, conn: pymysql.Connection) -> None:
+        now = time.monotonic()
+        with self._cond:
+            self._idle.append((conn, now))
+            dead = self._evict_idle_locked(now)
+            self._cond.notify()
+        for c in dead:
+            _close_quietly(c)
+
+    def discard(self, conn: pymysql.Connection) -> None:
+        _close_quietly(conn)
+        self._discard_slot()
+
+    def _discard_slot(self) -> None:
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def close_all(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify(len(idle))
+        for c, _ in idle:
+            _close_quietly(c)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "connects": self.connects,
+                "reuses": self.reuses,
+                "ping_failures": self.ping_failures,
+                "evicted": self.evicted,
+            }
+
+
+_pool = _Pool(POOL_SIZE)
+
+
 @contextmanager
 def get_connection() -> Generator[pymysql.Connection, None, None]:
-    params = _get_connection_params()
-    conn = pymysql.connect(**params)
+    conn = _pool.acquire()
     try:
         yield conn
         conn.commit()
     except Exception:
-        conn.rollback()
+        try:
+            conn.rollback()
+        except Exception:
+            _pool.discard(conn)
+        else:
+            _pool.release(conn)
         raise
-    finally:
-        conn.close()
+    except BaseException:
+        _pool.discard(conn)
+        raise
+    _pool.release(conn)
+
+
+def close_pool() -> None:
+    """유휴 연결을 모두 닫음 (앱 종료 시). 빌려 간 연결은 반납될 때 다시 풀에 들어감."""
+    _pool.close_all()
+
+
+atexit.register(close_pool)
+
+
+def pool_stats() -> dict:
+    return _pool.stats()
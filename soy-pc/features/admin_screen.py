@@ -1,4 +1,5 @@
 """관리자 화면 — 사이드바 메뉴, 작업자 관리(목록·CRUD). soy-server TCP 연동."""
+import bisect
 import os
 
 from PyQt6 import uic
@@ -14,10 +15,10 @@ from api import (
     create_worker as api_create_worker,
     delete_worker as api_delete_worker,
     get_first_admin_id,
-    list_workers,
+    sync_workers,
     update_worker as api_update_worker,
 )
-from api.client import admin_logout, set_card_read_callback
+from api.client import admin_logout, set_card_read_callback, set_worker_changed_callback
 from serial_rfid import SerialRFIDReader, get_register_serial_port
 
 _USE_SERVER_RFID = os.environ.get("SOY_USE_SERVER_RFID", "1").strip().lower() not in ("0", "false", "no")
@@ -28,6 +29,11 @@ class _CardReadBridge(QObject):
     card_uid_received = pyqtSignal(str)
 
 
+class _WorkerChangedBridge(QObject):
+    """서버 worker_changed 푸시 (TCP reader 스레드) → 메인 스레드에서 작업자 목록 갱신."""
+    changed = pyqtSignal()
+
+
 def _open_worker_info_dialog(
     parent,
     ui_dir: str,
@@ -131,20 +137,44 @@ def setup_admin_screen(window, stacked, ui_dir: str) -> None:
             return ""
         return created_at[:10] if len(created_at) >= 10 else created_at
 
+    def _set_worker_row(row: int, w: dict) -> None:
+        item0 = QTableWidgetItem(w.get("name", ""))
+        item0.setData(Qt.ItemDataRole.UserRole, w.get("worker_id"))
+        admin.workerTable.setItem(row, 0, item0)
+        admin.workerTable.setItem(row, 1, QTableWidgetItem(w.get("card_uid", "")))
+        admin.workerTable.setItem(row, 2, QTableWidgetItem(_format_created_at(w.get("created_at", ""))))
+
     def refresh_workers():
+        """서버와 작업자 사본을 맞추고 바뀐 행만 갱신 (테이블은 worker_id 순)."""
         try:
-            workers = list_workers()
+            delta = sync_workers()
         except (TimeoutError, RuntimeError, OSError, ConnectionError) as e:
             return  # 조용히 실패하거나 상태바에 표시 가능
-        admin.workerTable.setRowCount(0)
-        for w in workers:
-            row = admin.workerTable.rowCount()
-            admin.workerTable.insertRow(row)
-            item0 = QTableWidgetItem(w.get("name", ""))
-            item0.setData(Qt.ItemDataRole.UserRole, w.get("worker_id"))
-            admin.workerTable.setItem(row, 0, item0)
-            admin.workerTable.setItem(row, 1, QTableWidgetItem(w.get("card_uid", "")))
-            admin.workerTable.setItem(row, 2, QTableWidgetItem(_format_created_at(w.get("created_at", ""))))
+        table = admin.workerTable
+        if delta.full:
+            table.setRowCount(0)
+            table.setRowCount(len(delta.upserts))
+            for row, w in enumerate(delta.upserts):
+                _set_worker_row(row, w)
+            return
+        if not delta.upserts and not delta.deleted:
+            return
+        ids = []
+        for row in range(table.rowCount()):
+            item0 = table.item(row, 0)
+            ids.append(item0.data(Qt.ItemDataRole.UserRole) if item0 else None)
+        for wid in delta.deleted:
+            pos = bisect.bisect_left(ids, wid)
+            if pos < len(ids) and ids[pos] == wid:
+                table.removeRow(pos)
+                del ids[pos]
+        for w in delta.upserts:
+            wid = w.get("worker_id")
+            pos = bisect.bisect_left(ids, wid)
+            if not (pos < len(ids) and ids[pos] == wid):
+                table.insertRow(pos)
+                ids.insert(pos, wid)
+            _set_worker_row(pos, w)
 
     def on_worker_cell_clicked(row: int, _column: int):
         if row < 0:
@@ -172,6 +202,17 @@ def setup_admin_screen(window, stacked, ui_dir: str) -> None:
 
     stacked.currentChanged.connect(on_current_changed)
 
+    # 다른 PC에서 작업자를 바꾸면 서버가 worker_changed 를 푸시 → 관리자 화면이 열려 있으면 변경분만 반영
+    worker_changed_bridge = _WorkerChangedBridge(admin)
+    admin._worker_changed_bridge = worker_changed_bridge
+
+    def on_worker_changed():
+        if stacked.currentWidget() == admin:
+            refresh_workers()
+
+    worker_changed_bridge.changed.connect(on_worker_changed)
+    set_worker_changed_callback(worker_changed_bridge.changed.emit)
+
     def back_to_lock():
         admin_logout()
         stacked.setCurrentIndex(0)
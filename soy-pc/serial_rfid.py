@@ -3,12 +3,13 @@ Register Controller(Arduino + RFID) 시리얼 수신.
 NDJSON 프로토콜 파싱 (docs/soy-kit-protocol.md): 한 줄에 하나의 JSON.
 type=="card_read" 시 uid 시그널 발생.
 """
-import json
 import os
 from typing import Any, Optional
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from api.codec import DecodeError, loads
+
 # pyserial은 run 시점에 import (의존성은 pyproject.toml에 있음)
 try:
     import serial
@@ -25,16 +26,17 @@ DEFAULT_BAUD = 9600
 SOURCE_REGISTER_CONTROLLER = "register_controller"
 
 
-def parse_kit_message(line: str) -> Optional[dict[str, Any]]:
+def parse_kit_message(line: str | bytes) -> Optional[dict[str, Any]]:
     """
     NDJSON 한 줄을 파싱. type, source 가 있으면 메시지 dict 반환, 아니면 None.
+    bytes 는 str 로 디코드하지 않고 바로 파싱.
     """
     line = line.strip()
     if not line:
         return None
     try:
-        obj = json.loads(line)
-    except json.JSONDecodeError:
+        obj = loads(line)
+    except DecodeError:
         return None
     if not isinstance(obj, dict):
         return None
@@ -98,7 +100,7 @@ class SerialRFIDReader(QThread):
         try:
             while self._running:
                 try:
-                    line = ser.readline().decode("utf-8", errors="ignore").strip()
+                    line = ser.readline()
                 except Exception:
                     continue
                 msg = parse_kit_message(line)
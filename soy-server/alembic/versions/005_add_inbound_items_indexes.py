@@ -0,0 +1,56 @@
+"""add inbound_items indexes for 창고 현황 / 입고별 진행률 / 기간 조회
+
+  1) 창고 현황: WHERE status='분류완료' GROUP BY product_id, warehouse
+     → (status, product_id, warehouse). 세 열 모두 인덱스에 있어 테이블 행을 읽지 않음 (covering).
+  2) 입고 건별 진행률: WHERE inbound_id=? GROUP BY status → (inbound_id, status).
+     inbound_id 로 시작하므로 FK(fk_inbound_items_inbound)용으로 자동 생성된 인덱스를 대신함 (MySQL 이 자동 인덱스 제거).
+  3) 기간 리포트: WHERE classified_at BETWEEN ... → (classified_at).
+벤치마크: soy-server 에서 `uv run python -m bench.inbound_queries` (1M 상자 시드 후 쿼리 지연 측정).
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 한 번의 ALTER 로 세 인덱스 생성 (테이블 스캔 1회, 온라인 DDL)
+    op.execute("""
+        ALTER TABLE `inbound_items`
+            ADD KEY `idx_inbound_items_status_product_warehouse` (`status`, `product_id`, `warehouse`),
+            ADD KEY `idx_inbound_items_inbound_status` (`inbound_id`, `status`),
+            ADD KEY `idx_inbound_items_classified_at` (`classified_at`),
+            ALGORITHM=INPLACE, LOCK=NONE
+    """)
+
+
+def downgrade() -> None:
+    # FK 가 쓰던 inbound_id 인덱스를 먼저 되살려야 (inbound_id, status) 를 지울 수 있음
+    has_fk_index = op.get_bind().execute(
+        text(
+            "SELECT COUNT(*) FROM information_schema.STATISTICS"
+            " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'inbound_items'"
+            " AND INDEX_NAME = 'fk_inbound_items_inbound'"
+        )
+    ).scalar()
+    if not has_fk_index:
+        op.execute("""
+            ALTER TABLE `inbound_items`
+                ADD KEY `fk_inbound_items_inbound` (`inbound_id`),
+                ALGORITHM=INPLACE, LOCK=NONE
+        """)
+    op.execute("""
+        ALTER TABLE `inbound_items`
+            DROP KEY `idx_inbound_items_classified_at`,
+            DROP KEY `idx_inbound_items_inbound_status`,
+            DROP KEY `idx_inbound_items_status_product_warehouse`
+    """)
@@ -0,0 +1,47 @@
+"""create warehouse_stock (창고 현황 집계 테이블)
+
+창고 현황(분류완료 상자 수, product_id·warehouse 별)을 inbound_items 전체 COUNT 대신 이 테이블에서 읽음.
+상자 상태가 바뀌는 트랜잭션 안에서 app.inventory 가 box_count 를 ±1 하고,
+app.inventory 의 reconcile 작업이 주기적으로 inbound_items 기준으로 다시 맞춤.
+생성 시 현재 inbound_items 로 한 번 채움.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("SET NAMES utf8mb4")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS `warehouse_stock` (
+            `product_id` INT UNSIGNED NOT NULL COMMENT '물품',
+            `warehouse`  ENUM('국내', '해외', '미분류') NOT NULL COMMENT '창고',
+            `box_count`  INT UNSIGNED NOT NULL DEFAULT 0 COMMENT '분류완료 상자 수',
+            `updated_at` DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (`product_id`, `warehouse`),
+            CONSTRAINT `fk_warehouse_stock_product` FOREIGN KEY (`product_id`) REFERENCES `products` (`product_id`) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # 현재 상태로 채움 (005 의 (status, product_id, warehouse) 인덱스만 읽음)
+    op.execute("""
+        INSERT INTO `warehouse_stock` (`product_id`, `warehouse`, `box_count`)
+        SELECT `product_id`, `warehouse`, COUNT(*)
+        FROM `inbound_items`
+        WHERE `status` = '분류완료' AND `warehouse` IS NOT NULL
+        GROUP BY `product_id`, `warehouse`
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS `warehouse_stock`")
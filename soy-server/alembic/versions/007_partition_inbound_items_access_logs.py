@@ -0,0 +1,112 @@
+"""partition inbound_items / access_logs by month
+
+  - access_logs: RANGE COLUMNS(checked_at), 월 단위. PK 를 (access_log_id, checked_at) 로.
+  - inbound_items: 분류 전 상자는 classified_at 이 NULL 이라 파티션 키로 바로 쓸 수 없어
+    STORED 생성 열 part_key = IFNULL(classified_at, '1000-01-01') 로 RANGE COLUMNS(part_key), 월 단위.
+    미분류 상자는 p_none, 분류되면 해당 월 파티션으로 이동. PK 를 (inbound_item_id, part_key) 로.
+    기간 조회에서 파티션 pruning 을 받으려면 classified_at 대신(또는 함께) part_key 로 조건을 걸 것.
+  - MySQL 은 파티션 테이블에 FOREIGN KEY 를 허용하지 않으므로 두 테이블의 FK 를 제거
+    (inbound_items → inbounds/products, access_logs → workers). 참조 무결성은 애플리케이션에서 유지.
+  - 파티션은 가장 오래된 데이터의 달부터 이번 달 + FUTURE_MONTHS 까지 만들고, 나머지는 pmax.
+    이후 달 추가·오래된 파티션 보관은 `python -m app.partitions ensure | archive` (entrypoint 에서 ensure 실행).
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FUTURE_MONTHS = 3
+NONE_KEY = "1000-01-01 00:00:00"  # 미분류 상자의 part_key
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def _monthly_partitions(first: date | None) -> list[str]:
+    today = date.today().replace(day=1)
+    month = min(first.replace(day=1), today) if first else today
+    last = today
+    for _ in range(FUTURE_MONTHS):
+        last = _next_month(last)
+    parts = []
+    while month <= last:
+        nxt = _next_month(month)
+        parts.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{nxt:%Y-%m-%d}')")
+        month = nxt
+    parts.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+    return parts
+
+
+def _first_month(sql: str) -> date | None:
+    v = op.get_bind().execute(text(sql)).scalar()
+    return v.date() if hasattr(v, "date") else None
+
+
+def upgrade() -> None:
+    # access_logs
+    op.execute("ALTER TABLE `access_logs` DROP FOREIGN KEY `fk_access_log_worker`")
+    op.execute("ALTER TABLE `access_logs` DROP PRIMARY KEY, ADD PRIMARY KEY (`access_log_id`, `checked_at`)")
+    parts = _monthly_partitions(_first_month("SELECT MIN(`checked_at`) FROM `access_logs`"))
+    op.execute(
+        "ALTER TABLE `access_logs` PARTITION BY RANGE COLUMNS(`checked_at`) (\n    "
+        + ",\n    ".join(parts)
+        + "\n)"
+    )
+
+    # inbound_items
+    op.execute(
+        "ALTER TABLE `inbound_items`"
+        " DROP FOREIGN KEY `fk_inbound_items_inbound`,"
+        " DROP FOREIGN KEY `fk_inbound_items_product`"
+    )
+    op.execute(f"""
+        ALTER TABLE `inbound_items`
+            ADD COLUMN `part_key` DATETIME
+                GENERATED ALWAYS AS (IFNULL(`classified_at`, '{NONE_KEY}')) STORED NOT NULL
+                COMMENT '파티션 키 (미분류면 {NONE_KEY[:10]})' AFTER `classified_at`,
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (`inbound_item_id`, `part_key`)
+    """)
+    parts = _monthly_partitions(
+        _first_month("SELECT MIN(`classified_at`) FROM `inbound_items`")
+    )
+    parts.insert(0, "PARTITION p_none VALUES LESS THAN ('1000-01-02')")
+    op.execute(
+        "ALTER TABLE `inbound_items` PARTITION BY RANGE COLUMNS(`part_key`) (\n    "
+        + ",\n    ".join(parts)
+        + "\n)"
+    )
+
+
+def downgrade() -> None:
+    # 보관(archive)으로 빠진 행은 되돌리지 않음. FK 재생성은 고아 행이 있으면 실패하므로 먼저 정리 필요
+    op.execute("ALTER TABLE `inbound_items` REMOVE PARTITIONING")
+    op.execute("""
+        ALTER TABLE `inbound_items`
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (`inbound_item_id`),
+            DROP COLUMN `part_key`
+    """)
+    op.execute(
+        "ALTER TABLE `inbound_items`"
+        " ADD CONSTRAINT `fk_inbound_items_inbound` FOREIGN KEY (`inbound_id`) REFERENCES `inbounds` (`inbound_id`) ON DELETE CASCADE,"
+        " ADD CONSTRAINT `fk_inbound_items_product` FOREIGN KEY (`product_id`) REFERENCES `products` (`product_id`) ON DELETE CASCADE"
+    )
+
+    op.execute("ALTER TABLE `access_logs` REMOVE PARTITIONING")
+    op.execute("ALTER TABLE `access_logs` DROP PRIMARY KEY, ADD PRIMARY KEY (`access_log_id`)")
+    op.execute(
+        "ALTER TABLE `access_logs` ADD CONSTRAINT `fk_access_log_worker` "
+        "FOREIGN KEY (`worker_id`) REFERENCES `workers` (`worker_id`) ON DELETE RESTRICT ON UPDATE CASCADE"
+    )
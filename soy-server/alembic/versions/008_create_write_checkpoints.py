@@ -0,0 +1,35 @@
+"""create write_checkpoints (지연 기록 writer 의 마지막 반영 순번)
+
+app.classifier 는 분류 판정을 로컬 스풀 파일에 순번과 함께 남긴 뒤 묶어서 inbound_items 에 반영함.
+묶음을 반영하는 트랜잭션 안에서 여기의 last_seq 를 같이 올리므로, 재시작 후 스풀을 다시 읽어도
+이미 반영한 판정(seq <= last_seq)은 건너뜀 (상자가 두 번 분류되지 않음).
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("SET NAMES utf8mb4")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS `write_checkpoints` (
+            `writer`     VARCHAR(32)     NOT NULL COMMENT 'writer 이름 (classifier 등)',
+            `last_seq`   BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT '마지막으로 반영한 스풀 순번',
+            `updated_at` DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (`writer`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS `write_checkpoints`")
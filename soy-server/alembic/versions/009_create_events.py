@@ -0,0 +1,74 @@
+"""create events (S-04 작업 로그, append-only)
+
+출입·재고 변동·작업 시작/종료·작업 단계·물품 인식·카운팅 등 작업 이벤트를 한 테이블에 시간순으로 쌓음.
+서버의 app.events 가 메모리 버퍼에 모았다가 묶어서 INSERT (행 수정·삭제 없음).
+  - S-05 조회 조건(기간·작업자·물품)용 인덱스: (kind, created_at), (worker_id, created_at), (product_id, created_at).
+  - access_logs 처럼 RANGE COLUMNS(created_at) 월 파티션. PK 는 (event_id, created_at).
+    이후 달 추가·오래된 파티션 보관은 `python -m app.partitions ensure | archive`.
+  - 세부 내용(창고, 증감, 카드 UID 등)은 detail(JSON).
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FUTURE_MONTHS = 3
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def _monthly_partitions() -> list[str]:
+    month = date.today().replace(day=1)
+    last = month
+    for _ in range(FUTURE_MONTHS):
+        last = _next_month(last)
+    parts = []
+    while month <= last:
+        nxt = _next_month(month)
+        parts.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{nxt:%Y-%m-%d}')")
+        month = nxt
+    parts.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+    return parts
+
+
+def upgrade() -> None:
+    op.execute("SET NAMES utf8mb4")
+
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS `events` (
+            `event_id`   BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+            `created_at` DATETIME(3)     NOT NULL COMMENT '발생 시각 (기록 시각 아님)',
+            `kind`       VARCHAR(32)     NOT NULL COMMENT 'access, stock, inbound, work_start, work_end, step, recognition, counting',
+            `source`     VARCHAR(32)     NULL COMMENT '발생 위치 (server, pc, kit:<주소> 등)',
+            `worker_id`  INT UNSIGNED    NULL,
+            `product_id` INT UNSIGNED    NULL,
+            `inbound_id` INT UNSIGNED    NULL,
+            `detail`     JSON            NULL,
+            PRIMARY KEY (`event_id`, `created_at`),
+            KEY `idx_events_kind_created` (`kind`, `created_at`),
+            KEY `idx_events_worker_created` (`worker_id`, `created_at`),
+            KEY `idx_events_product_created` (`product_id`, `created_at`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        PARTITION BY RANGE COLUMNS(`created_at`) (
+            """
+        + ",\n            ".join(_monthly_partitions())
+        + """
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS `events`")
@@ -0,0 +1,82 @@
+"""
+관리자 자격 정보 캐시. admin 테이블의 첫 번째 admin(admin_id, password_hash)과 레코드 수를 한 번의 쿼리로 읽어 보관.
+admin_login / admin_count / get_first_admin_id 는 캐시에서 답하고, 만료(SOY_ADMIN_CACHE_TTL 초, 기본 60)되었거나
+invalidate() 후에만 DB를 다시 읽음. 동시에 여러 요청이 만료를 보더라도 DB 조회는 한 번만 수행.
+register_first_admin 처럼 이 프로세스에서 admin 을 바꾸면 invalidate() 호출. 다른 프로세스가 바꾼 경우는 TTL 후 반영.
+환경변수: SOY_ADMIN_CACHE_TTL (0이면 매번 DB 조회)
+"""
+import asyncio
+import os
+import time
+from typing import NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app import repository
+from app.database import get_engine
+
+TTL = float(os.environ.get("SOY_ADMIN_CACHE_TTL", "60"))
+
+
+class AdminSnapshot(NamedTuple):
+    count: int
+    admin_id: int | None
+    password_hash: str | None
+
+
+_snapshot: AdminSnapshot | None = None
+_loaded_at = 0.0
+_generation = 0  # invalidate() 마다 증가. 조회 도중 무효화되면 그 결과는 저장하지 않음
+_lock = asyncio.Lock()
+
+
+def load_tx(conn: Connection) -> AdminSnapshot:
+    """DB에서 admin 수와 첫 번째 admin 을 한 번에 조회."""
+    row = conn.execute(
+        text(
+            "SELECT c.n, a.admin_id, a.password_hash"
+            " FROM (SELECT COUNT(*) AS n, MIN(admin_id) AS first_id FROM admin) c"
+            " LEFT JOIN admin a ON a.admin_id = c.first_id"
+        )
+    ).fetchone()
+    if not row or not row[0]:
+        return AdminSnapshot(0, None, None)
+    return AdminSnapshot(int(row[0]), int(row[1]), row[2] or None)
+
+
+def load(engine: Engine | None = None) -> AdminSnapshot:
+    eng = engine or get_engine()
+    with eng.connect() as conn:
+        return load_tx(conn)
+
+
+def _fresh() -> AdminSnapshot | None:
+    if _snapshot is not None and time.monotonic() - _loaded_at < TTL:
+        return _snapshot
+    return None
+
+
+async def get() -> AdminSnapshot:
+    """캐시된 admin 정보. 만료되었으면 DB에서 다시 읽음 (app.repository)."""
+    global _snapshot, _loaded_at
+    snap = _fresh()
+    if snap is not None:
+        return snap
+    async with _lock:
+        snap = _fresh()
+        if snap is not None:
+            return snap
+        generation = _generation
+        snap = await repository.read(load_tx)
+        if generation == _generation:
+            _snapshot = snap
+            _loaded_at = time.monotonic()
+        return snap
+
+
+def invalidate() -> None:
+    """다음 get() 에서 DB를 다시 읽게 함."""
+    global _snapshot, _generation
+    _snapshot = None
+    _generation += 1
@@ -1,49 +1,46 @@
 """
 관리자 비밀번호 검증·최초 등록. DB의 admin 테이블 사용.
+DB 작업은 app.repository (비동기 드라이버 또는 DB 스레드풀), bcrypt 는 해시 전용 풀(app.hashing)에서 실행.
+로그인 검증에 쓰는 password_hash 는 app.admin_cache 에서 읽음.
 """
-import bcrypt
 from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
 
+from app import admin_cache, hashing, repository
 from app.database import get_engine
 
-BCRYPT_MAX_BYTES = 72
-
-
-def _password_bytes(plain: str) -> bytes:
-    return plain.encode("utf-8")[:BCRYPT_MAX_BYTES]
-
-
-def create_first_admin(plain_password: str) -> None:
-    """admin 테이블이 비어 있을 때만 첫 관리자 등록. 이미 있으면 ValueError."""
-    engine = get_engine()
-    with engine.connect() as conn:
-        n = conn.execute(text("SELECT COUNT(*) FROM admin")).scalar()
-        if n and n > 0:
-            raise ValueError("이미 관리자가 등록되어 있습니다.")
-    hashed = bcrypt.hashpw(
-        _password_bytes(plain_password.strip()),
-        bcrypt.gensalt(),
-    ).decode("ascii")
-    with engine.begin() as conn:
-        conn.execute(
-            text("INSERT INTO admin (password_hash) VALUES (:h)"),
-            {"h": hashed},
-        )
-
-
-def verify_admin_password(plain: str) -> bool:
-    """DB 첫 번째 admin의 password_hash와 일치하면 True."""
-    engine = get_engine()
-    with engine.connect() as conn:
-        row = conn.execute(
-            text("SELECT password_hash FROM admin ORDER BY admin_id LIMIT 1")
-        ).fetchone()
-    if not row:
-        return False
-    stored = row[0]
-    if not stored:
-        return False
+
+def insert_first_admin_tx(conn: Connection, password_hash: str) -> None:
+    """admin 테이블이 비어 있을 때만 해시를 저장. 이미 있으면 ValueError."""
+    n = conn.execute(text("SELECT COUNT(*) FROM admin")).scalar()
+    if n and n > 0:
+        raise ValueError("이미 관리자가 등록되어 있습니다.")
+    conn.execute(
+        text("INSERT INTO admin (password_hash) VALUES (:h)"),
+        {"h": password_hash},
+    )
+
+
+def insert_first_admin(password_hash: str, engine: Engine | None = None) -> None:
+    eng = engine or get_engine()
+    with eng.begin() as conn:
+        insert_first_admin_tx(conn, password_hash)
+
+
+async def create_first_admin(plain_password: str) -> None:
+    """admin 테이블이 비어 있을 때만 첫 관리자 등록. 이미 있으면 ValueError, 해시 풀이 가득 차면 HashingBusy."""
+    if (await admin_cache.get()).count > 0:
+        raise ValueError("이미 관리자가 등록되어 있습니다.")
+    hashed = await hashing.hashpw(plain_password.strip())
     try:
-        return bcrypt.checkpw(_password_bytes(plain), stored.encode("ascii"))
-    except Exception:
+        await repository.write(insert_first_admin_tx, hashed)
+    finally:
+        admin_cache.invalidate()
+
+
+async def verify_admin_password(plain: str) -> bool:
+    """DB 첫 번째 admin의 password_hash와 일치하면 True. 해시 풀이 가득 차면 HashingBusy."""
+    stored = (await admin_cache.get()).password_hash
+    if not stored:
         return False
+    return await hashing.checkpw(plain, stored)
@@ -0,0 +1,465 @@
+"""
+분류 판정 — 분류키트(SoyController)가 읽은 상자 QR 로 국내/해외 창고를 결정 (app.kit_bridge 의 classify 요청).
+
+- 판정은 메모리의 products 사본만 사용 ((물품명, 브랜드) → (product_id, shipping_destination), 마이그레이션 003 데이터).
+  이벤트 루프에서 dict 조회 한 번이라 DB 상태와 무관하게 수 µs. 모르는 물품이면 '미분류'.
+- inbound_items 반영(미분류 → 분류완료, 창고 재고 +1)은 응답 뒤 비동기로 (write-behind):
+  판정마다 순번(seq, 마이크로초 시각 기반이라 재시작해도 증가)을 붙여 스풀 파일(SPOOL_PATH)에 한 줄 append 한 뒤
+  메모리 대기열에 넣음. writer 태스크는 WRITE_BATCH 건이 모이거나 FLUSH_MS 가 지나면 스풀을 fsync 하고
+  한 트랜잭션으로 inventory.classify_boxes_tx + write_checkpoints.last_seq 갱신 (마이그레이션 008).
+  DB 오류면 같은 묶음을 간격을 늘려 가며 다시 시도 (판정은 버리지 않음).
+- 메모리 대기열은 QUEUE_MAX 건까지. 넘으면 판정은 스풀에만 남기고(spilled), 대기열이 비면 writer 가 스풀에서 다시 읽음.
+  밀린 판정이 QUEUE_MAX 이상이면 classify 응답에 backpressure=true (키트는 컨베이어를 늦춤),
+  TCP 키트는 절반 아래로 줄 때까지(최대 1초) 다음 요청을 읽지 않음 (app.kit_bridge).
+- 기동 시 스풀에 남은 판정(비정상 종료 등)을 다시 기록. 이미 반영한 순번(seq <= last_seq)은 트랜잭션 안에서 건너뛰므로
+  같은 상자가 두 번 분류되지 않음. 스풀은 모두 반영된 뒤 SPOOL_COMPACT 바이트를 넘으면 남은 판정만으로 다시 씀.
+  SPOOL_PATH 가 빈 값이면 스풀 없이 메모리만 (대기열이 가득 차면 해당 판정은 기록하지 않고 셈).
+- 판정마다 recognition, 기록된 묶음마다 (물품, 창고)별 stock 이벤트를 작업 로그(app.events)에 남김.
+- products 사본은 기동 시 읽고 PRODUCTS_REFRESH 초마다 다시 읽음 (0이면 기동 시 한 번만).
+환경변수: SOY_CLASSIFY_QUEUE_MAX(기본 10000), SOY_CLASSIFY_WRITE_BATCH(기본 200), SOY_CLASSIFY_FLUSH_MS(기본 20),
+          SOY_CLASSIFY_SPOOL(기본 data/classify.spool), SOY_CLASSIFY_SPOOL_COMPACT(바이트, 기본 4 MiB),
+          SOY_PRODUCTS_REFRESH(초, 기본 300)
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, BinaryIO
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app import events, inventory, repository
+from app.codec import DecodeError, dumps, loads
+from app.database import run_sync
+
+logger = logging.getLogger(__name__)
+
+QUEUE_MAX = max(1, int(os.environ.get("SOY_CLASSIFY_QUEUE_MAX", "10000")))
+WRITE_BATCH = max(1, int(os.environ.get("SOY_CLASSIFY_WRITE_BATCH", "200")))
+FLUSH_MS = float(os.environ.get("SOY_CLASSIFY_FLUSH_MS", "20"))
+SPOOL_PATH = os.environ.get("SOY_CLASSIFY_SPOOL", "data/classify.spool")
+SPOOL_COMPACT = int(os.environ.get("SOY_CLASSIFY_SPOOL_COMPACT", str(4 << 20)))
+PRODUCTS_REFRESH = float(os.environ.get("SOY_PRODUCTS_REFRESH", "300"))
+# DB 기록 재시도 간격 상한(초)
+RETRY_MAX = 30.0
+WRITER = "classifier"
+
+UNCLASSIFIED = "미분류"
+
+# (물품명 키, 브랜드 키) → (product_id, shipping_destination). 교체는 통째로 (읽는 쪽은 락 없이 참조)
+_products: dict[tuple[str, str], tuple[int, str]] = {}
+_by_id: dict[int, str] = {}
+# 기록 대기 판정 (seq, inbound_id, product_id, warehouse). 스풀에도 같은 순서로 있음
+_pending: deque[tuple[int, int, int, str]] = deque()
+_seq = 0
+_spool: BinaryIO | None = None
+_spill_offset: int | None = None  # 스풀에만 있는 첫 판정의 파일 위치 (None 이면 모두 메모리에)
+_spilled_pending = 0
+_arrived: asyncio.Event | None = None
+_full: asyncio.Event | None = None
+_relief: asyncio.Event | None = None
+_tasks: list[asyncio.Task] = []
+_latency_us: deque[float] = deque(maxlen=10000)  # 최근 판정 시간
+_counts = {
+    "classified": 0, "unclassified": 0, "queued": 0, "written": 0, "unmatched": 0, "skipped": 0,
+    "spilled": 0, "dropped": 0, "write_errors": 0, "batches": 0,
+}
+_last_flush = {"rows": 0, "ms": 0.0}
+
+
+def _key(s: Any) -> str:
+    return " ".join(str(s or "").split()).casefold()
+
+
+def load_tx(conn: Connection) -> list[tuple[int, str, str, str]]:
+    rows = conn.execute(
+        text("SELECT product_id, product_name, brand, shipping_destination FROM products")
+    ).fetchall()
+    return [(int(r[0]), r[1], r[2], r[3]) for r in rows]
+
+
+def replace_products(rows: list[tuple[int, str, str, str]]) -> None:
+    global _products, _by_id
+    _products = {(_key(name), _key(brand)): (pid, dest) for pid, name, brand, dest in rows}
+    _by_id = {pid: dest for pid, _name, _brand, dest in rows}
+
+
+async def reload() -> int:
+    """products 사본 다시 읽기. 물품 수 반환."""
+    rows = await repository.read(load_tx)
+    replace_products(rows)
+    return len(rows)
+
+
+def lookup_product(product_name: Any, brand: Any) -> int | None:
+    """(물품명, 브랜드) → product_id (products 사본 기준, 공백·대소문자 무시). 없으면 None."""
+    hit = _products.get((_key(product_name), _key(brand)))
+    return hit[0] if hit is not None else None
+
+
+def decide(product_name: Any = None, brand: Any = None, product_id: Any = None) -> tuple[str, int | None]:
+    """(창고, product_id). 모르는 물품이면 ('미분류', None)."""
+    if product_id is not None:
+        try:
+            pid = int(product_id)
+        except (TypeError, ValueError):
+            return (UNCLASSIFIED, None)
+        dest = _by_id.get(pid)
+        return (dest, pid) if dest else (UNCLASSIFIED, None)
+    hit = _products.get((_key(product_name), _key(brand)))
+    if hit is None:
+        return (UNCLASSIFIED, None)
+    return (hit[1], hit[0])
+
+
+def _fields(body: dict[str, Any]) -> dict[str, Any]:
+    """요청 body 또는 body.qr(상자 QR 원문 JSON)에서 inbound_id / product_name / brand / product_id."""
+    qr = body.get("qr")
+    if isinstance(qr, str) and qr:
+        try:
+            obj = loads(qr)
+        except DecodeError:
+            obj = None
+        if isinstance(obj, dict):
+            return obj
+        return {}
+    return body
+
+
+def backlog() -> int:
+    """DB 에 아직 기록하지 않은 판정 수 (메모리 + 스풀에만 있는 것)."""
+    return len(_pending) + _spilled_pending
+
+
+def overloaded() -> bool:
+    return backlog() >= QUEUE_MAX
+
+
+async def wait_relief(timeout: float) -> None:
+    """밀린 판정이 QUEUE_MAX 절반 아래로 줄 때까지 최대 timeout 초 대기 (TCP 키트 backpressure)."""
+    if _relief is None or not overloaded():
+        return
+    _relief.clear()
+    try:
+        await asyncio.wait_for(_relief.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
+def _int_or_none(v: Any) -> int | None:
+    try:
+        return int(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _enqueue(inbound_id: int, product_id: int, warehouse: str) -> None:
+    global _seq, _spill_offset, _spilled_pending
+    _seq = max(_seq + 1, time.time_ns() // 1000)
+    rec = (_seq, inbound_id, product_id, warehouse)
+    offset = 0
+    if _spool is not None:
+        offset = _spool.tell()
+        _spool.write(dumps(list(rec)) + b"\n")
+    _counts["queued"] += 1
+    if _spill_offset is None and len(_pending) < QUEUE_MAX:
+        _pending.append(rec)
+        _arrived.set()
+        if len(_pending) >= WRITE_BATCH:
+            _full.set()
+    elif _spool is not None:
+        if _spill_offset is None:
+            _spill_offset = offset
+            logger.warning("[classifier] write backlog full (%d) -> spilling decisions to %s", QUEUE_MAX, SPOOL_PATH)
+        _spilled_pending += 1
+        _counts["spilled"] += 1
+    else:
+        _counts["dropped"] += 1
+        if _counts["dropped"] == 1 or _counts["dropped"] % 1000 == 0:
+            logger.warning("[classifier] write queue full -> decision not recorded (%d)", _counts["dropped"])
+
+
+def classify(body: dict[str, Any]) -> dict[str, Any]:
+    """classify 요청 처리 (이벤트 루프에서, 대기 없음). {"warehouse", "product_id", "backpressure"} 반환, DB 반영은 writer 로."""
+    t0 = time.perf_counter()
+    f = _fields(body)
+    warehouse, product_id = decide(f.get("product_name"), f.get("brand"), f.get("product_id"))
+    inbound_id = _int_or_none(f.get("inbound_id"))
+    if product_id is None:
+        _counts["unclassified"] += 1
+        detail = {"warehouse": warehouse, "product_name": f.get("product_name"), "brand": f.get("brand")}
+    else:
+        _counts["classified"] += 1
+        detail = {"warehouse": warehouse}
+        if inbound_id is not None and _arrived is not None:
+            _enqueue(inbound_id, product_id, warehouse)
+    events.emit("recognition", source="kit", product_id=product_id, inbound_id=inbound_id, detail=detail)
+    _latency_us.append((time.perf_counter() - t0) * 1e6)
+    return {"warehouse": warehouse, "product_id": product_id, "backpressure": overloaded()}
+
+
+def _checkpoint_tx(conn: Connection) -> int:
+    lock = " FOR UPDATE" if conn.dialect.name == "mysql" else ""
+    row = conn.execute(
+        text(f"SELECT last_seq FROM write_checkpoints WHERE writer = :w{lock}"), {"w": WRITER}
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _write_batch_tx(
+    conn: Connection, batch: list[tuple[int, int, int, str]]
+) -> tuple[dict[tuple[int, str], int], int]:
+    """이미 반영한 순번은 건너뛰고 묶음 반영 + last_seq 갱신. ({(product_id, warehouse): 분류한 상자 수}, 건너뛴 수)."""
+    last = _checkpoint_tx(conn)
+    todo = [(iid, pid, wh) for seq, iid, pid, wh in batch if seq > last]
+    added = inventory.classify_boxes_tx(conn, todo) if todo else {}
+    if batch[-1][0] > last:
+        if conn.dialect.name == "mysql":
+            sql = (
+                "INSERT INTO write_checkpoints (writer, last_seq) VALUES (:w, :seq)"
+                " ON DUPLICATE KEY UPDATE last_seq = VALUES(last_seq)"
+            )
+        else:
+            sql = (
+                "INSERT INTO write_checkpoints (writer, last_seq) VALUES (:w, :seq)"
+                " ON CONFLICT (writer) DO UPDATE SET last_seq = excluded.last_seq"
+            )
+        conn.execute(text(sql), {"w": WRITER, "seq": batch[-1][0]})
+    return added, len(batch) - len(todo)
+
+
+def _read_spool(path: str, offset: int, limit: int | None) -> tuple[list[tuple[int, int, int, str]], int, int]:
+    """offset 부터 판정을 최대 limit 건 읽음. (판정, 다음 offset, base 순번). 끝의 쓰다 만 줄은 읽지 않음."""
+    recs: list[tuple[int, int, int, str]] = []
+    base = 0
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return recs, offset, base
+    with f:
+        f.seek(offset)
+        pos = offset
+        while limit is None or len(recs) < limit:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            pos += len(line)
+            try:
+                obj = loads(line)
+            except DecodeError:
+                continue
+            if isinstance(obj, dict):
+                base = max(base, int(obj.get("base") or 0))
+            elif isinstance(obj, list) and len(obj) == 4:
+                recs.append((int(obj[0]), int(obj[1]), int(obj[2]), str(obj[3])))
+    return recs, pos, base
+
+
+def _write_spool_tmp(base: int, recs: list[tuple[int, int, int, str]]) -> int:
+    """base 줄 + recs 를 임시 스풀(SPOOL_PATH.tmp)에 쓰고 fsync. 첫 판정의 offset 반환. 스레드에서 실행."""
+    with open(SPOOL_PATH + ".tmp", "wb") as f:
+        f.write(dumps({"base": base}) + b"\n")
+        first = f.tell()
+        f.write(b"".join(dumps(list(r)) + b"\n" for r in recs))
+        f.flush()
+        os.fsync(f.fileno())
+    return first
+
+
+def _swap_spool(tail: list[tuple[int, int, int, str]]) -> None:
+    """임시 스풀 끝에 tail(쓰는 동안 새로 들어온 판정)을 붙이고 스풀과 바꿈.
+    이벤트 루프에서 실행 — _enqueue 의 append 와 섞이지 않음 (tail 은 append 와 같이 fsync 는 다음 묶음 때)."""
+    global _spool
+    tmp = SPOOL_PATH + ".tmp"
+    if tail:
+        with open(tmp, "ab") as f:
+            f.write(b"".join(dumps(list(r)) + b"\n" for r in tail))
+    if _spool is not None:
+        _spool.close()
+    os.replace(tmp, SPOOL_PATH)
+    _spool = open(SPOOL_PATH, "ab", buffering=0)
+
+
+async def _compact() -> None:
+    """모두 반영된 뒤 커진 스풀을 남은 판정만으로 다시 씀. 쓰기·fsync 는 스레드에서 (이벤트 루프를 막지 않음)."""
+    recs = list(_pending)
+    base = _seq
+    try:
+        await run_sync(_write_spool_tmp, base, recs)
+        if _spill_offset is not None:
+            return  # 그 사이 대기열이 넘쳐 지금 스풀의 offset 을 기억함 — 이번에는 바꾸지 않음
+        _swap_spool([r for r in _pending if r[0] > base])
+    except OSError as e:
+        logger.warning("[classifier] spool compaction failed: %s", e)
+
+
+async def _refill() -> None:
+    """스풀에만 있던 판정을 메모리 대기열로 (최대 QUEUE_MAX 건)."""
+    global _spill_offset, _spilled_pending
+    recs, end, _base = await run_sync(_read_spool, SPOOL_PATH, _spill_offset, QUEUE_MAX)
+    _pending.extend(recs)
+    _spilled_pending -= len(recs)
+    if _spilled_pending <= 0 or not recs:
+        _spilled_pending = 0
+        _spill_offset = None
+        logger.info("[classifier] spilled decisions reloaded")
+    else:
+        _spill_offset = end
+
+
+async def _write_loop() -> None:
+    assert _arrived is not None and _full is not None and _relief is not None
+    delay = 0.0
+    while True:
+        if not _pending and _spill_offset is not None:
+            await _refill()
+        if not _pending:
+            _arrived.clear()
+            await _arrived.wait()
+            continue
+        if len(_pending) < WRITE_BATCH and FLUSH_MS > 0:
+            _full.clear()
+            try:
+                await asyncio.wait_for(_full.wait(), timeout=FLUSH_MS / 1000)
+            except asyncio.TimeoutError:
+                pass
+        batch = list(islice(_pending, WRITE_BATCH))
+        t0 = time.perf_counter()
+        try:
+            if _spool is not None:
+                await run_sync(os.fsync, _spool.fileno())
+            added, skipped = await repository.write(_write_batch_tx, batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _counts["write_errors"] += 1
+            delay = min(RETRY_MAX, delay * 2 or 0.5)
+            logger.warning(
+                "[classifier] write failed (%d decision(s), backlog %d), retry in %.1fs: %s",
+                len(batch), backlog(), delay, e,
+            )
+            await asyncio.sleep(delay)
+            continue
+        delay = 0.0
+        for _ in batch:
+            _pending.popleft()
+        matched = sum(added.values())
+        for (pid, wh), n in added.items():
+            inventory.emit_stock(pid, wh, n)
+        _counts["batches"] += 1
+        _counts["written"] += matched
+        _counts["skipped"] += skipped
+        _counts["unmatched"] += len(batch) - skipped - matched
+        _last_flush.update(rows=len(batch), ms=round((time.perf_counter() - t0) * 1000, 2))
+        if backlog() < QUEUE_MAX // 2:
+            _relief.set()
+        if _spool is not None and _spill_offset is None and _spool.tell() > SPOOL_COMPACT:
+            await _compact()
+
+
+async def _refresh_loop() -> None:
+    while True:
+        await asyncio.sleep(PRODUCTS_REFRESH)
+        try:
+            await reload()
+        except Exception as e:
+            logger.warning("[classifier] products refresh failed: %s", e)
+
+
+async def _open_spool() -> None:
+    """스풀을 열고 남은 판정을 기록 대기로. 이미 반영된 것은 걸러서 다시 씀."""
+    global _seq, _spill_offset, _spilled_pending
+    if not SPOOL_PATH:
+        return
+    try:
+        os.makedirs(os.path.dirname(SPOOL_PATH) or ".", exist_ok=True)
+        recs, _end, base = await run_sync(_read_spool, SPOOL_PATH, 0, None)
+    except OSError as e:
+        msg = f"[classifier] spool {SPOOL_PATH} unavailable (decisions kept in memory only): {e}"
+        logger.error(msg)
+        print(msg, flush=True)
+        return
+    try:
+        last = await repository.read(_checkpoint_tx)
+    except Exception as e:
+        # DB 미기동 등: 전부 다시 기록 대상으로 (트랜잭션 안에서 다시 걸러짐)
+        logger.warning("[classifier] checkpoint read failed: %s", e)
+        last = 0
+    recs = [r for r in recs if r[0] > last]
+    _seq = max([base, last] + [r[0] for r in recs])
+    first = await run_sync(_write_spool_tmp, _seq, recs)
+    _swap_spool([])
+    if recs:
+        _spill_offset = first
+        _spilled_pending = len(recs)
+        msg = f"[classifier] replaying {len(recs)} unwritten decision(s) from {SPOOL_PATH}"
+        logger.warning(msg)
+        print(msg, flush=True)
+
+
+async def start() -> None:
+    """products 사본 적재 + 스풀 복구 + writer 시작."""
+    global _arrived, _full, _relief
+    try:
+        n = await reload()
+        msg = f"[classifier] loaded {n} product(s)"
+        logger.info(msg)
+        print(msg, flush=True)
+    except Exception as e:
+        msg = f"[classifier] products load failed (all boxes -> {UNCLASSIFIED}): {e}"
+        logger.error(msg)
+        print(msg, flush=True)
+    if _arrived is None:
+        await _open_spool()
+        _arrived, _full, _relief = asyncio.Event(), asyncio.Event(), asyncio.Event()
+        _tasks.append(asyncio.create_task(_write_loop()))
+        if PRODUCTS_REFRESH > 0:
+            _tasks.append(asyncio.create_task(_refresh_loop()))
+
+
+async def stop(timeout: float = 5.0) -> None:
+    """남은 판정을 최대 timeout 초 동안 기록한 뒤 정지. 못 쓴 판정은 스풀에 남아 다음 기동 때 기록."""
+    global _arrived, _full, _relief, _spool, _spill_offset, _spilled_pending
+    deadline = time.monotonic() + timeout
+    while backlog() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    if backlog():
+        logger.warning("[classifier] %d decision(s) not written at shutdown (kept in spool)", backlog())
+    for task in _tasks:
+        task.cancel()
+    for task in _tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    _tasks.clear()
+    _pending.clear()
+    _spill_offset, _spilled_pending = None, 0
+    _arrived = _full = _relief = None
+    if _spool is not None:
+        _spool.close()
+        _spool = None
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def stats() -> dict[str, Any]:
+    """/metrics 용. 판정 시간은 최근 10000건 기준 (µs)."""
+    lat = sorted(_latency_us)
+    return {
+        "products": len(_products),
+        "backlog": backlog(),
+        "spilled_pending": _spilled_pending,
+        "spool_bytes": _spool.tell() if _spool is not None else 0,
+        **_counts,
+        "last_flush": dict(_last_flush),
+        "decide_p50_us": round(_percentile(lat, 0.50), 1),
+        "decide_p99_us": round(_percentile(lat, 0.99), 1),
+    }
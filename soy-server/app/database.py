@@ -1,12 +1,53 @@
 """
 DB 연결. 환경변수 SOY_DATABASE_URL 또는 MYSQL_* 사용 (alembic/env와 동일).
+블로킹 DB 호출은 run_sync()로 제한된 스레드풀에서 실행 (asyncio 핸들러용).
+
+연결 풀: pool_pre_ping(체크아웃마다 SELECT 1) 대신 SOY_DB_PING_IDLE 초 이상 쉬었던 연결만 체크아웃 시 ping.
+끊긴 연결은 ping 실패 시 새 연결로 교체되고, 쿼리 중 끊김 오류는 SQLAlchemy 가 해당 연결(과 그 이전 연결들)을 무효화.
+체크아웃 대기 시간·사용 중 연결 수·overflow·타임아웃은 pool_stats() 로 (/metrics).
+환경변수: SOY_DB_POOL_SIZE(기본 10), SOY_DB_MAX_OVERFLOW(기본 5), SOY_DB_POOL_RECYCLE(초, 기본 1800),
+          SOY_DB_POOL_TIMEOUT(초, 기본 10), SOY_DB_PING_IDLE(초, 기본 30. 0이면 매 체크아웃 ping, 음수면 ping 안 함)
+
+비동기 엔진: get_async_engine() 은 같은 URL 을 비동기 드라이버(MySQL: asyncmy → aiomysql, SQLite: aiosqlite)로 바꿔
+AsyncEngine 하나를 만들어 공유 (풀 설정 동일). 드라이버가 없거나 SOY_DB_ASYNC=0 이면 None — 호출 측(app.repository)은 run_sync 로 대체.
 """
+import asyncio
+import functools
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
 
 _env = os.environ
 
+# DB 작업 스레드 수. 엔진 풀(pool_size + max_overflow)보다 크게 잡으면 풀 대기만 늘어남
+DB_EXECUTOR_WORKERS = int(_env.get("SOY_DB_EXECUTOR_WORKERS", "10"))
+POOL_SIZE = int(_env.get("SOY_DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(_env.get("SOY_DB_MAX_OVERFLOW", "5"))
+POOL_RECYCLE = int(_env.get("SOY_DB_POOL_RECYCLE", "1800"))
+POOL_TIMEOUT = float(_env.get("SOY_DB_POOL_TIMEOUT", "10"))
+PING_IDLE = float(_env.get("SOY_DB_PING_IDLE", "30"))
+USE_ASYNC = _env.get("SOY_DB_ASYNC", "1").strip().lower() not in ("0", "false", "no")
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+except ImportError:  # greenlet 미설치
+    AsyncEngine = None  # type: ignore[assignment,misc]
+    create_async_engine = None  # type: ignore[assignment]
+    AsyncAdaptedQueuePool = None  # type: ignore[assignment,misc]
+
+# 백엔드 → 비동기 드라이버 후보 (설치된 첫 번째 사용)
+_ASYNC_DRIVERS = {"mysql": ("asyncmy", "aiomysql"), "sqlite": ("aiosqlite",)}
+
+T = TypeVar("T")
+
 
 def _get_url() -> str:
     url = _env.get("SOY_DATABASE_URL")
@@ -20,11 +61,199 @@ def _get_url() -> str:
     return f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}"
 
 
+_stats_lock = threading.Lock()
+_stats = {
+    "checkouts": 0,
+    "overflow_opened": 0,  # pool_size 를 넘어 새로 연 연결 수
+    "timeouts": 0,
+    "wait_total": 0.0,
+    "wait_max": 0.0,
+    "pings": 0,
+    "ping_failures": 0,
+}
+
+
+class _PoolStatsMixin:
+    """체크아웃 대기 시간·overflow·타임아웃을 기록 (QueuePool 계열과 함께 상속)."""
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        overflow_before = self.overflow()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            with _stats_lock:
+                _stats["timeouts"] += 1
+            raise
+        waited = time.perf_counter() - t0
+        with _stats_lock:
+            _stats["checkouts"] += 1
+            _stats["wait_total"] += waited
+            if waited > _stats["wait_max"]:
+                _stats["wait_max"] = waited
+            if self.overflow() > max(0, overflow_before):
+                _stats["overflow_opened"] += 1
+        return conn
+
+
+class _InstrumentedQueuePool(_PoolStatsMixin, QueuePool):
+    pass
+
+
+if AsyncAdaptedQueuePool is not None:
+
+    class _InstrumentedAsyncQueuePool(_PoolStatsMixin, AsyncAdaptedQueuePool):
+        pass
+
+
+def _on_checkin(dbapi_conn, record) -> None:
+    record.info["soy_idle_since"] = time.monotonic()
+
+
+def _on_checkout(dbapi_conn, record, proxy) -> None:
+    """PING_IDLE 이상 쉬었던 연결만 ping. 실패하면 DisconnectionError → 풀이 새 연결로 다시 체크아웃."""
+    if PING_IDLE < 0:
+        return
+    idle_since = record.info.get("soy_idle_since")
+    if idle_since is None or time.monotonic() - idle_since < PING_IDLE:
+        return
+    with _stats_lock:
+        _stats["pings"] += 1
+    try:
+        cur = dbapi_conn.cursor()
+        try:
+            cur.execute("SELECT 1")
+        finally:
+            cur.close()
+    except Exception as e:
+        with _stats_lock:
+            _stats["ping_failures"] += 1
+        raise DisconnectionError(str(e)) from e
+
+
+def _pool_kwargs() -> dict[str, Any]:
+    return {
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_timeout": POOL_TIMEOUT,
+    }
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _create_engine(url: str) -> Engine:
+    if _is_memory_sqlite(make_url(url)):
+        return create_engine(url)
+    eng = create_engine(url, poolclass=_InstrumentedQueuePool, **_pool_kwargs())
+    event.listen(eng, "checkin", _on_checkin)
+    event.listen(eng, "checkout", _on_checkout)
+    return eng
+
+
 _engine: Engine | None = None
 
 
 def get_engine() -> Engine:
     global _engine
     if _engine is None:
-        _engine = create_engine(_get_url(), pool_pre_ping=True)
+        _engine = _create_engine(_get_url())
     return _engine
+
+
+def _async_url(url: str) -> str | None:
+    """동기 URL → 설치된 비동기 드라이버 URL. 없으면 None."""
+    u = make_url(url)
+    if _is_memory_sqlite(u):
+        return None
+    for driver in _ASYNC_DRIVERS.get(u.get_backend_name(), ()):
+        try:
+            __import__(driver)
+        except ImportError:
+            continue
+        return u.set(drivername=f"{u.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+    return None
+
+
+_async_engine: "AsyncEngine | None" = None
+_async_checked = False
+
+
+def get_async_engine() -> "AsyncEngine | None":
+    """공유 AsyncEngine. 비동기 드라이버가 없으면 None."""
+    global _async_engine, _async_checked
+    if not _async_checked:
+        _async_checked = True
+        url = _async_url(_get_url()) if USE_ASYNC and create_async_engine is not None else None
+        if url is not None:
+            _async_engine = create_async_engine(
+                url, poolclass=_InstrumentedAsyncQueuePool, **_pool_kwargs()
+            )
+            event.listen(_async_engine.sync_engine, "checkin", _on_checkin)
+            event.listen(_async_engine.sync_engine, "checkout", _on_checkout)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_checked
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_checked = False
+
+
+def pool_stats() -> dict[str, Any]:
+    """/metrics 용 연결 풀 현황."""
+    pool = _engine.pool if _engine is not None else None
+    with _stats_lock:
+        checkouts = _stats["checkouts"]
+        out: dict[str, Any] = {
+            "pool_size": POOL_SIZE,
+            "max_overflow": MAX_OVERFLOW,
+            "checkouts": checkouts,
+            "overflow_opened": _stats["overflow_opened"],
+            "timeouts": _stats["timeouts"],
+            "wait_avg_ms": round(_stats["wait_total"] / checkouts * 1000, 3) if checkouts else 0.0,
+            "wait_max_ms": round(_stats["wait_max"] * 1000, 3),
+            "pings": _stats["pings"],
+            "ping_failures": _stats["ping_failures"],
+        }
+    if isinstance(pool, QueuePool):
+        out["checked_out"] = pool.checkedout()
+        out["idle"] = pool.checkedin()
+        out["overflow"] = max(0, pool.overflow())
+    if _async_engine is not None:
+        apool = _async_engine.pool
+        out["async_driver"] = _async_engine.dialect.driver
+        out["async_checked_out"] = apool.checkedout()
+        out["async_idle"] = apool.checkedin()
+        out["async_overflow"] = max(0, apool.overflow())
+    return out
+
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="soy-db"
+        )
+    return _executor
+
+
+async def run_sync(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """블로킹 DB 함수를 DB 스레드풀에서 실행하고 결과를 기다림 (이벤트 루프는 막지 않음)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_executor() -> None:
+    """DB 스레드풀 종료 (서버 종료 시)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
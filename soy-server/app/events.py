@@ -0,0 +1,177 @@
+"""
+작업 로그 (S-04) — 이벤트 버스와 events 테이블 writer (마이그레이션 009).
+
+- emit(kind, ...) 는 메모리 버퍼에 한 건 넣고 바로 반환 (DB·대기 없음, 이벤트 루프·다른 스레드 어디서나).
+  분류 판정·출입 처리 경로에서 불러도 지연이 늘지 않도록 여기서는 INSERT 하지 않음.
+- writer 태스크 하나가 FLUSH_MS 마다 (또는 BATCH 건이 모이면 바로) 최대 BATCH 건씩 INSERT 한 번(executemany)으로 기록.
+  DB 오류면 같은 묶음을 간격을 늘려 가며 다시 시도.
+- 버퍼는 QUEUE_MAX 건까지. 가득 차면 새 이벤트는 버리고 종류별로 셈 (/metrics events.dropped). 로그 때문에 메모리가 늘거나
+  생산자가 막히는 일은 없음 — 유실 여부는 카운터로 확인.
+- 종료 시 남은 이벤트를 최대 timeout 초 동안 기록.
+종류(KINDS): access(출입), stock(재고 증감), inbound(입고 등록), work_start / work_end(작업 시작·종료),
+            step(작업 단계), recognition(물품 인식·판정), counting(카운팅)
+환경변수: SOY_EVENT_QUEUE_MAX(기본 50000), SOY_EVENT_BATCH(기본 500), SOY_EVENT_FLUSH_MS(기본 200)
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app import repository
+from app.codec import dumps
+
+logger = logging.getLogger(__name__)
+
+QUEUE_MAX = max(1, int(os.environ.get("SOY_EVENT_QUEUE_MAX", "50000")))
+BATCH = max(1, int(os.environ.get("SOY_EVENT_BATCH", "500")))
+FLUSH_MS = max(1.0, float(os.environ.get("SOY_EVENT_FLUSH_MS", "200")))
+# DB 기록 재시도 간격 상한(초)
+RETRY_MAX = 30.0
+
+KINDS = frozenset(
+    {"access", "stock", "inbound", "work_start", "work_end", "step", "recognition", "counting"}
+)
+
+# (created_at, kind, source, worker_id, product_id, inbound_id, detail)
+_buffer: deque[tuple[datetime, str, str | None, int | None, int | None, int | None, dict | None]] = deque()
+_lock = threading.Lock()
+_writer: asyncio.Task | None = None
+_stopping = False
+_stop_requested: asyncio.Event | None = None  # stop() 이 set — FLUSH_MS 대기 중인 writer 를 바로 깨움
+_counts = {"emitted": 0, "written": 0, "write_errors": 0, "batches": 0}
+_dropped: dict[str, int] = {}  # 종류 → 버린 수
+_last_flush = {"rows": 0, "ms": 0.0}
+
+
+def emit(
+    kind: str,
+    *,
+    source: str | None = None,
+    worker_id: int | None = None,
+    product_id: int | None = None,
+    inbound_id: int | None = None,
+    detail: dict[str, Any] | None = None,
+) -> bool:
+    """이벤트 한 건을 버퍼에. 버퍼가 가득 차 버렸으면 False."""
+    ev = (datetime.now(), kind, source, worker_id, product_id, inbound_id, detail or None)
+    with _lock:
+        if len(_buffer) >= QUEUE_MAX:
+            _dropped[kind] = _dropped.get(kind, 0) + 1
+            n = sum(_dropped.values())
+            if n == 1 or n % 10000 == 0:
+                logger.warning("[events] buffer full -> event dropped (%d total)", n)
+            return False
+        _buffer.append(ev)
+        _counts["emitted"] += 1
+    return True
+
+
+def insert_tx(conn: Connection, batch: list[tuple]) -> None:
+    conn.execute(
+        text(
+            "INSERT INTO events (created_at, kind, source, worker_id, product_id, inbound_id, detail)"
+            " VALUES (:at, :kind, :source, :wid, :pid, :iid, :detail)"
+        ),
+        [
+            {
+                "at": at,
+                "kind": kind,
+                "source": source,
+                "wid": wid,
+                "pid": pid,
+                "iid": iid,
+                "detail": dumps(detail).decode("utf-8") if detail is not None else None,
+            }
+            for at, kind, source, wid, pid, iid, detail in batch
+        ],
+    )
+
+
+def _take(n: int) -> list[tuple]:
+    with _lock:
+        return [_buffer.popleft() for _ in range(min(n, len(_buffer)))]
+
+
+async def _write(batch: list[tuple]) -> None:
+    """한 묶음을 기록될 때까지 재시도 (취소되면 중단)."""
+    delay = 0.0
+    while True:
+        t0 = time.perf_counter()
+        try:
+            await repository.write(insert_tx, batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _counts["write_errors"] += 1
+            delay = min(RETRY_MAX, delay * 2 or 0.5)
+            logger.warning("[events] write failed (%d event(s)), retry in %.1fs: %s", len(batch), delay, e)
+            await asyncio.sleep(delay)
+            continue
+        _counts["written"] += len(batch)
+        _counts["batches"] += 1
+        _last_flush.update(rows=len(batch), ms=round((time.perf_counter() - t0) * 1000, 2))
+        return
+
+
+async def _write_loop() -> None:
+    assert _stop_requested is not None
+    while True:
+        if len(_buffer) < BATCH:
+            if _stopping:
+                if not _buffer:
+                    return
+            else:
+                try:
+                    await asyncio.wait_for(_stop_requested.wait(), timeout=FLUSH_MS / 1000)
+                except asyncio.TimeoutError:
+                    pass
+        batch = _take(BATCH)
+        if batch:
+            await _write(batch)
+
+
+async def start() -> None:
+    global _writer, _stop_requested
+    if _writer is None:
+        _stop_requested = asyncio.Event()
+        _writer = asyncio.create_task(_write_loop())
+
+
+async def stop(timeout: float = 5.0) -> None:
+    """남은 이벤트를 최대 timeout 초 동안 기록한 뒤 정지 (기록 중인 묶음은 끊지 않고 기다림)."""
+    global _writer, _stopping, _stop_requested
+    if _writer is None:
+        return
+    _stopping = True
+    assert _stop_requested is not None
+    _stop_requested.set()
+    try:
+        await asyncio.wait_for(asyncio.shield(_writer), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning("[events] %d event(s) not written at shutdown", len(_buffer))
+        _writer.cancel()
+        try:
+            await _writer
+        except asyncio.CancelledError:
+            pass
+    _writer = None
+    _stopping = False
+    _stop_requested = None
+
+
+def stats() -> dict[str, Any]:
+    """/metrics 용."""
+    return {
+        "buffer": len(_buffer),
+        **_counts,
+        "dropped": sum(_dropped.values()),
+        "dropped_by_kind": dict(_dropped),
+        "last_flush": dict(_last_flush),
+    }
@@ -0,0 +1,112 @@
+"""
+bcrypt 해시·검증 전용 풀. DB 스레드풀과 분리된 작은 스레드풀에서 실행 (bcrypt 는 해시 중 GIL 을 놓음).
+대기 포함 동시 작업 수를 SOY_BCRYPT_MAX_PENDING 으로 제한하고, 넘치면 큐에 쌓지 않고 HashingBusy 로 바로 거절.
+환경변수: SOY_BCRYPT_WORKERS(기본 2), SOY_BCRYPT_MAX_PENDING(기본 8), SOY_BCRYPT_ROUNDS(기본 12, 새 해시에만 적용)
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import bcrypt
+
+BCRYPT_MAX_BYTES = 72
+
+WORKERS = max(1, int(os.environ.get("SOY_BCRYPT_WORKERS", "2")))
+MAX_PENDING = max(WORKERS, int(os.environ.get("SOY_BCRYPT_MAX_PENDING", "8")))
+ROUNDS = int(os.environ.get("SOY_BCRYPT_ROUNDS", "12"))
+
+
+class HashingBusy(Exception):
+    """해시 풀이 가득 참. 잠시 후 재시도."""
+
+
+_executor: ThreadPoolExecutor | None = None
+_pending = 0
+_stats_lock = threading.Lock()
+_stats = {"completed": 0, "rejected": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+
+
+def _password_bytes(plain: str) -> bytes:
+    return plain.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="soy-bcrypt")
+    return _executor
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Any:
+    t0 = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        dt = time.perf_counter() - t0
+        with _stats_lock:
+            _stats["completed"] += 1
+            _stats["total_seconds"] += dt
+            if dt > _stats["max_seconds"]:
+                _stats["max_seconds"] = dt
+
+
+async def _submit(fn: Callable[..., Any], *args: Any) -> Any:
+    """이벤트 루프에서 호출. 자리가 없으면 HashingBusy."""
+    global _pending
+    if _pending >= MAX_PENDING:
+        with _stats_lock:
+            _stats["rejected"] += 1
+        raise HashingBusy()
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), _timed, fn, *args)
+    finally:
+        _pending -= 1
+
+
+def _checkpw(plain: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(_password_bytes(plain), hashed.encode("ascii"))
+    except Exception:
+        return False
+
+
+def _hashpw(plain: str) -> str:
+    return bcrypt.hashpw(_password_bytes(plain), bcrypt.gensalt(ROUNDS)).decode("ascii")
+
+
+async def checkpw(plain: str, hashed: str) -> bool:
+    """plain 이 bcrypt 해시 hashed 와 일치하면 True. 풀이 가득 차면 HashingBusy."""
+    return await _submit(_checkpw, plain, hashed)
+
+
+async def hashpw(plain: str) -> str:
+    """SOY_BCRYPT_ROUNDS 비용으로 bcrypt 해시 생성 (72바이트 초과 분 절단). 풀이 가득 차면 HashingBusy."""
+    return await _submit(_hashpw, plain)
+
+
+def stats() -> dict[str, Any]:
+    """/metrics 용 해시 풀 현황."""
+    with _stats_lock:
+        completed = _stats["completed"]
+        return {
+            "rounds": ROUNDS,
+            "workers": WORKERS,
+            "max_pending": MAX_PENDING,
+            "pending": _pending,
+            "completed": completed,
+            "rejected": _stats["rejected"],
+            "avg_ms": round(_stats["total_seconds"] / completed * 1000, 1) if completed else 0.0,
+            "max_ms": round(_stats["max_seconds"] * 1000, 1),
+        }
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,138 @@
+"""
+입고 등록 — 입고 송장 QR(inbound_invoice_pdf.build_ndjson_line)로 inbounds 1행 + inbound_items 상자 N행 생성.
+
+QR 원문: {"inbound_id": "12", "products": [{"product_name", "brand", "quantity"}, ...]}
+- 물품은 app.classifier 의 products 사본((물품명, 브랜드) 색인)으로 찾음. 모르는 물품이 있으면 사본을 한 번 다시 읽고
+  그래도 없으면 등록하지 않음 (InboundInvalid).
+- 상자 행은 입고 건 하나당 INSERT 한 번(executemany — PyMySQL 은 여러 행 VALUES 한 문장으로 묶음)으로 넣음.
+- inbound_id 기준 멱등: 같은 송장을 다시 스캔하면 inbounds INSERT 가 무시되고(INSERT IGNORE / ON CONFLICT DO NOTHING)
+  상자를 더 만들지 않은 채 이미 등록된 내용을 돌려줌. 동시에 두 번 와도 PK 잠금으로 한 번만 등록됨.
+- 새로 등록하면 inbound 이벤트를 작업 로그(app.events)에 남김.
+*_tx(conn, ...) 는 열린 Connection 위에서 쿼리만 수행, register 는 app.repository 로 실행.
+환경변수: SOY_INBOUND_MAX_BOXES(송장 하나의 최대 상자 수, 기본 100000)
+"""
+import os
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app import classifier, events, repository
+from app.codec import DecodeError, loads
+
+MAX_BOXES = int(os.environ.get("SOY_INBOUND_MAX_BOXES", "100000"))
+
+
+class InboundInvalid(Exception):
+    """QR 내용이 잘못됨 (inbound_id 없음, 모르는 물품, 수량 오류 등)."""
+
+    def __init__(self, detail: str = ""):
+        self.detail = detail
+        super().__init__(detail)
+
+
+def parse_payload(body: dict[str, Any]) -> tuple[int, list[dict[str, Any]]]:
+    """요청 body 또는 body.qr(송장 QR 원문)에서 (inbound_id, products)."""
+    qr = body.get("qr")
+    if isinstance(qr, str) and qr:
+        try:
+            obj = loads(qr)
+        except DecodeError:
+            raise InboundInvalid("QR 내용을 읽을 수 없습니다.")
+        if not isinstance(obj, dict):
+            raise InboundInvalid("QR 내용을 읽을 수 없습니다.")
+        body = obj
+    try:
+        inbound_id = int(body.get("inbound_id"))
+    except (TypeError, ValueError):
+        raise InboundInvalid("inbound_id required")
+    if inbound_id <= 0:
+        raise InboundInvalid("inbound_id 는 1 이상이어야 합니다.")
+    products = body.get("products")
+    if not isinstance(products, list) or not products:
+        raise InboundInvalid("products required")
+    return inbound_id, products
+
+
+def _resolve(products: list[Any]) -> tuple[dict[int, int], list[str]]:
+    """물품 목록 → ({product_id: 수량}, 모르는 물품 이름들). 같은 물품이 여러 줄이면 합침."""
+    quantities: dict[int, int] = {}
+    unknown: list[str] = []
+    for p in products:
+        if not isinstance(p, dict):
+            raise InboundInvalid("products 항목은 객체여야 합니다.")
+        try:
+            qty = int(p.get("quantity"))
+        except (TypeError, ValueError):
+            raise InboundInvalid(f"수량이 올바르지 않습니다: {p.get('product_name')}")
+        if qty <= 0:
+            continue
+        pid = classifier.lookup_product(p.get("product_name"), p.get("brand"))
+        if pid is None:
+            unknown.append(f"{p.get('product_name')} ({p.get('brand')})")
+            continue
+        quantities[pid] = quantities.get(pid, 0) + qty
+    return quantities, unknown
+
+
+def _insert_inbound_sql(conn: Connection) -> str:
+    if conn.dialect.name == "mysql":
+        return "INSERT IGNORE INTO inbounds (inbound_id) VALUES (:iid)"
+    return "INSERT INTO inbounds (inbound_id) VALUES (:iid) ON CONFLICT (inbound_id) DO NOTHING"
+
+
+def select_inbound_tx(conn: Connection, inbound_id: int) -> dict | None:
+    """입고 건과 물품별 상자 수. 없으면 None."""
+    row = conn.execute(
+        text("SELECT inbound_id, status FROM inbounds WHERE inbound_id = :iid"), {"iid": inbound_id}
+    ).fetchone()
+    if row is None:
+        return None
+    counts = conn.execute(
+        text(
+            "SELECT product_id, COUNT(*) FROM inbound_items WHERE inbound_id = :iid"
+            " GROUP BY product_id ORDER BY product_id"
+        ),
+        {"iid": inbound_id},
+    ).fetchall()
+    products = [{"product_id": r[0], "quantity": int(r[1])} for r in counts]
+    return {
+        "inbound_id": row[0],
+        "status": row[1],
+        "boxes": sum(p["quantity"] for p in products),
+        "products": products,
+    }
+
+
+def register_tx(conn: Connection, inbound_id: int, quantities: dict[int, int]) -> dict:
+    """inbounds 1행 + 상자 행 등록. 이미 있는 inbound_id 면 아무것도 넣지 않음. created 로 구분."""
+    r = conn.execute(text(_insert_inbound_sql(conn)), {"iid": inbound_id})
+    created = r.rowcount == 1
+    if created:
+        rows = [{"iid": inbound_id, "pid": pid} for pid, qty in sorted(quantities.items()) for _ in range(qty)]
+        conn.execute(text("INSERT INTO inbound_items (inbound_id, product_id) VALUES (:iid, :pid)"), rows)
+    out = select_inbound_tx(conn, inbound_id)
+    assert out is not None
+    out["created"] = created
+    return out
+
+
+async def register(body: dict[str, Any]) -> dict:
+    """register_inbound 요청 처리. 잘못된 QR 이면 InboundInvalid."""
+    inbound_id, products = parse_payload(body)
+    quantities, unknown = _resolve(products)
+    if unknown:
+        # products 에 새로 추가된 물품일 수 있으니 사본을 한 번 다시 읽음
+        await classifier.reload()
+        quantities, unknown = _resolve(products)
+    if unknown:
+        raise InboundInvalid("등록되지 않은 물품: " + ", ".join(unknown))
+    if not quantities:
+        raise InboundInvalid("수량이 있는 물품이 없습니다.")
+    total = sum(quantities.values())
+    if total > MAX_BOXES:
+        raise InboundInvalid(f"상자 수가 너무 많습니다 ({total} > {MAX_BOXES}).")
+    out = await repository.write(register_tx, inbound_id, quantities)
+    if out["created"]:
+        events.emit("inbound", source="server", inbound_id=inbound_id, detail={"boxes": out["boxes"]})
+    return out
@@ -0,0 +1,319 @@
+"""
+창고 재고 — inbound_items 상자 상태 변경과 warehouse_stock 집계 유지.
+
+창고 현황(분류완료 상자 수, product_id·warehouse 별)은 warehouse_stock 에서 읽음 (품목 수만큼의 행, 이력 양과 무관).
+상자 상태를 바꾸는 함수(classify_box_tx / ship_box_tx)는 같은 트랜잭션 안에서 box_count 를 ±1 하므로
+커밋되면 둘이 함께, 실패하면 둘 다 반영되지 않음. 상자 상태는 반드시 이 모듈을 거쳐 바꿀 것.
+그 밖의 경로(수동 SQL, 입고 삭제 등)로 생긴 차이는 reconcile 작업이 inbound_items 기준으로 다시 맞춤
+(SOY_STOCK_RECONCILE_INTERVAL 초마다, 0이면 끔. 차이를 고치면 warning 로그).
+*_tx(conn, ...) 는 열린 Connection 위에서 쿼리만 수행, 비동기 함수는 app.repository 로 실행.
+환경변수: SOY_STOCK_RECONCILE_INTERVAL(초, 기본 3600)
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app import events, repository
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_INTERVAL = float(os.environ.get("SOY_STOCK_RECONCILE_INTERVAL", "3600"))
+
+WAREHOUSES = ("국내", "해외", "미분류")
+
+_reconciler: asyncio.Task | None = None
+_last_reconcile: dict[str, Any] = {"at": None, "corrections": 0, "ms": 0.0}
+
+
+class BoxNotFound(Exception):
+    pass
+
+
+class BoxStateConflict(Exception):
+    """현재 상태에서 요청한 상태로 바꿀 수 없음 (이미 분류됨, 미분류 상자 출고 등)."""
+
+    def __init__(self, detail: str = ""):
+        self.detail = detail
+        super().__init__(detail)
+
+
+def _now() -> datetime:
+    return datetime.now().replace(microsecond=0)
+
+
+def _increment_sql(conn: Connection) -> str:
+    if conn.dialect.name == "mysql":
+        return (
+            "INSERT INTO warehouse_stock (product_id, warehouse, box_count) VALUES (:pid, :wh, 1)"
+            " ON DUPLICATE KEY UPDATE box_count = box_count + 1"
+        )
+    return (
+        "INSERT INTO warehouse_stock (product_id, warehouse, box_count) VALUES (:pid, :wh, 1)"
+        " ON CONFLICT (product_id, warehouse) DO UPDATE SET box_count = box_count + 1"
+    )
+
+
+def _add_sql(conn: Connection) -> str:
+    if conn.dialect.name == "mysql":
+        return (
+            "INSERT INTO warehouse_stock (product_id, warehouse, box_count) VALUES (:pid, :wh, :n)"
+            " ON DUPLICATE KEY UPDATE box_count = box_count + VALUES(box_count)"
+        )
+    return (
+        "INSERT INTO warehouse_stock (product_id, warehouse, box_count) VALUES (:pid, :wh, :n)"
+        " ON CONFLICT (product_id, warehouse) DO UPDATE SET box_count = box_count + excluded.box_count"
+    )
+
+
+def _set_sql(conn: Connection) -> str:
+    if conn.dialect.name == "mysql":
+        return (
+            "INSERT INTO warehouse_stock (product_id, warehouse, box_count) VALUES (:pid, :wh, :n)"
+            " ON DUPLICATE KEY UPDATE box_count = VALUES(box_count)"
+        )
+    return (
+        "INSERT INTO warehouse_stock (product_id, warehouse, box_count) VALUES (:pid, :wh, :n)"
+        " ON CONFLICT (product_id, warehouse) DO UPDATE SET box_count = excluded.box_count"
+    )
+
+
+def _box_row(conn: Connection, inbound_item_id: int):
+    return conn.execute(
+        text(
+            "SELECT inbound_item_id, inbound_id, product_id, status, warehouse, classified_at, outbound_at"
+            " FROM inbound_items WHERE inbound_item_id = :id"
+        ),
+        {"id": inbound_item_id},
+    ).fetchone()
+
+
+def _row_to_box(row) -> dict:
+    def iso(v):
+        return v.isoformat() if hasattr(v, "isoformat") else v
+
+    return {
+        "inbound_item_id": row[0],
+        "inbound_id": row[1],
+        "product_id": row[2],
+        "status": row[3],
+        "warehouse": row[4],
+        "classified_at": iso(row[5]),
+        "outbound_at": iso(row[6]),
+    }
+
+
+def classify_box_tx(conn: Connection, inbound_item_id: int, warehouse: str) -> dict:
+    """미분류 상자를 분류완료로 바꾸고 해당 창고 재고 +1. 바뀐 상자 반환.
+    없으면 BoxNotFound, 미분류가 아니면 BoxStateConflict."""
+    if warehouse not in WAREHOUSES:
+        raise ValueError(f"알 수 없는 창고: {warehouse}")
+    r = conn.execute(
+        text(
+            "UPDATE inbound_items SET status = '분류완료', classified_at = :at, warehouse = :wh"
+            " WHERE inbound_item_id = :id AND status = '미분류'"
+        ),
+        {"id": inbound_item_id, "wh": warehouse, "at": _now()},
+    )
+    row = _box_row(conn, inbound_item_id)  # UPDATE 가 행을 잠근 뒤라 이 트랜잭션 안에서는 그대로
+    if row is None:
+        raise BoxNotFound()
+    if r.rowcount == 0:
+        raise BoxStateConflict(f"이미 {row[3]} 상태인 상자입니다.")
+    conn.execute(text(_increment_sql(conn)), {"pid": row[2], "wh": warehouse})
+    return _row_to_box(row)
+
+
+def classify_boxes_tx(conn: Connection, decisions: list[tuple[int, int, str]]) -> dict[tuple[int, str], int]:
+    """분류 결과 여러 건 [(inbound_id, product_id, warehouse)] 을 한 트랜잭션으로 반영.
+    분류한 상자 수를 {(product_id, warehouse): n} 로 반환 (상자를 못 찾은 판정은 빠짐).
+    (입고, 물품)마다 미분류 상자를 필요한 수만큼 한 번에 고르고 (MySQL 은 SKIP LOCKED 로 잠금),
+    고른 상자 전체를 UPDATE 한 번으로 (창고는 CASE), 재고는 (물품, 창고)별 +n 을 한 번에 반영."""
+    wanted: dict[tuple[int, int], list[str]] = {}
+    for inbound_id, product_id, warehouse in decisions:
+        if warehouse not in WAREHOUSES:
+            raise ValueError(f"알 수 없는 창고: {warehouse}")
+        wanted.setdefault((inbound_id, product_id), []).append(warehouse)
+    lock = " FOR UPDATE SKIP LOCKED" if conn.dialect.name == "mysql" else ""
+    picked: list[tuple[int, int, str]] = []  # (inbound_item_id, product_id, warehouse)
+    for (inbound_id, product_id), warehouses in wanted.items():
+        rows = conn.execute(
+            text(
+                "SELECT inbound_item_id FROM inbound_items"
+                " WHERE inbound_id = :iid AND status = '미분류' AND product_id = :pid"
+                f" ORDER BY inbound_item_id LIMIT :n{lock}"
+            ),
+            {"iid": inbound_id, "pid": product_id, "n": len(warehouses)},
+        ).fetchall()
+        picked.extend((r[0], product_id, wh) for r, wh in zip(rows, warehouses))
+    if not picked:
+        return {}
+    at = _now()
+    for i in range(0, len(picked), 500):
+        chunk = picked[i : i + 500]
+        params: dict[str, Any] = {"at": at}
+        cases = []
+        for j, (item_id, _pid, wh) in enumerate(chunk):
+            params[f"i{j}"] = item_id
+            params[f"w{j}"] = wh
+            cases.append(f"WHEN :i{j} THEN :w{j}")
+        ids = ", ".join(f":i{j}" for j in range(len(chunk)))
+        conn.execute(
+            text(
+                "UPDATE inbound_items SET status = '분류완료', classified_at = :at,"
+                f" warehouse = CASE inbound_item_id {' '.join(cases)} END"
+                f" WHERE inbound_item_id IN ({ids}) AND status = '미분류'"
+            ),
+            params,
+        )
+    # 고른 상자는 잠겨 있거나(MySQL) writer 가 하나뿐이라 그대로 갱신됨. 어긋나도 reconcile 이 맞춤
+    added: dict[tuple[int, str], int] = {}
+    for _item_id, pid, wh in picked:
+        added[(pid, wh)] = added.get((pid, wh), 0) + 1
+    conn.execute(
+        text(_add_sql(conn)),
+        [{"pid": pid, "wh": wh, "n": n} for (pid, wh), n in added.items()],
+    )
+    return added
+
+
+def ship_box_tx(conn: Connection, inbound_item_id: int) -> dict:
+    """분류완료 상자를 출고됨으로 바꾸고 해당 창고 재고 -1. 바뀐 상자 반환.
+    없으면 BoxNotFound, 분류완료가 아니면 BoxStateConflict."""
+    r = conn.execute(
+        text(
+            "UPDATE inbound_items SET status = '출고됨', outbound_at = :at"
+            " WHERE inbound_item_id = :id AND status = '분류완료'"
+        ),
+        {"id": inbound_item_id, "at": _now()},
+    )
+    row = _box_row(conn, inbound_item_id)
+    if row is None:
+        raise BoxNotFound()
+    if r.rowcount == 0:
+        raise BoxStateConflict(f"{row[3]} 상태인 상자는 출고할 수 없습니다.")
+    # 0 아래로는 내리지 않음 (이미 어긋난 집계는 reconcile 이 맞춤)
+    conn.execute(
+        text(
+            "UPDATE warehouse_stock SET box_count = box_count - 1"
+            " WHERE product_id = :pid AND warehouse = :wh AND box_count > 0"
+        ),
+        {"pid": row[2], "wh": row[4]},
+    )
+    return _row_to_box(row)
+
+
+def select_stock_tx(conn: Connection) -> list[dict]:
+    """창고 현황. [{"product_id", "warehouse", "count"}] (product_id, warehouse 순, 0인 행 제외)."""
+    rows = conn.execute(
+        text(
+            "SELECT product_id, warehouse, box_count FROM warehouse_stock"
+            " WHERE box_count > 0 ORDER BY product_id, warehouse"
+        )
+    ).fetchall()
+    return [{"product_id": r[0], "warehouse": r[1], "count": int(r[2])} for r in rows]
+
+
+def reconcile_tx(conn: Connection) -> int:
+    """warehouse_stock 을 inbound_items 기준 COUNT 로 다시 맞춤. 고친 (product_id, warehouse) 수 반환.
+    MySQL 에서는 warehouse_stock 을 먼저 잠가(FOR UPDATE) 그 사이 커밋되는 상태 변경과 엇갈리지 않게 함."""
+    lock = " FOR UPDATE" if conn.dialect.name == "mysql" else ""
+    current = {
+        (r[0], r[1]): int(r[2])
+        for r in conn.execute(text(f"SELECT product_id, warehouse, box_count FROM warehouse_stock{lock}"))
+    }
+    actual = {
+        (r[0], r[1]): int(r[2])
+        for r in conn.execute(
+            text(
+                "SELECT product_id, warehouse, COUNT(*) FROM inbound_items"
+                " WHERE status = '분류완료' AND warehouse IS NOT NULL"
+                " GROUP BY product_id, warehouse"
+            )
+        )
+    }
+    fixes = [
+        {"pid": pid, "wh": wh, "n": actual.get((pid, wh), 0)}
+        for pid, wh in set(current) | set(actual)
+        if current.get((pid, wh), 0) != actual.get((pid, wh), 0)
+    ]
+    if fixes:
+        conn.execute(text(_set_sql(conn)), fixes)
+    return len(fixes)
+
+
+def emit_stock(product_id: int, warehouse: str, delta: int, inbound_id: int | None = None) -> None:
+    """재고 변동을 작업 로그(app.events)에."""
+    events.emit(
+        "stock",
+        source="server",
+        product_id=product_id,
+        inbound_id=inbound_id,
+        detail={"warehouse": warehouse, "delta": delta},
+    )
+
+
+async def classify_box(inbound_item_id: int, warehouse: str) -> dict:
+    box = await repository.write(classify_box_tx, inbound_item_id, warehouse)
+    emit_stock(box["product_id"], warehouse, 1, box["inbound_id"])
+    return box
+
+
+async def ship_box(inbound_item_id: int) -> dict:
+    box = await repository.write(ship_box_tx, inbound_item_id)
+    emit_stock(box["product_id"], box["warehouse"], -1, box["inbound_id"])
+    return box
+
+
+async def warehouse_stock() -> list[dict]:
+    return await repository.read(select_stock_tx)
+
+
+async def reconcile() -> int:
+    """재고 집계 재계산. 고친 수 반환 (차이가 있었으면 warning 로그)."""
+    t0 = time.monotonic()
+    n = await repository.write(reconcile_tx)
+    _last_reconcile.update(
+        at=datetime.now().isoformat(timespec="seconds"),
+        corrections=n,
+        ms=round((time.monotonic() - t0) * 1000, 1),
+    )
+    if n:
+        logger.warning("[inventory] reconcile corrected %d warehouse_stock row(s)", n)
+    return n
+
+
+async def _reconcile_loop() -> None:
+    while True:
+        await asyncio.sleep(RECONCILE_INTERVAL)
+        try:
+            await reconcile()
+        except Exception as e:
+            logger.warning("[inventory] reconcile failed: %s", e)
+
+
+async def start() -> None:
+    global _reconciler
+    if RECONCILE_INTERVAL > 0 and _reconciler is None:
+        _reconciler = asyncio.create_task(_reconcile_loop())
+
+
+async def stop() -> None:
+    global _reconciler
+    if _reconciler is not None:
+        _reconciler.cancel()
+        try:
+            await _reconciler
+        except asyncio.CancelledError:
+            pass
+        _reconciler = None
+
+
+def stats() -> dict[str, Any]:
+    """/metrics 용 마지막 reconcile 결과."""
+    return {"reconcile_interval": RECONCILE_INTERVAL, "last_reconcile": dict(_last_reconcile)}
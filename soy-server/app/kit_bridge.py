@@ -0,0 +1,258 @@
+"""
+분류키트(SoyController, ESP32-CAM) 브릿지: TCP 서버 (요청/응답) + UDP 수신 (센서 틱·QR 인식 등 고빈도 이벤트, 분류 판정).
+NDJSON 한 줄 = JSON, UTF-8, LF — Soy-PC 와 같은 request/response 형식. 인증 없음 (공장 내부망 전제).
+요청은 모두 이벤트 루프에서 바로 답하므로 (classify 는 메모리 조회, DB 기록은 app.classifier writer 가 나중에)
+한 연결의 응답은 요청 순서 그대로. 한 번에 읽은 요청들의 응답은 모아서 한 번에 전송.
+분류 결과 기록이 밀리면 (classifier.overloaded) 응답 body.backpressure=true, TCP 는 잠시 다음 요청을 읽지 않음.
+
+UDP: 데이터그램 하나 = request 하나 (끝의 LF 는 선택). id 는 키트(송신 주소)별로 증가하는 순번(seq).
+- 중복 제거: 주소별 최근 UDP_DEDUP_WINDOW 개 seq 를 기억해 재전송은 다시 처리하지 않음.
+  응답했던 요청이면 저장해 둔 같은 응답을 다시 보냄 (ack 가 유실돼 키트가 재전송한 경우).
+- body.boot: 키트가 켜질 때마다 새로 정하는 값(부팅 nonce). 주소의 boot 가 바뀌면 재시작으로 보고 순번 상태를 버림
+  (재시작 직후 작은 seq 가 이전 부팅의 판정 응답과 섞이지 않도록). boot 를 안 보내는 키트는 seq 가 창보다 훨씬 작아질 때만 재시작으로 봄.
+- ack: body.ack 가 true 면 response 데이터그램으로 응답. classify 는 기본 true (판정 결과가 곧 ack), 그 밖의 요청은 기본 false.
+- 순번이 건너뛰면 gaps, 이미 지난 번호가 새로 오면 reordered, 재시작은 reboots 로 셈 (/metrics kit).
+- 처리는 TCP 와 같은 handle_request (classify → app.classifier, event → 텔레메트리 집계).
+event 중 kind 가 작업 로그 종류(app.events.KINDS: work_start, work_end, step, counting 등)면 작업 로그에도 남김 (TCP·UDP 공통).
+환경변수: SOY_KIT_TCP_PORT(기본 9002), SOY_KIT_MAX_LINE(바이트, 기본 4096),
+          SOY_KIT_UDP_PORT(기본 9002, 0이면 UDP 끔), SOY_KIT_UDP_DEDUP_WINDOW(기본 1024), SOY_KIT_UDP_MAX_PEERS(기본 1024)
+"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict, deque
+from typing import Any
+
+from app import classifier, events
+from app.codec import Request, decode_message, dumps
+from app.framing import FramingError, LineFramer
+
+logger = logging.getLogger(__name__)
+
+TCP_PORT = int(os.environ.get("SOY_KIT_TCP_PORT", "9002"))
+MAX_LINE = int(os.environ.get("SOY_KIT_MAX_LINE", "4096"))
+UDP_PORT = int(os.environ.get("SOY_KIT_UDP_PORT", str(TCP_PORT)))
+UDP_DEDUP_WINDOW = max(1, int(os.environ.get("SOY_KIT_UDP_DEDUP_WINDOW", "1024")))
+UDP_MAX_PEERS = max(1, int(os.environ.get("SOY_KIT_UDP_MAX_PEERS", "1024")))
+# 한 번의 전송 대기 상한(초). 넘으면 연결 종료
+SEND_TIMEOUT = 5.0
+# 분류 결과 기록이 밀렸을 때 다음 요청을 읽기 전 기다리는 최대 시간(초)
+BACKPRESSURE_WAIT = 1.0
+
+_tcp_server: asyncio.Server | None = None
+_udp_transport: asyncio.DatagramTransport | None = None
+_writers: set[asyncio.StreamWriter] = set()
+# event 종류 → 수. 키트가 보내는 kind 는 임의 문자열이라 작업 로그 종류(events.KINDS)만 따로 세고 나머지는 "other" 하나로
+_telemetry: dict[str, int] = {}
+_udp_counts = {"packets": 0, "invalid": 0, "duplicates": 0, "gaps": 0, "reordered": 0, "reboots": 0, "acks": 0}
+
+
+def handle_request(action: str, body: dict[str, Any]) -> tuple[bool, Any, str]:
+    """(ok, body, error). 대기 없음."""
+    if action == "classify":
+        return (True, classifier.classify(body), "")
+    if action == "event":
+        kind = str(body.get("kind") or "unknown")
+        key = kind if kind in events.KINDS else "other"
+        _telemetry[key] = _telemetry.get(key, 0) + 1
+        if kind in events.KINDS:
+            _log_event(kind, body)
+        return (True, None, "")
+    if action == "ping":
+        return (True, None, "")
+    return (False, None, f"Unknown action: {action}")
+
+
+def _log_event(kind: str, body: dict[str, Any]) -> None:
+    """작업 로그 종류(events.KINDS)의 event 는 작업 로그에. worker_id / product_id / inbound_id 외 필드는 detail."""
+    ids: dict[str, int | None] = {}
+    for key in ("worker_id", "product_id", "inbound_id"):
+        try:
+            ids[key] = int(body[key]) if body.get(key) is not None else None
+        except (TypeError, ValueError):
+            ids[key] = None
+    detail = {k: v for k, v in body.items() if k not in ("kind", "ack", "boot", "worker_id", "product_id", "inbound_id")}
+    events.emit(kind, source="kit", detail=detail, **ids)
+
+
+def _response(req: Request, newline: bool = True) -> bytes:
+    try:
+        ok, body, err = handle_request(req.action, req.body or {})
+    except Exception as e:
+        logger.exception("[Kit] %s failed", req.action)
+        ok, body, err = False, None, str(e)
+    data = dumps({"type": "response", "id": req.id, "ok": ok, "body": body, "error": err if not ok else None})
+    return data + b"\n" if newline else data
+
+
+class _Peer:
+    """UDP 키트 하나(송신 주소)의 순번 상태."""
+
+    __slots__ = ("boot", "highest", "seen", "order", "replies")
+
+    def __init__(self, boot: Any = None):
+        self.boot = boot  # 키트 부팅 nonce (body.boot)
+        self.highest = -1
+        self.seen: set[int] = set()
+        self.order: deque[int] = deque()
+        self.replies: dict[int, bytes] = {}  # seq → 보낸 응답 (seen 과 함께 만료)
+
+    def remember(self, seq: int, reply: bytes | None) -> None:
+        self.seen.add(seq)
+        self.order.append(seq)
+        if reply is not None:
+            self.replies[seq] = reply
+        while len(self.order) > UDP_DEDUP_WINDOW:
+            old = self.order.popleft()
+            self.seen.discard(old)
+            self.replies.pop(old, None)
+
+
+class _KitDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.transport: asyncio.DatagramTransport | None = None
+        self.peers: OrderedDict[Any, _Peer] = OrderedDict()
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def _peer(self, addr, boot: Any) -> _Peer:
+        peer = self.peers.get(addr)
+        if peer is None:
+            peer = self.peers[addr] = _Peer(boot)
+            if len(self.peers) > UDP_MAX_PEERS:
+                self.peers.popitem(last=False)
+        else:
+            self.peers.move_to_end(addr)
+        return peer
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        _udp_counts["packets"] += 1
+        req = decode_message(data.rstrip(b"\r\n"))
+        if not isinstance(req, Request) or not isinstance(req.id, int) or isinstance(req.id, bool):
+            _udp_counts["invalid"] += 1
+            return
+        body = req.body or {}
+        boot = body.get("boot")
+        peer = self._peer(addr, boot)
+        if boot != peer.boot:
+            # 키트 재시작: 이전 부팅의 순번·응답은 새 순번과 겹칠 수 있으므로 버림
+            _udp_counts["reboots"] += 1
+            peer = self.peers[addr] = _Peer(boot)
+        seq = req.id
+        if seq in peer.seen:
+            _udp_counts["duplicates"] += 1
+            reply = peer.replies.get(seq)
+            if reply is not None:
+                self._send(reply, addr)
+            return
+        if boot is None and seq < peer.highest - UDP_DEDUP_WINDOW:
+            # boot 없는 키트: 창보다 오래된 번호면 재시작(순번 초기화)으로 보고 상태를 새로 시작
+            _udp_counts["reboots"] += 1
+            peer = self.peers[addr] = _Peer()
+        elif seq > peer.highest + 1 and peer.highest >= 0:
+            _udp_counts["gaps"] += seq - peer.highest - 1
+        elif seq < peer.highest:
+            _udp_counts["reordered"] += 1
+        peer.highest = max(peer.highest, seq)
+        reply = _response(req, newline=False)
+        if body.get("ack", req.action == "classify"):
+            peer.remember(seq, reply)
+            self._send(reply, addr)
+        else:
+            peer.remember(seq, None)
+
+    def _send(self, data: bytes, addr) -> None:
+        if self.transport is not None:
+            self.transport.sendto(data, addr)
+            _udp_counts["acks"] += 1
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("[Kit] UDP error: %s", exc)
+
+
+async def _handle_kit(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    addr = writer.get_extra_info("peername")
+    _writers.add(writer)
+    msg = f"[Kit] connected from {addr} (total {len(_writers)} kit(s))"
+    logger.info(msg)
+    print(msg, flush=True)
+    framer = LineFramer(MAX_LINE)
+    try:
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            framer.feed(chunk)
+            out = []
+            while (line := framer.next_line()) is not None:
+                req = decode_message(line)
+                if isinstance(req, Request):
+                    out.append(_response(req))
+            if out:
+                writer.write(b"".join(out))
+                await asyncio.wait_for(writer.drain(), timeout=SEND_TIMEOUT)
+            if classifier.overloaded():
+                # 읽기를 멈춰 TCP 수신 창으로 키트 송신을 늦춤
+                await classifier.wait_relief(BACKPRESSURE_WAIT)
+    except FramingError as e:
+        logger.warning("[Kit] %s: %s -> disconnect", addr, e)
+    except asyncio.TimeoutError:
+        logger.warning("[Kit] %s: send timed out -> disconnect", addr)
+    except (ConnectionResetError, BrokenPipeError, OSError):
+        pass
+    finally:
+        _writers.discard(writer)
+        writer.close()
+        logger.info("[Kit] disconnected %s", addr)
+
+
+async def start() -> None:
+    global _tcp_server, _udp_transport
+    try:
+        _tcp_server = await asyncio.start_server(
+            _handle_kit, host="0.0.0.0", port=TCP_PORT, reuse_address=True
+        )
+        msg = f"[Kit] listening on port {TCP_PORT} (SoyController)"
+        logger.info(msg)
+        print(msg, flush=True)
+    except Exception as e:
+        msg = f"[Kit] failed to bind port {TCP_PORT}: {e}"
+        logger.error(msg)
+        print(msg, flush=True)
+    if UDP_PORT > 0:
+        try:
+            _udp_transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                _KitDatagramProtocol, local_addr=("0.0.0.0", UDP_PORT)
+            )
+            msg = f"[Kit] listening on UDP port {UDP_PORT} (SoyController)"
+            logger.info(msg)
+            print(msg, flush=True)
+        except Exception as e:
+            msg = f"[Kit] failed to bind UDP port {UDP_PORT}: {e}"
+            logger.error(msg)
+            print(msg, flush=True)
+
+
+async def stop() -> None:
+    global _tcp_server, _udp_transport
+    if _udp_transport is not None:
+        _udp_transport.close()
+        _udp_transport = None
+    server = _tcp_server
+    _tcp_server = None
+    if server is not None:
+        server.close()
+    for writer in list(_writers):
+        writer.close()
+    _writers.clear()
+    if server is not None:
+        try:
+            await asyncio.wait_for(server.wait_closed(), timeout=5.0)
+        except (asyncio.TimeoutError, Exception):
+            pass
+
+
+def stats() -> dict[str, Any]:
+    """/metrics 용."""
+    return {"tcp_connections": len(_writers), "udp": dict(_udp_counts), "events": dict(_telemetry)}
@@ -3,19 +3,44 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app import classifier, events, hashing, inventory, kit_bridge, repository, sessions, worker_directory
+from app.database import dispose_async_engine, pool_stats, shutdown_executor
 from app.pc_bridge import start as bridge_start, stop as bridge_stop
 
 # RFID/시리얼/TCP 브릿지 디버깅용 로그 출력
 logging.getLogger("app").setLevel(logging.INFO)
+logger = logging.getLogger("app.main")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    bridge_start()
+    try:
+        n = await repository.warm_directory()
+        msg = f"[workers] directory warmed ({n} workers)"
+        logger.info(msg)
+        print(msg, flush=True)
+    except Exception as e:
+        # DB 미기동 등: 디렉터리 없이 DB 직접 조회로 동작
+        msg = f"[workers] directory warm failed, falling back to DB: {e}"
+        logger.warning(msg)
+        print(msg, flush=True)
+    await events.start()
+    await bridge_start()
+    await inventory.start()
+    await classifier.start()
+    await kit_bridge.start()
     try:
         yield
     finally:
-        bridge_stop()
+        await kit_bridge.stop()
+        await classifier.stop()
+        await inventory.stop()
+        await bridge_stop()
+        await events.stop()
+        hashing.shutdown()
+        await dispose_async_engine()
+        # DB 스레드풀은 마지막에 — 위의 정지 단계(작업 로그 마지막 기록 등)가 run_sync 로 쓰므로
+        shutdown_executor()
 
 
 app = FastAPI(title="SoyServer", lifespan=lifespan)
@@ -29,3 +54,17 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "db_pool": pool_stats(),
+        "bcrypt": hashing.stats(),
+        "sessions": sessions.stats(),
+        "inventory": inventory.stats(),
+        "classifier": classifier.stats(),
+        "events": events.stats(),
+        "kit": kit_bridge.stats(),
+        "worker_directory": {"loaded": worker_directory.loaded(), "size": worker_directory.size()},
+    }
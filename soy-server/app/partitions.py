@@ -0,0 +1,287 @@
+"""
+월 단위 파티션 관리 (마이그레이션 007·009 의 inbound_items / access_logs / events, MySQL 전용). soy-server 디렉터리에서 명령으로 실행:
+
+    python -m app.partitions list
+    python -m app.partitions ensure [--months-ahead 3]
+    python -m app.partitions archive [--keep-months 12] [--format table|parquet] [--out DIR] [--dry-run]
+
+- ensure: pmax 를 쪼개 이번 달 + months-ahead 까지 월 파티션을 미리 만듦 (pmax 가 비어 있으면 메타데이터 변경만). 멱등 —
+  entrypoint 에서 마이그레이션 직후 실행.
+- archive: keep-months 보다 오래된 닫힌 월 파티션을 보관으로 옮기고 원본 파티션을 DROP.
+  EXCHANGE PARTITION 으로 파티션을 빈 스테이징 테이블과 맞바꾸므로 행 복사 없이 즉시 빠짐.
+  - table: 스테이징 테이블을 `<테이블>_archive_<YYYYMM>` 로 이름 바꾸고 ROW_FORMAT=COMPRESSED 로 재작성.
+  - parquet: 스테이징 테이블을 `<out>/<테이블>_<YYYYMM>.parquet` 로 쓰고 삭제 (pyarrow 필요 — `pip install soy-factory[archive]`).
+  inbound_items 는 파티션 안 상자가 모두 출고됨일 때만 옮김 (재고·분류 대상이 남은 달은 건너뜀). p_none(미분류)은 대상 아님.
+  보관본의 행 수를 확인한 뒤에만 원본 파티션을 DROP. 중간에 실패하면 행은 `<테이블>_archive_<YYYYMM>_tmp` 에 남고
+  다음 archive 가 거기서 이어서 보관함 (tmp 를 지우고 다시 시작하지 않음).
+DB 는 app.database 와 같은 SOY_DATABASE_URL / MYSQL_*.
+"""
+import argparse
+import os
+import re
+import sys
+from datetime import date
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.database import get_engine
+
+# 테이블 → (파티션 키 열, 보관 전 확인할 조건 — 이 조건에 맞는 행이 하나라도 있으면 건너뜀)
+TABLES: dict[str, tuple[str, str | None]] = {
+    "inbound_items": ("part_key", "status <> '출고됨'"),
+    "access_logs": ("checked_at", None),
+    "events": ("created_at", None),
+}
+
+_MONTH_RE = re.compile(r"^p(\d{4})(\d{2})$")
+_EXPORT_BATCH = 10000
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def _add_months(d: date, n: int) -> date:
+    m = d.year * 12 + d.month - 1 + n
+    return date(m // 12, m % 12 + 1, 1)
+
+
+def _month_of(name: str) -> date | None:
+    m = _MONTH_RE.match(name)
+    return date(int(m.group(1)), int(m.group(2)), 1) if m else None
+
+
+def list_partitions(conn: Connection, table: str) -> list[dict[str, Any]]:
+    """[{"name", "less_than", "rows"}] 파티션 순. rows 는 InnoDB 추정치."""
+    rows = conn.execute(
+        text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS"
+            " FROM information_schema.PARTITIONS"
+            " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t AND PARTITION_NAME IS NOT NULL"
+            " ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"t": table},
+    ).fetchall()
+    return [{"name": r[0], "less_than": r[1], "rows": int(r[2] or 0)} for r in rows]
+
+
+def ensure_partitions(conn: Connection, table: str, months_ahead: int = 3) -> list[str]:
+    """이번 달 + months_ahead 까지 월 파티션이 있도록 pmax 를 재구성. 새로 만든 파티션 이름 반환."""
+    parts = list_partitions(conn, table)
+    if not parts:
+        raise RuntimeError(f"{table} 는 파티션 테이블이 아닙니다 (마이그레이션 007·009 적용 필요)")
+    months = [m for m in (_month_of(p["name"]) for p in parts) if m]
+    target = _add_months(date.today().replace(day=1), months_ahead)
+    month = _next_month(max(months)) if months else date.today().replace(day=1)
+    new = []
+    while month <= target:
+        new.append((f"p{month:%Y%m}", _next_month(month)))
+        month = _next_month(month)
+    if not new:
+        return []
+    defs = ", ".join(f"PARTITION {name} VALUES LESS THAN ('{bound:%Y-%m-%d}')" for name, bound in new)
+    conn.execute(
+        text(
+            f"ALTER TABLE `{table}` REORGANIZE PARTITION pmax INTO"
+            f" ({defs}, PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+        )
+    )
+    return [name for name, _ in new]
+
+
+def _closed_partitions(conn: Connection, table: str, keep_months: int) -> list[tuple[str, date]]:
+    cutoff = _add_months(date.today().replace(day=1), -keep_months)
+    out = []
+    for p in list_partitions(conn, table):
+        month = _month_of(p["name"])
+        if month is not None and month < cutoff:
+            out.append((p["name"], month))
+    return out
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("parquet 보관에는 pyarrow 가 필요합니다 (pip install soy-factory[archive])") from e
+    return pa, pq
+
+
+def _write_parquet(conn: Connection, staging: str, path: str) -> int:
+    """staging 테이블 전체를 path 에 기록. 기록한 행 수."""
+    pa, pq = _pyarrow()
+    result = conn.execution_options(stream_results=True, yield_per=_EXPORT_BATCH).execute(
+        text(f"SELECT * FROM `{staging}`")
+    )
+    columns = list(result.keys())
+    writer = None
+    n = 0
+    try:
+        for rows in result.partitions():
+            batch = pa.Table.from_pylist([dict(zip(columns, r)) for r in rows])
+            if writer is None:
+                writer = pq.ParquetWriter(path, batch.schema, compression="zstd")
+            writer.write_table(batch)
+            n += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n
+
+
+def _table_exists(conn: Connection, table: str) -> bool:
+    return bool(
+        conn.execute(
+            text("SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t"),
+            {"t": table},
+        ).scalar()
+    )
+
+
+def _count(conn: Connection, table: str, partition: str | None = None) -> int:
+    part = f" PARTITION ({partition})" if partition else ""
+    return int(conn.execute(text(f"SELECT COUNT(*) FROM `{table}`{part}")).scalar() or 0)
+
+
+def archive_partition(
+    conn: Connection, table: str, partition: str, month: date, fmt: str = "table", out_dir: str = "."
+) -> dict[str, Any]:
+    """파티션 하나를 보관으로 옮기고 DROP. {"partition", "rows", "target"} 또는 건너뛰면 {"partition", "skipped"}.
+
+    EXCHANGE 뒤 단계가 실패하면 행은 `<테이블>_archive_<YYYYMM>_tmp` 에 남음. 다음 실행은 그 테이블을 지우지 않고
+    이어서 보관하며 (원본 파티션이 비어 있을 때만), 보관본의 행 수를 확인한 뒤에만 원본 파티션을 DROP.
+    """
+    if fmt == "parquet":
+        _pyarrow()  # EXCHANGE 전에 확인 — 없으면 아무것도 옮기지 않음
+    _key, blocker = TABLES[table]
+    if blocker:
+        n = conn.execute(
+            text(f"SELECT COUNT(*) FROM `{table}` PARTITION ({partition}) WHERE {blocker}")
+        ).scalar()
+        if n:
+            return {"partition": partition, "skipped": f"{n} row(s) still open"}
+    staging = f"{table}_archive_{month:%Y%m}"
+    tmp = f"{staging}_tmp"
+    if fmt != "parquet" and _table_exists(conn, staging):
+        if _table_exists(conn, tmp) or _count(conn, table, partition):
+            raise RuntimeError(f"{staging} 가 이미 있습니다 — 확인 후 이름을 바꾸거나 지우고 다시 실행하세요")
+        # 지난 실행이 보관 테이블까지 만들고 DROP PARTITION 전에 실패: 빈 파티션만 정리
+        conn.execute(text(f"ALTER TABLE `{table}` DROP PARTITION {partition}"))
+        return {"partition": partition, "rows": _count(conn, staging), "target": staging, "resumed": True}
+    resumed = _table_exists(conn, tmp) and _count(conn, tmp) > 0
+    if resumed:
+        # 지난 실행이 EXCHANGE 후 실패: 행은 tmp 에 있음. 원본 파티션에도 행이 있으면 어느 쪽이 맞는지 알 수 없으므로 중단
+        left = _count(conn, table, partition)
+        if left:
+            raise RuntimeError(
+                f"{tmp} 와 {table}.{partition} 모두 행이 있습니다 ({left} row(s)) — 수동으로 확인하세요"
+            )
+    else:
+        conn.execute(text(f"DROP TABLE IF EXISTS `{tmp}`"))  # 비어 있는 tmp 만 지움
+        conn.execute(text(f"CREATE TABLE `{tmp}` LIKE `{table}`"))
+        conn.execute(text(f"ALTER TABLE `{tmp}` REMOVE PARTITIONING"))
+        conn.execute(text(f"ALTER TABLE `{table}` EXCHANGE PARTITION {partition} WITH TABLE `{tmp}`"))
+    expected = _count(conn, tmp)
+    if fmt == "parquet":
+        _pa, pq = _pyarrow()
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, f"{table}_{month:%Y%m}.parquet")
+        rows = _write_parquet(conn, tmp, path + ".part")  # 빈 파티션이면 파일 없음
+        written = pq.read_metadata(path + ".part").num_rows if rows else 0
+        if rows != expected or written != expected:
+            raise RuntimeError(f"{path}: {expected} row(s) 중 {written} row(s) 기록됨 — {tmp} 는 남겨 둠")
+        if rows:
+            os.replace(path + ".part", path)
+        conn.execute(text(f"DROP TABLE `{tmp}`"))
+        target = path
+    else:
+        conn.execute(text(f"ALTER TABLE `{tmp}` ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8"))
+        conn.execute(text(f"RENAME TABLE `{tmp}` TO `{staging}`"))
+        rows = _count(conn, staging)
+        if rows != expected:
+            raise RuntimeError(f"{staging}: {expected} row(s) 중 {rows} row(s)만 있습니다")
+        target = staging
+    # EXCHANGE 후 원본 파티션에 새로 들어온 행이 있으면 DROP 하지 않음
+    left = _count(conn, table, partition)
+    if left:
+        raise RuntimeError(f"{table}.{partition} 에 보관 후 {left} row(s) 가 새로 들어왔습니다 — DROP 하지 않음")
+    conn.execute(text(f"ALTER TABLE `{table}` DROP PARTITION {partition}"))
+    out = {"partition": partition, "rows": rows, "target": target}
+    if resumed:
+        out["resumed"] = True
+    return out
+
+
+def archive(
+    engine: Engine | None = None,
+    tables: list[str] | None = None,
+    keep_months: int = 12,
+    fmt: str = "table",
+    out_dir: str = ".",
+    dry_run: bool = False,
+) -> list[dict[str, Any]]:
+    """keep_months 보다 오래된 월 파티션을 보관. 파티션마다 결과 dict (table 포함)."""
+    eng = engine or get_engine()
+    results = []
+    with eng.connect() as conn:
+        # DDL 은 MySQL 에서 암묵 커밋 — 트랜잭션으로 묶이지 않음
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in tables or list(TABLES):
+            for partition, month in _closed_partitions(conn, table, keep_months):
+                if dry_run:
+                    results.append({"table": table, "partition": partition, "dry_run": True})
+                    continue
+                results.append({"table": table, **archive_partition(conn, table, partition, month, fmt, out_dir)})
+    return results
+
+
+def ensure(engine: Engine | None = None, months_ahead: int = 3) -> dict[str, list[str]]:
+    eng = engine or get_engine()
+    with eng.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        return {table: ensure_partitions(conn, table, months_ahead) for table in TABLES}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.partitions", description="월 파티션 관리 / 보관")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="파티션 목록")
+    p_ensure = sub.add_parser("ensure", help="앞으로 쓸 월 파티션 생성")
+    p_ensure.add_argument("--months-ahead", type=int, default=3)
+    p_archive = sub.add_parser("archive", help="오래된 월 파티션 보관")
+    p_archive.add_argument("--keep-months", type=int, default=12, help="보관하지 않고 남길 최근 개월 수")
+    p_archive.add_argument("--format", choices=("table", "parquet"), default="table")
+    p_archive.add_argument("--out", default="archive", help="parquet 출력 디렉터리")
+    p_archive.add_argument("--table", action="append", choices=list(TABLES), help="대상 테이블 (여러 번 지정 가능)")
+    p_archive.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    engine = get_engine()
+    if engine.dialect.name != "mysql":
+        print(f"[partitions] MySQL 전용입니다 (현재: {engine.dialect.name})", file=sys.stderr)
+        return 2
+    if args.command == "list":
+        with engine.connect() as conn:
+            for table in TABLES:
+                for p in list_partitions(conn, table):
+                    print(f"{table:>14} {p['name']:>8} < {p['less_than']:<22} ~{p['rows']:,} rows")
+    elif args.command == "ensure":
+        for table, created in ensure(engine, args.months_ahead).items():
+            print(f"[partitions] {table}: {', '.join(created) if created else 'up to date'}", flush=True)
+    else:
+        for r in archive(engine, args.table, args.keep_months, args.format, args.out, args.dry_run):
+            if r.get("dry_run"):
+                print(f"[partitions] {r['table']}.{r['partition']}: would archive")
+            elif "skipped" in r:
+                print(f"[partitions] {r['table']}.{r['partition']}: skipped ({r['skipped']})")
+            else:
+                resumed = " (resumed)" if r.get("resumed") else ""
+                print(f"[partitions] {r['table']}.{r['partition']}: {r['rows']:,} rows -> {r['target']}{resumed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,65 +1,226 @@
 """
 Soy-PC 브릿지: 시리얼 수신(Register Controller) + TCP 서버(요청/응답 + card_read 푸시).
 Worker CRUD는 admin 로그인(세션 토큰) 후에만 허용.
-NDJSON 한 줄 = JSON, UTF-8, LF.
+NDJSON 한 줄 = JSON, UTF-8, LF. 인코딩/디코딩은 app.codec (orjson/msgspec 있으면 사용).
+TCP 서버는 uvicorn 이벤트 루프 위의 asyncio 스트림 서버 (연결당 스레드 없음).
+DB 작업은 app.repository (비동기 드라이버, 없으면 database.run_sync 스레드풀), bcrypt 는 app.hashing 전용 풀에서 실행.
+한 연결의 요청은 동시에 처리되며(최대 SOY_PC_MAX_INFLIGHT개), 응답은 끝나는 순서대로 id와 함께 전송.
+송신은 클라이언트별 bounded 큐 + writer 태스크가 담당. 느린 클라이언트는 푸시를 버리거나(drop) 끊음(disconnect).
+첫 메시지로 {"type":"hello","protocol":"msgpack"} 을 보낸 연결은 hello 응답 이후 길이 prefix MessagePack 프레임 사용.
 """
-import json
+import asyncio
 import logging
 import os
-import socket
 import threading
-import uuid
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
-from app import workers
+from app import admin_cache, events, inbounds, inventory, repository, sessions, worker_csv, worker_directory, workers
 from app.auth import create_first_admin, verify_admin_password
+from app.hashing import HashingBusy
+from app.codec import (
+    HAS_MSGPACK,
+    PROTOCOL_MSGPACK,
+    PROTOCOL_NDJSON,
+    DecodeError,
+    Hello,
+    Request,
+    decode_message,
+    dumps,
+    loads,
+    pack,
+)
+from app.database import run_sync
+from app.framing import DEFAULT_MAX_LINE, FrameReader, FramingError, LineFramer, frame
 
 # 환경변수
 TCP_PORT = int(os.environ.get("SOY_PC_TCP_PORT", "9001"))
+TCP_BACKLOG = int(os.environ.get("SOY_PC_TCP_BACKLOG", "512"))
+# 연결당 동시 처리 요청 수 상한. 넘으면 앞선 요청이 끝날 때까지 다음 요청을 읽지 않음
+MAX_INFLIGHT = max(1, int(os.environ.get("SOY_PC_MAX_INFLIGHT", "8")))
+# 클라이언트별 송신 큐 길이, 느린 클라이언트 정책(drop | disconnect), 한 번의 전송 대기 상한(초)
+SEND_QUEUE_SIZE = max(1, int(os.environ.get("SOY_PC_SEND_QUEUE", "256")))
+SLOW_CLIENT_POLICY = os.environ.get("SOY_PC_SLOW_CLIENT_POLICY", "drop").strip().lower()
+SEND_TIMEOUT = float(os.environ.get("SOY_PC_SEND_TIMEOUT", "10"))
+# 요청 한 줄(또는 MessagePack 프레임) 최대 바이트. 넘으면 프로토콜 오류로 연결 종료
+MAX_LINE = int(os.environ.get("SOY_PC_MAX_LINE", str(DEFAULT_MAX_LINE)))
+# hello 로 MessagePack 프레임 전환 허용 여부 (msgspec 또는 msgpack 설치 필요)
+ALLOW_MSGPACK = HAS_MSGPACK and os.environ.get("SOY_PC_ALLOW_MSGPACK", "1").strip().lower() not in ("0", "false", "no")
+# 연결당 동시에 진행할 수 있는 import_workers 수
+MAX_IMPORTS_PER_CLIENT = 4
+# 작업자 변경 알림(worker_changed)을 모아 보내는 간격(초). 이 시간 안의 변경은 푸시 1건으로 합침
+WORKER_PUSH_DELAY = float(os.environ.get("SOY_PC_WORKER_PUSH_DELAY", "0.2"))
 SERIAL_PORT = os.environ.get("SOY_REGISTER_SERIAL_PORT", "").strip()
 SERIAL_BAUD = int(os.environ.get("SOY_REGISTER_BAUD", "9600"))
 
-_clients: set[socket.socket] = set()
-_clients_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_tcp_server: asyncio.Server | None = None
 _serial_thread: threading.Thread | None = None
-_tcp_thread: threading.Thread | None = None
-_tcp_server_socket: socket.socket | None = None
 _stop = threading.Event()
+_worker_push_handle: asyncio.TimerHandle | None = None
 
-# admin 세션: token -> admin_id (Worker CRUD는 유효한 토큰 필요)
-_sessions: dict[str, int] = {}
-_sessions_lock = threading.Lock()
+
+class _Client:
+    """연결 하나의 송신 큐 + writer 태스크. 소켓에 쓰는 것은 writer 태스크뿐."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.addr = writer.get_extra_info("peername")
+        self.protocol = PROTOCOL_NDJSON
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.dropped = 0
+        self.imports: dict[str, worker_csv.ImportJob] = {}  # 진행 중인 import_workers (연결과 함께 버려짐)
+        self.import_locks: dict[str, asyncio.Lock] = {}
+        self._task = asyncio.create_task(self._write_loop())
+
+    def encode(self, obj: Any) -> bytes:
+        """연결 프로토콜에 맞게 메시지 한 개를 전송 바이트로."""
+        if self.protocol == PROTOCOL_MSGPACK:
+            return frame(pack(obj))
+        return dumps(obj) + b"\n"
+
+    async def send(self, obj: Any) -> None:
+        """응답 전송. 큐가 가득 차면 자리가 날 때까지 대기 (해당 요청만 대기, 최대 SEND_TIMEOUT)."""
+        if self.writer.is_closing():
+            return
+        data = self.encode(obj)
+        try:
+            await asyncio.wait_for(self.queue.put(data), timeout=SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("[TCP] slow client %s: response not queued in time -> disconnect", self.addr)
+            self.abort()
+
+    def push(self, data: bytes) -> bool:
+        """푸시(브로드캐스트) 전송. 대기하지 않음. 큐가 가득 차면 정책에 따라 버리거나 연결 종료."""
+        if self.writer.is_closing():
+            return False
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            pass
+        self.dropped += 1
+        if SLOW_CLIENT_POLICY == "disconnect":
+            logger.warning("[TCP] slow client %s: send queue full -> disconnect", self.addr)
+            self.abort()
+        elif self.dropped == 1 or self.dropped % 100 == 0:
+            logger.warning("[TCP] slow client %s: send queue full -> push dropped (%d)", self.addr, self.dropped)
+        return False
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                data = await self.queue.get()
+                if data is None:
+                    break
+                # 쌓인 메시지는 한 번에 모아서 전송
+                chunks = [data]
+                closing = False
+                while not self.queue.empty():
+                    more = self.queue.get_nowait()
+                    if more is None:
+                        closing = True
+                        break
+                    chunks.append(more)
+                self.writer.write(b"".join(chunks))
+                await asyncio.wait_for(self.writer.drain(), timeout=SEND_TIMEOUT)
+                if closing:
+                    break
+        except asyncio.TimeoutError:
+            logger.warning("[TCP] slow client %s: send timed out -> disconnect", self.addr)
+        except (ConnectionResetError, BrokenPipeError, OSError):
+            pass
+        finally:
+            _clients.discard(self)
+            self.writer.close()
+
+    async def aclose(self) -> None:
+        """남은 송신 큐를 비운 뒤 연결 종료."""
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+    def abort(self) -> None:
+        """송신 큐를 버리고 즉시 연결 종료."""
+        _clients.discard(self)
+        self._task.cancel()
+        self.writer.close()
+
+
+# 연결된 클라이언트. 이벤트 루프 스레드에서만 접근 (시리얼 스레드는 call_soon_threadsafe 사용)
+_clients: set[_Client] = set()
+
+
+def _broadcast(obj: dict[str, Any]) -> tuple[int, int]:
+    """이벤트 루프에서 실행. 모든 클라이언트 송신 큐에 obj 추가 (대기 없음). 인코딩은 프로토콜별 1회. (전달 수, 전체 수)."""
+    n = len(_clients)
+    encoded: dict[str, bytes] = {}
+    sent = 0
+    for client in list(_clients):
+        data = encoded.get(client.protocol)
+        if data is None:
+            data = encoded[client.protocol] = client.encode(obj)
+        if client.push(data):
+            sent += 1
+    return (sent, n)
+
+
+def _broadcast_card(obj: dict[str, Any], uid: str) -> None:
+    worker = worker_directory.get_by_card(uid) if uid else None
+    events.emit(
+        "access",
+        source="rfid",
+        worker_id=worker["worker_id"] if worker else None,
+        detail={"card_uid": uid},
+    )
+    sent, n = _broadcast(obj)
+    msg = f"[RFID] card_read broadcast uid={uid!r} -> {sent}/{n} client(s)"
+    logger.info(msg)
+    print(msg, flush=True)
 
 
 def _broadcast_card_read(line: str) -> None:
-    """card_read NDJSON 한 줄을 모든 연결된 클라이언트에 전송."""
-    data = (line.strip() + "\n").encode("utf-8")
-    with _clients_lock:
-        n = len(_clients)
-        dead = []
-        for sock in _clients:
-            try:
-                sock.sendall(data)
-            except (BrokenPipeError, ConnectionResetError, OSError):
-                dead.append(sock)
-        for sock in dead:
-            _clients.discard(sock)
-            try:
-                sock.close()
-            except Exception:
-                pass
+    """card_read NDJSON 한 줄을 모든 연결된 클라이언트에 전송. 시리얼 스레드에서 호출."""
+    loop = _loop
+    if loop is None or loop.is_closed():
+        return
     try:
-        obj = json.loads(line)
-        uid = obj.get("uid", "") if isinstance(obj, dict) else ""
-        msg = f"[RFID] card_read broadcast uid={uid!r} -> {n} client(s)"
-        logger.info(msg)
-        print(msg, flush=True)
-    except Exception:
-        msg = f"[RFID] card_read broadcast -> {n} client(s)"
-        logger.info(msg)
-        print(msg, flush=True)
+        obj = loads(line)
+    except DecodeError:
+        return
+    if not isinstance(obj, dict):
+        return
+    loop.call_soon_threadsafe(_broadcast_card, obj, obj.get("uid", ""))
+
+
+def _on_workers_changed() -> None:
+    """작업자 디렉터리 변경 리스너 (변경을 커밋한 DB 스레드에서 호출). 이벤트 루프에 알림 예약."""
+    loop = _loop
+    if loop is None or loop.is_closed():
+        return
+    loop.call_soon_threadsafe(_schedule_worker_changed)
+
+
+def _schedule_worker_changed() -> None:
+    """이벤트 루프에서 실행. 이미 예약된 알림이 있으면 그 알림에 합침."""
+    global _worker_push_handle
+    if _worker_push_handle is None and _loop is not None:
+        _worker_push_handle = _loop.call_later(WORKER_PUSH_DELAY, _flush_worker_changed)
+
+
+def _flush_worker_changed() -> None:
+    """최신 (epoch, version) 을 worker_changed 로 브로드캐스트. 데이터는 싣지 않음 (받은 PC가 list_workers_since 로 가져감)."""
+    global _worker_push_handle
+    _worker_push_handle = None
+    epoch, version = worker_directory.current_version()
+    sent, n = _broadcast({"type": "worker_changed", "epoch": epoch, "version": version})
+    logger.info("[TCP] worker_changed version=%d -> %d/%d client(s)", version, sent, n)
 
 
 def _require_admin(body: dict[str, Any]) -> tuple[bool, str]:
@@ -67,37 +228,35 @@ def _require_admin(body: dict[str, Any]) -> tuple[bool, str]:
     token = body.get("auth_token")
     if not token or not isinstance(token, str):
         return (False, "Admin login required")
-    with _sessions_lock:
-        if token not in _sessions:
-            return (False, "Admin login required")
+    if sessions.get(token) is None:
+        return (False, "Admin login required")
     return (True, "")
 
 
-def _handle_request(action: str, body: dict[str, Any]) -> tuple[bool, Any, str]:
-    """CRUD 또는 admin_login 실행. (ok, body_or_none, error_message)."""
+async def _handle_request(
+    action: str, body: dict[str, Any], client: "_Client | None" = None, req_id: Any = None
+) -> tuple[bool, Any, str]:
+    """CRUD 또는 admin_login 실행. (ok, body_or_none, error_message).
+    import_workers / export_workers 는 연결 상태가 필요하므로 client(와 export 의 경우 req_id)가 있어야 함."""
     try:
         if action == "admin_login":
             password = (body.get("password") or "").strip()
             if not password:
                 return (False, None, "Password required")
-            if not verify_admin_password(password):
+            if not await verify_admin_password(password):
                 return (False, None, "비밀번호가 올바르지 않습니다.")
-            aid = workers.get_first_admin_id()
+            aid = (await admin_cache.get()).admin_id
             if aid is None:
                 return (False, None, "No admin registered")
-            token = str(uuid.uuid4())
-            with _sessions_lock:
-                _sessions[token] = aid
+            token = await run_sync(sessions.create, aid)
             return (True, {"token": token, "admin_id": aid}, "")
         if action == "admin_logout":
             token = body.get("auth_token")
-            if token:
-                with _sessions_lock:
-                    _sessions.pop(token, None)
+            if token and isinstance(token, str):
+                await run_sync(sessions.remove, token)
             return (True, None, "")
         if action == "admin_count":
-            n = workers.count_admins()
-            return (True, {"count": n}, "")
+            return (True, {"count": (await admin_cache.get()).count}, "")
         if action == "register_first_admin":
             password = (body.get("password") or "").strip()
             if not password:
@@ -105,7 +264,7 @@ def _handle_request(action: str, body: dict[str, Any]) -> tuple[bool, Any, str]:
             if len(password) < 4:
                 return (False, None, "비밀번호는 4자 이상으로 설정하세요.")
             try:
-                create_first_admin(password)
+                await create_first_admin(password)
                 return (True, None, "")
             except ValueError as e:
                 return (False, None, str(e))
@@ -114,23 +273,55 @@ def _handle_request(action: str, body: dict[str, Any]) -> tuple[bool, Any, str]:
         if not ok:
             return (False, None, err)
         if action == "get_first_admin_id":
-            aid = workers.get_first_admin_id()
+            aid = (await admin_cache.get()).admin_id
             return (True, {"admin_id": aid} if aid is not None else None, "")
         if action == "list_workers":
-            return (True, workers.list_workers(), "")
+            return (True, await repository.list_workers(), "")
+        if action == "list_workers_since":
+            # 클라이언트 사본의 (epoch, version) 이후 변경만. 디렉터리가 없으면 항상 전체 목록
+            if worker_directory.loaded():
+                try:
+                    version = int(body.get("version") or 0)
+                except (TypeError, ValueError):
+                    version = -1
+                return (True, worker_directory.changes_since(body.get("epoch"), version), "")
+            rows = await repository.list_workers()
+            return (True, {"epoch": "", "version": 0, "full": True, "workers": rows}, "")
         if action == "create_worker":
             aid = body.get("admin_id")
             name = body.get("name", "")
             uid = body.get("card_uid", "")
             if aid is None:
                 return (False, None, "admin_id required")
-            out = workers.create_worker(int(aid), name, uid)
+            out = await repository.create_worker(int(aid), name, uid)
             return (True, out, "")
+        if action == "create_workers":
+            aid = body.get("admin_id")
+            items = body.get("workers")
+            if aid is None:
+                return (False, None, "admin_id required")
+            if not isinstance(items, list):
+                return (False, None, "workers required")
+            rows = [
+                (str(w.get("name") or ""), str(w.get("card_uid") or "")) if isinstance(w, dict) else ("", "")
+                for w in items
+            ]
+            out = await repository.create_workers(int(aid), rows)
+            return (True, out, "")
+        if action == "import_workers":
+            if client is None:
+                return (False, None, "import_workers requires a connection")
+            return await _import_workers(client, body)
+        if action == "export_workers":
+            if client is None:
+                return (False, None, "export_workers requires a connection")
+            n = await run_sync(_export_workers, client, req_id, bool(body.get("header", True)))
+            return (True, {"rows": n}, "")
         if action == "update_worker":
             wid = body.get("worker_id")
             if wid is None:
                 return (False, None, "worker_id required")
-            out = workers.update_worker(
+            out = await repository.update_worker(
                 int(wid),
                 name=body.get("name"),
                 card_uid=body.get("card_uid"),
@@ -140,62 +331,186 @@ def _handle_request(action: str, body: dict[str, Any]) -> tuple[bool, Any, str]:
             wid = body.get("worker_id")
             if wid is None:
                 return (False, None, "worker_id required")
-            workers.delete_worker(int(wid))
+            await repository.delete_worker(int(wid))
             return (True, None, "")
+        if action == "warehouse_stock":
+            return (True, await inventory.warehouse_stock(), "")
+        if action == "classify_box":
+            iid = body.get("inbound_item_id")
+            if iid is None:
+                return (False, None, "inbound_item_id required")
+            warehouse = body.get("warehouse")
+            if warehouse not in inventory.WAREHOUSES:
+                return (False, None, f"warehouse must be one of {', '.join(inventory.WAREHOUSES)}")
+            return (True, await inventory.classify_box(int(iid), warehouse), "")
+        if action == "ship_box":
+            iid = body.get("inbound_item_id")
+            if iid is None:
+                return (False, None, "inbound_item_id required")
+            return (True, await inventory.ship_box(int(iid)), "")
+        if action == "register_inbound":
+            return (True, await inbounds.register(body), "")
         return (False, None, f"Unknown action: {action}")
+    except HashingBusy:
+        return (False, None, "요청이 많습니다. 잠시 후 다시 시도하세요.")
+    except worker_csv.CsvImportError as e:
+        return (False, None, str(e))
     except workers.WorkerNotFound:
         return (False, None, "Worker not found")
     except workers.WorkerCreateConflict as e:
         return (False, None, e.detail)
+    except inbounds.InboundInvalid as e:
+        return (False, None, e.detail)
+    except inventory.BoxNotFound:
+        return (False, None, "Box not found")
+    except inventory.BoxStateConflict as e:
+        return (False, None, str(e))
     except Exception as e:
         return (False, None, str(e))
 
 
-def _handle_client(sock: socket.socket) -> None:
-    """한 클라이언트의 요청 루프."""
+async def _import_workers(client: _Client, body: dict[str, Any]) -> tuple[bool, Any, str]:
+    """CSV chunk 하나 처리. seq 0 이 새 가져오기를 시작하고 final 이면 남은 행을 등록하고 끝냄.
+    같은 import_id 의 chunk 는 파이프라인으로 와도 import_id 별 락으로 순서대로 처리."""
+    import_id = body.get("import_id")
+    if not import_id or not isinstance(import_id, str):
+        return (False, None, "import_id required")
+    data = body.get("csv") or ""
+    if not isinstance(data, str):
+        return (False, None, "csv must be a string")
     try:
-        buf = b""
-        while not _stop.is_set():
-            try:
-                chunk = sock.recv(4096)
-            except (ConnectionResetError, BrokenPipeError, OSError):
-                break
+        seq = int(body.get("seq") or 0)
+    except (TypeError, ValueError):
+        return (False, None, "seq must be an integer")
+    final = bool(body.get("final"))
+    lock = client.import_locks.setdefault(import_id, asyncio.Lock())
+    async with lock:
+        job = client.imports.get(import_id)
+        if seq == 0:
+            aid = body.get("admin_id")
+            if aid is None:
+                return (False, None, "admin_id required")
+            if job is None and len(client.imports) >= MAX_IMPORTS_PER_CLIENT:
+                return (False, None, "동시에 진행할 수 있는 가져오기 수를 넘었습니다.")
+            job = client.imports[import_id] = worker_csv.ImportJob(int(aid))
+        elif job is None:
+            return (False, None, "Unknown import_id")
+        try:
+            conflicts = await run_sync(job.add_chunk, seq, data)
+            if final:
+                conflicts += await run_sync(job.finish)
+        except Exception:
+            client.imports.pop(import_id, None)
+            client.import_locks.pop(import_id, None)
+            raise
+        out = {"import_id": import_id, "seq": seq, "done": final, "conflicts": conflicts, **job.summary()}
+        if final:
+            client.imports.pop(import_id, None)
+            client.import_locks.pop(import_id, None)
+        return (True, out, "")
+
+
+def _export_workers(client: _Client, req_id: Any, header: bool) -> int:
+    """DB 스레드에서 실행. server-side cursor 로 읽은 CSV 조각을 export_chunk 푸시로 보냄 (송신 큐가 차면 대기).
+    조각은 같은 송신 큐로 나가므로 최종 응답보다 먼저 도착. 보낸 행 수 반환."""
+    loop = _loop
+    if loop is None:
+        raise RuntimeError("bridge not running")
+    total = 0
+    for data, n in worker_csv.iter_csv_chunks(header=header):
+        if client.writer.is_closing():
+            raise ConnectionError("client disconnected")
+        msg = {"type": "export_chunk", "id": req_id, "csv": data}
+        asyncio.run_coroutine_threadsafe(client.send(msg), loop).result()
+        total += n
+    return total
+
+
+async def _serve_request(
+    client: _Client,
+    inflight: asyncio.Semaphore,
+    req_id: Any,
+    action: str,
+    body: dict[str, Any],
+) -> None:
+    """요청 하나 처리 후 응답을 송신 큐에 넣음. 호출 전에 inflight 슬롯을 이미 획득한 상태."""
+    try:
+        ok, res_body, err = await _handle_request(action, body, client, req_id)
+        resp = {
+            "type": "response",
+            "id": req_id,
+            "ok": ok,
+            "body": res_body,
+            "error": err if not ok else None,
+        }
+        await client.send(resp)
+    finally:
+        inflight.release()
+
+
+async def _negotiate(client: _Client, hello: Hello) -> bool:
+    """hello 응답(NDJSON)을 보내고, MessagePack 으로 전환하면 True. 응답은 전환 전 프로토콜로 큐에 들어감."""
+    use_msgpack = hello.protocol == PROTOCOL_MSGPACK and ALLOW_MSGPACK
+    protocol = PROTOCOL_MSGPACK if use_msgpack else PROTOCOL_NDJSON
+    await client.send({"type": "hello", "protocol": protocol})
+    client.protocol = protocol
+    logger.info("[TCP] %s: protocol %s", client.addr, protocol)
+    return use_msgpack
+
+
+async def _handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """한 클라이언트의 요청 루프. 요청마다 태스크를 띄워 파이프라이닝 (응답 순서는 완료 순)."""
+    client = _Client(writer)
+    _clients.add(client)
+    msg = f"[TCP] Soy-PC connected from {client.addr} (total {len(_clients)} client(s))"
+    logger.info(msg)
+    print(msg, flush=True)
+    inflight = asyncio.Semaphore(MAX_INFLIGHT)
+    tasks: set[asyncio.Task] = set()
+
+    async def dispatch(req: Request) -> None:
+        await inflight.acquire()
+        task = asyncio.create_task(
+            _serve_request(client, inflight, req.id, req.action, req.body or {})
+        )
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    framer = LineFramer(MAX_LINE)
+    frames: FrameReader | None = None  # hello 로 MessagePack 전환 후 사용
+    try:
+        while True:
+            chunk = await reader.read(65536)
             if not chunk:
                 break
-            buf += chunk
-            while b"\n" in buf:
-                line, buf = buf.split(b"\n", 1)
-                line_str = line.decode("utf-8", errors="ignore").strip()
-                if not line_str:
-                    continue
-                try:
-                    msg = json.loads(line_str)
-                except json.JSONDecodeError:
-                    continue
-                if not isinstance(msg, dict) or msg.get("type") != "request":
-                    continue
-                req_id = msg.get("id")
-                action = msg.get("action", "")
-                body = msg.get("body") or {}
-                ok, res_body, err = _handle_request(action, body)
-                resp = {
-                    "type": "response",
-                    "id": req_id,
-                    "ok": ok,
-                    "body": res_body,
-                    "error": err if not ok else None,
-                }
-                try:
-                    sock.sendall((json.dumps(resp, ensure_ascii=False) + "\n").encode("utf-8"))
-                except (BrokenPipeError, ConnectionResetError, OSError):
-                    break
+            if frames is None:
+                framer.feed(chunk)
+                while (line := framer.next_line()) is not None:
+                    msg = decode_message(line)
+                    if isinstance(msg, Request):
+                        await dispatch(msg)
+                    elif isinstance(msg, Hello):
+                        if await _negotiate(client, msg):
+                            frames = FrameReader(MAX_LINE)
+                            frames.feed(framer.take_pending())
+                            break
+            else:
+                frames.feed(chunk)
+            if frames is not None:
+                while (payload := frames.next_frame()) is not None:
+                    msg = decode_message(payload, binary=True)
+                    if isinstance(msg, Request):
+                        await dispatch(msg)
+    except FramingError as e:
+        logger.warning("[TCP] %s: %s -> disconnect", client.addr, e)
+    except (ConnectionResetError, BrokenPipeError, OSError):
+        pass
     finally:
-        with _clients_lock:
-            _clients.discard(sock)
-        try:
-            sock.close()
-        except Exception:
-            pass
+        _clients.discard(client)
+        if tasks:
+            # 이미 받은 요청은 응답까지 마무리 (상대가 쓰기만 닫은 경우 대비)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await client.aclose()
 
 
 def _serial_loop() -> None:
@@ -233,8 +548,8 @@ def _serial_loop() -> None:
                 continue
             logger.debug("[Serial] raw line: %r", line)
             try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
+                obj = loads(line)
+            except DecodeError:
                 logger.debug("[Serial] invalid JSON: %r", line[:80])
                 continue
             if isinstance(obj, dict) and obj.get("type") == "card_read":
@@ -253,40 +568,21 @@ def _serial_loop() -> None:
         logger.info("[Serial] closed %s", SERIAL_PORT)
 
 
-def _tcp_accept_loop(server: socket.socket) -> None:
-    """TCP accept 루프 (서버 소켓은 메인 스레드에서 이미 bind/listen 완료)."""
-    try:
-        while not _stop.is_set():
-            try:
-                client, addr = server.accept()
-            except socket.timeout:
-                continue
-            except OSError:
-                break
-            with _clients_lock:
-                _clients.add(client)
-            n = len(_clients)
-            msg = f"[TCP] Soy-PC connected from {addr} (total {n} client(s))"
-            logger.info(msg)
-            print(msg, flush=True)
-            t = threading.Thread(target=_handle_client, args=(client,), daemon=True)
-            t.start()
-    finally:
-        pass
-
-
-def start() -> None:
-    """브릿지 시작. TCP 포트는 메인 스레드에서 즉시 bind하여 기동 직후부터 접속 가능하게 함."""
-    global _serial_thread, _tcp_thread, _tcp_server_socket
+async def start() -> None:
+    """브릿지 시작. TCP 서버는 현재(uvicorn) 이벤트 루프에서 bind하여 기동 직후부터 접속 가능하게 함."""
+    global _serial_thread, _tcp_server, _loop
     _stop.clear()
-    # TCP 서버 소켓을 메인 스레드에서 bind/listen (기동 완료 전에 9001 포트 확실히 개방)
+    _loop = asyncio.get_running_loop()
+    await sessions.start()
+    worker_directory.add_listener(_on_workers_changed)
     try:
-        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server.bind(("0.0.0.0", TCP_PORT))
-        server.listen(8)
-        server.settimeout(1.0)
-        _tcp_server_socket = server
+        _tcp_server = await asyncio.start_server(
+            _handle_client,
+            host="0.0.0.0",
+            port=TCP_PORT,
+            backlog=TCP_BACKLOG,
+            reuse_address=True,
+        )
         msg = f"[TCP] listening on port {TCP_PORT} (Soy-PC)"
         logger.info(msg)
         print(msg, flush=True)
@@ -295,8 +591,6 @@ def start() -> None:
         logger.error(msg)
         print(msg, flush=True)
         return
-    _tcp_thread = threading.Thread(target=_tcp_accept_loop, args=(server,), daemon=True)
-    _tcp_thread.start()
     if SERIAL_PORT:
         _serial_thread = threading.Thread(target=_serial_loop, daemon=True)
         _serial_thread.start()
@@ -307,20 +601,25 @@ def start() -> None:
     print(msg, flush=True)
 
 
-def stop() -> None:
+async def stop() -> None:
     """브릿지 정지."""
-    global _tcp_server_socket
+    global _tcp_server, _loop, _worker_push_handle
     _stop.set()
-    if _tcp_server_socket is not None:
+    worker_directory.remove_listener(_on_workers_changed)
+    if _worker_push_handle is not None:
+        _worker_push_handle.cancel()
+        _worker_push_handle = None
+    server = _tcp_server
+    _tcp_server = None
+    if server is not None:
+        server.close()
+    for client in list(_clients):
+        client.abort()
+    _clients.clear()
+    if server is not None:
         try:
-            _tcp_server_socket.close()
-        except Exception:
+            await asyncio.wait_for(server.wait_closed(), timeout=5.0)
+        except (asyncio.TimeoutError, Exception):
             pass
-        _tcp_server_socket = None
-    with _clients_lock:
-        for sock in list(_clients):
-            try:
-                sock.close()
-            except Exception:
-                pass
-        _clients.clear()
+    _loop = None
+    await sessions.stop()
@@ -0,0 +1,120 @@
+"""
+비동기 저장소 계층 — asyncio 코드(pc_bridge, lifespan)에서 쓰는 DB 작업.
+쿼리 자체는 app.workers / app.auth / app.admin_cache 의 *_tx(conn, ...) 함수를 그대로 사용하고,
+여기서는 연결·트랜잭션과 작업자 디렉터리 갱신만 담당.
+
+- 비동기 드라이버가 있으면 (database.get_async_engine()) 공유 AsyncEngine 의 연결에서
+  AsyncConnection.run_sync 로 *_tx 를 실행 — 이벤트 루프를 막지 않고 DB 스레드도 쓰지 않음.
+- 없으면 (드라이버 미설치, SOY_DB_ASYNC=0) 동기 Engine 으로 같은 함수를 database.run_sync 스레드풀에서 실행.
+동기 함수(app.workers 등)는 Alembic·스크립트용으로 그대로 남음.
+"""
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy.engine import Connection
+
+from app import worker_directory as directory
+from app import workers
+from app.database import get_async_engine, get_engine, run_sync
+
+T = TypeVar("T")
+
+
+def _read_sync(fn: Callable[..., T], *args: Any) -> T:
+    with get_engine().connect() as conn:
+        return fn(conn, *args)
+
+
+def _write_sync(fn: Callable[..., T], *args: Any) -> T:
+    with get_engine().begin() as conn:
+        return fn(conn, *args)
+
+
+async def read(fn: Callable[..., T], *args: Any) -> T:
+    """fn(conn, *args) 를 읽기 연결에서 실행."""
+    aeng = get_async_engine()
+    if aeng is None:
+        return await run_sync(_read_sync, fn, *args)
+    async with aeng.connect() as conn:
+        return await conn.run_sync(fn, *args)
+
+
+async def write(fn: Callable[..., T], *args: Any) -> T:
+    """fn(conn, *args) 를 트랜잭션 안에서 실행. 예외 없이 끝나면 커밋, 예외면 롤백."""
+    aeng = get_async_engine()
+    if aeng is None:
+        return await run_sync(_write_sync, fn, *args)
+    async with aeng.begin() as conn:
+        return await conn.run_sync(fn, *args)
+
+
+async def count_admins() -> int:
+    return await read(workers.count_admins_tx)
+
+
+async def get_first_admin_id() -> int | None:
+    return await read(workers.first_admin_id_tx)
+
+
+async def warm_directory() -> int:
+    """workers 테이블 전체를 작업자 디렉터리에 적재. 적재한 수 반환."""
+    rows = await read(workers.select_workers_tx)
+    directory.replace(rows)
+    return len(rows)
+
+
+async def list_workers() -> list[dict]:
+    if directory.loaded():
+        return directory.list_all()
+    return await read(workers.select_workers_tx)
+
+
+async def get_worker_by_card(card_uid: str) -> dict | None:
+    """card_uid 로 작업자 조회. 없으면 None."""
+    card_uid = card_uid.strip()
+    if directory.loaded():
+        return directory.get_by_card(card_uid)
+    return await read(workers.select_worker_by_card_tx, card_uid)
+
+
+async def create_worker(admin_id: int, name: str, card_uid: str) -> dict:
+    """작업자 등록. card_uid 중복이면 WorkerCreateConflict."""
+    worker = await write(workers.insert_worker_tx, admin_id, name.strip(), card_uid.strip())
+    directory.put(worker)
+    return worker
+
+
+async def create_workers(admin_id: int, rows: list[tuple[str, str]]) -> dict:
+    """작업자 일괄 등록 (workers.create_workers — 재시도가 있는 여러 트랜잭션이라 DB 스레드에서 실행)."""
+    return await run_sync(workers.create_workers, admin_id, rows)
+
+
+def _update_tx(
+    conn: Connection, worker_id: int, name: str | None, card_uid: str | None, cached: dict | None
+) -> dict | None:
+    workers.update_worker_tx(conn, worker_id, name, card_uid)
+    if cached is not None:
+        return None  # 디렉터리 항목에 바뀐 필드만 반영 (update_worker)
+    return workers.select_worker_tx(conn, worker_id)
+
+
+async def update_worker(
+    worker_id: int, *, name: str | None = None, card_uid: str | None = None
+) -> dict:
+    """작업자 수정. 없으면 WorkerNotFound, card_uid 중복이면 WorkerCreateConflict."""
+    name = name.strip() if name is not None else None
+    card_uid = card_uid.strip() if card_uid is not None else None
+    cached = directory.get(worker_id)
+    if name is None and card_uid is None and cached is not None:
+        return cached
+    worker = await write(_update_tx, worker_id, name, card_uid, cached)
+    if worker is not None:
+        directory.put(worker)
+        return worker
+    # 수정 전 항목이 아니라 지금 항목에 반영 (동시 수정·삭제를 덮어쓰지 않음). None 이면 그 사이 삭제됨
+    return directory.update(worker_id, name, card_uid) or workers.apply_update(cached, name, card_uid)
+
+
+async def delete_worker(worker_id: int) -> None:
+    """작업자 삭제. 없으면 WorkerNotFound."""
+    await write(workers.delete_worker_tx, worker_id)
+    directory.remove(worker_id)
@@ -0,0 +1,250 @@
+"""
+admin 세션 저장소 (pc_bridge 용). 토큰 → admin_id, 만료 시각.
+
+- 조회 O(1): 토큰의 SHA-256 을 키로 하는 OrderedDict. 원본 토큰은 저장하지 않음.
+- 슬라이딩 만료: 유효한 토큰으로 요청할 때마다 만료 시각을 TTL 만큼 연장.
+- 크기 상한: MAX 개를 넘으면 가장 오래 쓰이지 않은 세션부터 제거 (LRU).
+- 백그라운드 sweeper: SWEEP_INTERVAL 마다 만료 세션 제거 + 영속 저장소에 연장된 만료 시각 반영.
+- 선택적 영속화: SOY_SESSION_DB 에 SQLAlchemy URL(예: sqlite:////data/sessions.db 또는 MySQL URL)을 주면
+  soy_sessions 테이블에 저장하고 서버 재시작 시 다시 읽음 (재로그인·bcrypt 재계산 불필요).
+  생성·삭제는 즉시 기록, 슬라이딩 연장은 sweeper 주기로 모아서 기록.
+환경변수: SOY_SESSION_TTL(초, 기본 28800), SOY_SESSION_MAX(기본 10000),
+          SOY_SESSION_SWEEP_INTERVAL(초, 기본 60), SOY_SESSION_DB(기본 없음 = 메모리만)
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.database import run_sync
+
+logger = logging.getLogger(__name__)
+
+TTL = float(os.environ.get("SOY_SESSION_TTL", "28800"))
+MAX = max(1, int(os.environ.get("SOY_SESSION_MAX", "10000")))
+SWEEP_INTERVAL = float(os.environ.get("SOY_SESSION_SWEEP_INTERVAL", "60"))
+DB_URL = os.environ.get("SOY_SESSION_DB", "").strip()
+
+# 키(토큰 해시) → [admin_id, 만료 시각(time.time())]. 끝쪽이 최근 사용
+_sessions: OrderedDict[str, list] = OrderedDict()
+_lock = threading.Lock()
+_touched: set[str] = set()  # 영속 저장소에 아직 반영하지 않은 연장분
+_evicted = 0
+_expired = 0
+_sweeper: asyncio.Task | None = None
+_engine: Engine | None = None
+
+
+def _key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _get_engine() -> Engine | None:
+    global _engine
+    if not DB_URL:
+        return None
+    if _engine is None:
+        _engine = create_engine(DB_URL, pool_pre_ping=True)
+        with _engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS soy_sessions ("
+                    " token_hash CHAR(64) NOT NULL PRIMARY KEY,"
+                    " admin_id INT NOT NULL,"
+                    " expires_at DOUBLE NOT NULL)"
+                )
+            )
+    return _engine
+
+
+def _persist_delete(keys: list[str]) -> None:
+    eng = _get_engine()
+    if eng is None or not keys:
+        return
+    try:
+        with eng.begin() as conn:
+            conn.execute(
+                text("DELETE FROM soy_sessions WHERE token_hash = :k"),
+                [{"k": k} for k in keys],
+            )
+    except Exception as e:
+        logger.warning("[sessions] persist delete failed: %s", e)
+
+
+def _evict_locked() -> list[str]:
+    """_lock 보유 상태에서 호출. 상한 초과분을 LRU 순으로 제거하고 제거한 키 반환."""
+    global _evicted
+    removed = []
+    while len(_sessions) > MAX:
+        k, _ = _sessions.popitem(last=False)
+        _touched.discard(k)
+        removed.append(k)
+    _evicted += len(removed)
+    return removed
+
+
+def create(admin_id: int) -> str:
+    """새 세션 토큰 발급. 영속 저장소가 있으면 즉시 기록 (블로킹 — asyncio 에서는 run_sync 로 호출)."""
+    token = secrets.token_urlsafe(32)
+    k = _key(token)
+    expires = time.time() + TTL
+    with _lock:
+        _sessions[k] = [admin_id, expires]
+        removed = _evict_locked()
+    eng = _get_engine()
+    if eng is not None:
+        try:
+            with eng.begin() as conn:
+                conn.execute(
+                    text("INSERT INTO soy_sessions (token_hash, admin_id, expires_at) VALUES (:k, :a, :e)"),
+                    {"k": k, "a": admin_id, "e": expires},
+                )
+        except Exception as e:
+            logger.warning("[sessions] persist create failed: %s", e)
+    _persist_delete(removed)
+    return token
+
+
+def get(token: str) -> int | None:
+    """유효한 토큰이면 admin_id (만료 시각 연장), 없거나 만료되었으면 None. 메모리만 사용."""
+    k = _key(token)
+    now = time.time()
+    with _lock:
+        entry = _sessions.get(k)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            return None  # 제거는 sweeper 가 (영속 저장소 삭제 포함)
+        entry[1] = now + TTL
+        _sessions.move_to_end(k)
+        if DB_URL:
+            _touched.add(k)
+        return entry[0]
+
+
+def remove(token: str) -> None:
+    """세션 삭제 (로그아웃). 블로킹 — asyncio 에서는 run_sync 로 호출."""
+    k = _key(token)
+    with _lock:
+        found = _sessions.pop(k, None) is not None
+        _touched.discard(k)
+    if found:
+        _persist_delete([k])
+
+
+def sweep() -> int:
+    """만료 세션 제거 + 연장된 만료 시각을 영속 저장소에 반영. 제거한 수 반환. 블로킹."""
+    global _expired
+    now = time.time()
+    with _lock:
+        dead = [k for k, (_, exp) in _sessions.items() if exp <= now]
+        for k in dead:
+            del _sessions[k]
+            _touched.discard(k)
+        _expired += len(dead)
+        touched = [{"k": k, "e": _sessions[k][1]} for k in _touched]
+        _touched.clear()
+    eng = _get_engine()
+    if eng is not None:
+        try:
+            with eng.begin() as conn:
+                if touched:
+                    conn.execute(
+                        text("UPDATE soy_sessions SET expires_at = :e WHERE token_hash = :k"),
+                        touched,
+                    )
+                conn.execute(text("DELETE FROM soy_sessions WHERE expires_at <= :now"), {"now": now})
+        except Exception as e:
+            logger.warning("[sessions] persist sweep failed: %s", e)
+    return len(dead)
+
+
+def load() -> int:
+    """영속 저장소에서 만료되지 않은 세션을 읽어 옴. 읽은 수 반환. 블로킹."""
+    eng = _get_engine()
+    if eng is None:
+        return 0
+    now = time.time()
+    with eng.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT token_hash, admin_id, expires_at FROM soy_sessions"
+                " WHERE expires_at > :now ORDER BY expires_at"
+            ),
+            {"now": now},
+        ).fetchall()
+    with _lock:
+        for k, aid, exp in rows:
+            _sessions[k] = [int(aid), float(exp)]
+        removed = _evict_locked()
+    _persist_delete(removed)
+    return len(rows)
+
+
+async def _sweep_loop() -> None:
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            n = await run_sync(sweep)
+            if n:
+                logger.info("[sessions] expired %d session(s)", n)
+        except Exception as e:
+            logger.warning("[sessions] sweep failed: %s", e)
+
+
+async def start() -> None:
+    """영속 세션 복원 후 sweeper 시작."""
+    global _sweeper
+    if DB_URL:
+        try:
+            n = await run_sync(load)
+            msg = f"[sessions] restored {n} session(s)"
+            logger.info(msg)
+            print(msg, flush=True)
+        except Exception as e:
+            msg = f"[sessions] restore failed: {e}"
+            logger.error(msg)
+            print(msg, flush=True)
+    if _sweeper is None:
+        _sweeper = asyncio.create_task(_sweep_loop())
+
+
+async def stop() -> None:
+    """sweeper 정지 + 마지막 연장분 기록."""
+    global _sweeper, _engine
+    if _sweeper is not None:
+        _sweeper.cancel()
+        try:
+            await _sweeper
+        except asyncio.CancelledError:
+            pass
+        _sweeper = None
+    if DB_URL:
+        try:
+            await run_sync(sweep)
+        except Exception as e:
+            logger.warning("[sessions] final sweep failed: %s", e)
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+
+def stats() -> dict[str, Any]:
+    """/metrics 용 세션 현황."""
+    with _lock:
+        return {
+            "active": len(_sessions),
+            "max": MAX,
+            "ttl": TTL,
+            "evicted": _evicted,
+            "expired": _expired,
+            "persistent": bool(DB_URL),
+        }
@@ -0,0 +1,152 @@
+"""
+작업자 CSV 일괄 가져오기 / 내보내기 (pc_bridge 의 import_workers / export_workers 액션).
+
+가져오기: 클라이언트가 CSV 를 여러 요청(chunk)으로 나눠 보내면 ImportJob 이 줄 단위로 파싱·검증하고
+IMPORT_BATCH 행씩 workers.create_workers 로 등록. card_uid 중복은 가져오기 전체에서 본 UID 집합(메모리)으로 먼저 거르고,
+이미 등록된 UID 는 create_workers 가 행별 conflict 로 보고. 상태는 연결마다 따로 보관 (연결이 끊기면 버려짐).
+CSV 형식: name,card_uid[,그 밖의 열은 무시] (첫 줄이 헤더면 건너뜀 — export 결과를 그대로 가져올 수 있음). chunk 경계에서 잘린 레코드는 다음 chunk 와 이어 붙임
+(따옴표 밖의 줄바꿈에서만 자름 — 따옴표 안에 줄바꿈이 있는 필드도 한 레코드로 읽음).
+conflict 의 line 은 레코드가 시작하는 파일의 줄 번호 (1부터, 헤더 포함).
+
+내보내기: iter_csv_chunks() 가 server-side cursor(stream_results)로 EXPORT_BATCH 행씩 읽어 CSV 텍스트로 넘김.
+전체 테이블을 메모리에 올리지 않음.
+환경변수: SOY_IMPORT_BATCH(기본 200), SOY_EXPORT_BATCH(기본 500)
+"""
+import csv
+import io
+import os
+from typing import Any, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app import workers
+from app.database import get_engine
+
+IMPORT_BATCH = max(1, int(os.environ.get("SOY_IMPORT_BATCH", "200")))
+EXPORT_BATCH = max(1, int(os.environ.get("SOY_EXPORT_BATCH", "500")))
+
+CSV_HEADER = ["name", "card_uid"]
+_HEADER_ALIASES = (["name", "card_uid"], ["이름", "카드 uid"], ["이름", "카드uid"])
+
+
+class CsvImportError(ValueError):
+    """가져오기 요청 오류 (순서 어긋남 등)."""
+
+
+def _last_record_end(data: str) -> int:
+    """따옴표 밖의 마지막 줄바꿈 위치 (없으면 -1). 이스케이프된 "" 는 두 개로 세므로 짝수/홀수만 보면 됨."""
+    cut = -1
+    quotes = 0
+    pos = 0
+    while True:
+        nl = data.find("\n", pos)
+        if nl < 0:
+            return cut
+        quotes += data.count('"', pos, nl)
+        if quotes % 2 == 0:
+            cut = nl
+        pos = nl + 1
+
+
+class ImportJob:
+    """가져오기 한 건의 진행 상태. 블로킹 — add_chunk / finish 는 DB 스레드에서 (run_sync) 호출."""
+
+    def __init__(self, admin_id: int):
+        self.admin_id = admin_id
+        self.next_seq = 0
+        self.line_no = 0  # 지금까지 읽은 파일 줄 수 (헤더 포함, 따옴표 안 줄바꿈으로 나뉜 줄도 셈)
+        self.created = 0
+        self.conflict_count = 0
+        self._carry = ""  # 아직 끝나지 않은 마지막 레코드 조각
+        self._seen: set[str] = set()
+        self._batch: list[tuple[int, str, str]] = []  # (line_no, name, card_uid)
+        self._header_checked = False
+
+    def add_chunk(self, seq: int, data: str) -> list[dict]:
+        """chunk 하나 처리. 이번에 새로 생긴 conflict 목록 반환 ({"line", "card_uid", "error"})."""
+        if seq != self.next_seq:
+            raise CsvImportError(f"chunk 순서가 맞지 않습니다 (expected {self.next_seq}, got {seq})")
+        self.next_seq += 1
+        data = self._carry + data
+        cut = _last_record_end(data)
+        if cut < 0:
+            self._carry = data
+            return []
+        self._carry = data[cut + 1 :]
+        return self._feed(data[: cut + 1])
+
+    def finish(self) -> list[dict]:
+        """남은 조각과 배치를 모두 등록. 새로 생긴 conflict 목록 반환."""
+        conflicts = []
+        if self._carry.strip():
+            conflicts = self._feed(self._carry)
+        self._carry = ""
+        flushed = self._flush()
+        self.conflict_count += len(flushed)
+        return conflicts + flushed
+
+    def summary(self) -> dict[str, Any]:
+        return {"lines": self.line_no, "created": self.created, "conflict_count": self.conflict_count}
+
+    def _feed(self, block: str) -> list[dict]:
+        conflicts: list[dict] = []
+        reader = csv.reader(io.StringIO(block))
+        base = self.line_no
+        for row in reader:
+            # 레코드 시작 줄 = 이전 레코드까지 읽은 줄 수 + 1 (reader.line_num 은 이 레코드까지 읽은 줄 수)
+            start, self.line_no = self.line_no + 1, base + reader.line_num
+            if not row or not any(c.strip() for c in row):
+                continue
+            if not self._header_checked:
+                self._header_checked = True
+                if [c.strip().lower() for c in row[:2]] in _HEADER_ALIASES:
+                    continue
+            name = row[0].strip()
+            uid = row[1].strip() if len(row) > 1 else ""
+            if not name or not uid:
+                conflicts.append({"line": start, "card_uid": uid, "error": "이름과 카드 UID를 입력하세요."})
+                continue
+            if uid in self._seen:
+                conflicts.append({"line": start, "card_uid": uid, "error": "같은 카드 UID가 파일 안에 중복되었습니다."})
+                continue
+            self._seen.add(uid)
+            self._batch.append((start, name, uid))
+            if len(self._batch) >= IMPORT_BATCH:
+                conflicts.extend(self._flush())
+        self.conflict_count += len(conflicts)
+        return conflicts
+
+    def _flush(self) -> list[dict]:
+        if not self._batch:
+            return []
+        batch, self._batch = self._batch, []
+        out = workers.create_workers(self.admin_id, [(name, uid) for _, name, uid in batch])
+        self.created += len(out["created"])
+        conflicts = [
+            {"line": batch[c["index"]][0], "card_uid": c["card_uid"], "error": c["error"]}
+            for c in out["conflicts"]
+        ]
+        return conflicts
+
+
+def iter_csv_chunks(engine: Engine | None = None, header: bool = True) -> Iterator[tuple[str, int]]:
+    """작업자 전체를 worker_id 순 CSV 텍스트 조각으로. (csv 텍스트, 이 조각의 행 수). 블로킹 (DB 스레드에서 사용)."""
+    eng = engine or get_engine()
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    if header:
+        writer.writerow(CSV_HEADER + ["worker_id", "created_at"])
+    with eng.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=EXPORT_BATCH).execute(
+            text("SELECT worker_id, admin_id, name, card_uid, created_at FROM workers ORDER BY worker_id")
+        )
+        for rows in result.partitions():
+            for row in rows:
+                w = workers._row_to_worker(row)
+                writer.writerow([w["name"], w["card_uid"], w["worker_id"], w["created_at"]])
+            yield (buf.getvalue(), len(rows))
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield (buf.getvalue(), 0)
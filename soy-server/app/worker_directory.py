@@ -0,0 +1,181 @@
+"""
+작업자 디렉터리 — workers 테이블의 프로세스 내 사본. worker_id / card_uid 로 O(1) 조회.
+서버 기동 시 repository.warm_directory() 로 채우고, 이후 workers / repository 의 create·update·delete 가
+커밋 직후 put() / update() / remove() 로 갱신 (write-through). workers 테이블은 SoyServer 만 쓴다는 전제.
+warm 전(또는 warm 실패 시)에는 loaded() 가 False 이고 호출 측은 DB 로 조회해야 함.
+여기서는 DB 에 접근하지 않음 (순수 자료구조).
+
+변경 버전: put/update/remove 마다 version 을 1 올리고 (version, worker_id) 를 변경 로그에 남김 (최근 CHANGELOG_SIZE 개).
+changes_since(epoch, version) 은 그 이후 바뀐 작업자(upserts)와 삭제된 id(deleted)만 반환.
+epoch 는 디렉터리를 새로 채울 때(서버 재시작 포함)마다 바뀌며, epoch 가 다르거나 로그가 이미 잘려 나간
+버전이면 전체 목록(full)을 반환.
+add_listener(cb) 로 등록한 콜백은 변경 직후 (변경한 스레드에서, 락 밖에서) 인자 없이 호출됨.
+환경변수: SOY_WORKER_CHANGELOG_SIZE (기본 4096)
+"""
+import os
+import secrets
+import threading
+from collections import deque
+from typing import Any, Callable
+
+CHANGELOG_SIZE = max(1, int(os.environ.get("SOY_WORKER_CHANGELOG_SIZE", "4096")))
+
+# worker_id → worker dict (workers._row_to_worker 형식), card_uid → worker_id
+_by_id: dict[int, dict] = {}
+_by_uid: dict[str, int] = {}
+_lock = threading.Lock()
+_loaded = False
+_snapshot: list[dict] | None = None  # worker_id 순 목록. 변경 시 무효화
+_epoch = secrets.token_hex(8)
+_version = 0
+_log: deque[tuple[int, int]] = deque()  # (version, worker_id), version 오름차순
+_floor = 0  # 이 버전 이상이면 변경 로그만으로 답할 수 있음
+_listeners: list[Callable[[], None]] = []
+
+
+def add_listener(cb: Callable[[], None]) -> None:
+    if cb not in _listeners:
+        _listeners.append(cb)
+
+
+def remove_listener(cb: Callable[[], None]) -> None:
+    if cb in _listeners:
+        _listeners.remove(cb)
+
+
+def _notify() -> None:
+    for cb in list(_listeners):
+        try:
+            cb()
+        except Exception:
+            pass
+
+
+def loaded() -> bool:
+    return _loaded
+
+
+def replace(rows: list[dict]) -> None:
+    """전체 교체 (warm). epoch 가 바뀌어 클라이언트는 다음 동기화 때 전체 목록을 받음."""
+    global _by_id, _by_uid, _loaded, _snapshot, _epoch, _version, _floor
+    by_id = {w["worker_id"]: w for w in rows}
+    by_uid = {w["card_uid"]: w["worker_id"] for w in rows}
+    with _lock:
+        _by_id, _by_uid = by_id, by_uid
+        _snapshot = None
+        _loaded = True
+        _epoch = secrets.token_hex(8)
+        _version = _floor = 0
+        _log.clear()
+    _notify()
+
+
+def _record_locked(worker_id: int) -> None:
+    global _version, _floor
+    _version += 1
+    _log.append((_version, worker_id))
+    if len(_log) > CHANGELOG_SIZE:
+        _floor = _log.popleft()[0]
+
+
+def _put_locked(worker: dict) -> None:
+    global _snapshot
+    wid = worker["worker_id"]
+    old = _by_id.get(wid)
+    if old is not None and _by_uid.get(old["card_uid"]) == wid:
+        del _by_uid[old["card_uid"]]
+    _by_id[wid] = worker
+    _by_uid[worker["card_uid"]] = wid
+    _snapshot = None
+    _record_locked(wid)
+
+
+def put(worker: dict) -> None:
+    """생성·수정된 작업자 반영. card_uid 가 바뀌었으면 이전 인덱스 제거."""
+    with _lock:
+        _put_locked(worker)
+    _notify()
+
+
+def update(worker_id: int, name: str | None = None, card_uid: str | None = None) -> dict | None:
+    """커밋된 부분 수정(바뀐 필드만)을 지금 항목에 반영한 새 dict. 항목이 없으면 (그 사이 삭제됨) 반영하지 않고 None.
+    수정 전에 읽어 둔 항목으로 put 하면 동시에 커밋된 다른 필드 수정·삭제를 덮어쓰므로 수정은 이 함수로."""
+    with _lock:
+        cur = _by_id.get(worker_id)
+        if cur is None:
+            return None
+        worker = dict(cur)
+        if name is not None:
+            worker["name"] = name
+        if card_uid is not None:
+            worker["card_uid"] = card_uid
+        _put_locked(worker)
+    _notify()
+    return worker
+
+
+def remove(worker_id: int) -> dict | None:
+    """삭제된 작업자 제거. 있던 항목 반환."""
+    global _snapshot
+    with _lock:
+        old = _by_id.pop(worker_id, None)
+        if old is not None:
+            if _by_uid.get(old["card_uid"]) == worker_id:
+                del _by_uid[old["card_uid"]]
+            _snapshot = None
+            _record_locked(worker_id)
+    if old is not None:
+        _notify()
+    return old
+
+
+def get(worker_id: int) -> dict | None:
+    with _lock:
+        return _by_id.get(worker_id)
+
+
+def get_by_card(card_uid: str) -> dict | None:
+    """card_uid 에 해당하는 작업자. 없으면 None."""
+    with _lock:
+        wid = _by_uid.get(card_uid)
+        return _by_id.get(wid) if wid is not None else None
+
+
+def list_all() -> list[dict]:
+    """worker_id 순 전체 목록 (새 list, 항목 dict 는 공유하므로 수정하지 말 것). 변경이 없으면 정렬 결과 재사용."""
+    global _snapshot
+    with _lock:
+        if _snapshot is None:
+            _snapshot = [_by_id[k] for k in sorted(_by_id)]
+        return list(_snapshot)
+
+
+def current_version() -> tuple[str, int]:
+    """(epoch, version)."""
+    with _lock:
+        return (_epoch, _version)
+
+
+def changes_since(epoch: str | None, version: int) -> dict[str, Any]:
+    """클라이언트 사본(epoch, version) 이후의 변경.
+    {"epoch", "version", "full": False, "upserts": [...], "deleted": [worker_id, ...]} 또는
+    사본을 맞출 수 없으면 {"epoch", "version", "full": True, "workers": [전체 목록]}."""
+    global _snapshot
+    with _lock:
+        if epoch != _epoch or version < _floor or version > _version:
+            if _snapshot is None:
+                _snapshot = [_by_id[k] for k in sorted(_by_id)]
+            return {"epoch": _epoch, "version": _version, "full": True, "workers": list(_snapshot)}
+        changed: set[int] = set()
+        for v, wid in reversed(_log):
+            if v <= version:
+                break
+            changed.add(wid)
+        upserts = [_by_id[w] for w in sorted(changed) if w in _by_id]
+        deleted = sorted(w for w in changed if w not in _by_id)
+        return {"epoch": _epoch, "version": _version, "full": False, "upserts": upserts, "deleted": deleted}
+
+
+def size() -> int:
+    with _lock:
+        return len(_by_id)
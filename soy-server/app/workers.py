@@ -1,10 +1,17 @@
 """
 Worker CRUD — DB 로직만. HTTP/TCP 핸들러에서 공통 사용.
+변경은 커밋 후 app.worker_directory 에 반영 (write-through). 조회는 디렉터리가 채워져 있으면 DB 대신 사용.
+
+*_tx(conn, ...) 함수는 이미 열린 Connection 위에서 쿼리만 수행 (트랜잭션·디렉터리 갱신은 호출 측).
+이 모듈의 동기 함수(Alembic·스크립트·run_sync 용)와 app.repository 의 비동기 함수가 같은 *_tx 를 사용.
 """
+from typing import Any
+
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 
+from app import worker_directory as directory
 from app.database import get_engine
 
 
@@ -28,31 +35,110 @@ def _row_to_worker(row) -> dict:
     }
 
 
+_WORKER_COLUMNS = "worker_id, admin_id, name, card_uid, created_at"
+
+
+def count_admins_tx(conn: Connection) -> int:
+    return int(conn.execute(text("SELECT COUNT(*) FROM admin")).scalar() or 0)
+
+
+def first_admin_id_tx(conn: Connection) -> int | None:
+    row = conn.execute(text("SELECT admin_id FROM admin ORDER BY admin_id LIMIT 1")).fetchone()
+    return int(row[0]) if row else None
+
+
+def select_workers_tx(conn: Connection) -> list[dict]:
+    rows = conn.execute(
+        text(f"SELECT {_WORKER_COLUMNS} FROM workers ORDER BY worker_id")
+    ).fetchall()
+    return [_row_to_worker(r) for r in rows]
+
+
+def select_worker_tx(conn: Connection, worker_id: int) -> dict:
+    """worker_id 로 조회. 없으면 WorkerNotFound."""
+    row = conn.execute(
+        text(f"SELECT {_WORKER_COLUMNS} FROM workers WHERE worker_id = :wid"),
+        {"wid": worker_id},
+    ).fetchone()
+    if not row:
+        raise WorkerNotFound()
+    return _row_to_worker(row)
+
+
+def select_worker_by_card_tx(conn: Connection, card_uid: str) -> dict | None:
+    row = conn.execute(
+        text(f"SELECT {_WORKER_COLUMNS} FROM workers WHERE card_uid = :uid"),
+        {"uid": card_uid},
+    ).fetchone()
+    return _row_to_worker(row) if row else None
+
+
 def count_admins(engine: Engine | None = None) -> int:
     """admin 테이블 레코드 수. 연결 실패 시 예외."""
     eng = engine or get_engine()
     with eng.connect() as conn:
-        return int(conn.execute(text("SELECT COUNT(*) FROM admin")).scalar() or 0)
+        return count_admins_tx(conn)
 
 
 def get_first_admin_id(engine: Engine | None = None) -> int | None:
     eng = engine or get_engine()
     with eng.connect() as conn:
-        row = conn.execute(
-            text("SELECT admin_id FROM admin ORDER BY admin_id LIMIT 1")
-        ).fetchone()
-        return int(row[0]) if row else None
+        return first_admin_id_tx(conn)
+
+
+def warm_directory(engine: Engine | None = None) -> int:
+    """workers 테이블 전체를 작업자 디렉터리에 적재. 적재한 수 반환."""
+    eng = engine or get_engine()
+    with eng.connect() as conn:
+        rows = select_workers_tx(conn)
+    directory.replace(rows)
+    return len(rows)
 
 
 def list_workers(engine: Engine | None = None) -> list[dict]:
+    if engine is None and directory.loaded():
+        return directory.list_all()
     eng = engine or get_engine()
     with eng.connect() as conn:
-        rows = conn.execute(
-            text(
-                "SELECT worker_id, admin_id, name, card_uid, created_at FROM workers ORDER BY worker_id"
-            )
-        ).fetchall()
-        return [_row_to_worker(r) for r in rows]
+        return select_workers_tx(conn)
+
+
+def get_worker_by_card(card_uid: str, engine: Engine | None = None) -> dict | None:
+    """card_uid 로 작업자 조회. 없으면 None."""
+    card_uid = card_uid.strip()
+    if engine is None and directory.loaded():
+        return directory.get_by_card(card_uid)
+    eng = engine or get_engine()
+    with eng.connect() as conn:
+        return select_worker_by_card_tx(conn, card_uid)
+
+
+# 다중 행 INSERT / IN (...) 한 문장에 넣는 최대 행 수
+_INSERT_CHUNK = 500
+
+
+def _is_card_uid_conflict(e: IntegrityError) -> bool:
+    orig = getattr(e, "orig", e)
+    return "Duplicate" in str(orig) or "card_uid" in str(orig)
+
+
+def insert_worker_tx(conn: Connection, admin_id: int, name: str, card_uid: str) -> dict:
+    """INSERT + PK 조회 한 번, 왕복 두 번 (worker_id 는 lastrowid, 나머지는 넣은 값으로 결과 구성).
+    created_at 은 DB 기본값(CURRENT_TIMESTAMP)이라 값을 알려면 읽어야 함 — MySQL 에는 INSERT ... RETURNING 이 없음.
+    card_uid 중복이면 WorkerCreateConflict."""
+    try:
+        r = conn.execute(
+            text("INSERT INTO workers (admin_id, name, card_uid) VALUES (:aid, :name, :uid)"),
+            {"aid": admin_id, "name": name, "uid": card_uid},
+        )
+    except IntegrityError as e:
+        if _is_card_uid_conflict(e):
+            raise WorkerCreateConflict("이 카드 UID는 이미 등록된 작업자가 있습니다.") from e
+        raise
+    created_at = conn.execute(
+        text("SELECT created_at FROM workers WHERE worker_id = :wid"), {"wid": r.lastrowid}
+    ).scalar()
+    return _row_to_worker((r.lastrowid, admin_id, name, card_uid, created_at))
 
 
 def create_worker(
@@ -61,90 +147,183 @@ def create_worker(
     card_uid: str,
     engine: Engine | None = None,
 ) -> dict:
+    """작업자 등록 (insert_worker_tx — 왕복 두 번)."""
     eng = engine or get_engine()
-    name = name.strip()
-    card_uid = card_uid.strip()
     with eng.begin() as conn:
-        try:
-            conn.execute(
-                text(
-                    "INSERT INTO workers (admin_id, name, card_uid) VALUES (:aid, :name, :uid)"
-                ),
-                {"aid": admin_id, "name": name, "uid": card_uid},
-            )
-        except IntegrityError as e:
-            orig = getattr(e, "orig", e)
-            if "Duplicate" in str(orig) or "card_uid" in str(orig):
-                raise WorkerCreateConflict("이 카드 UID는 이미 등록된 작업자가 있습니다.") from e
-            raise
-        row = conn.execute(
-            text(
-                "SELECT worker_id, admin_id, name, card_uid, created_at FROM workers WHERE card_uid = :uid ORDER BY worker_id DESC LIMIT 1"
-            ),
-            {"uid": card_uid},
-        ).fetchone()
-    if not row:
-        raise RuntimeError("Insert succeeded but fetch failed")
-    return _row_to_worker(row)
+        worker = insert_worker_tx(conn, admin_id, name.strip(), card_uid.strip())
+    directory.put(worker)
+    return worker
 
 
-def update_worker(
-    worker_id: int,
-    *,
-    name: str | None = None,
-    card_uid: str | None = None,
+def create_workers(
+    admin_id: int,
+    rows: list[tuple[str, str]],
     engine: Engine | None = None,
 ) -> dict:
+    """작업자 여러 명을 한 트랜잭션, 다중 행 INSERT 로 등록. rows = [(name, card_uid), ...].
+    빈 값·요청 안 중복·이미 등록된 card_uid 는 건너뛰고 행별로 보고.
+    반환: {"created": [작업자...], "conflicts": [{"index", "card_uid", "error"}...]} (index 는 rows 기준)."""
     eng = engine or get_engine()
+    conflicts: list[dict] = []
+    pending: dict[str, tuple[int, str]] = {}  # card_uid -> (index, name), 입력 순서 유지
+    for i, (name, uid) in enumerate(rows):
+        name = (name or "").strip()
+        uid = (uid or "").strip()
+        if not name or not uid:
+            conflicts.append({"index": i, "card_uid": uid, "error": "이름과 카드 UID를 입력하세요."})
+        elif uid in pending:
+            conflicts.append({"index": i, "card_uid": uid, "error": "같은 카드 UID가 요청 안에 중복되었습니다."})
+        else:
+            pending[uid] = (i, name)
+    items: list[tuple[str, tuple[int, str]]] = []
+    inserted: dict[str, tuple[int, Any]] = {}
+    for attempt in range(2):
+        # 확인과 INSERT 사이에 다른 요청이 같은 UID 를 등록했으면 DB 기준으로 다시 걸러서 한 번 재시도
+        try:
+            with eng.begin() as conn:
+                existing = _existing_card_uids(
+                    conn, list(pending), use_directory=engine is None and attempt == 0
+                )
+                for uid in existing:
+                    i, _name = pending.pop(uid)
+                    conflicts.append({"index": i, "card_uid": uid, "error": "이 카드 UID는 이미 등록된 작업자가 있습니다."})
+                items = list(pending.items())
+                if not items:
+                    break
+                for start in range(0, len(items), _INSERT_CHUNK):
+                    chunk = items[start : start + _INSERT_CHUNK]
+                    values = ", ".join(f"(:aid, :n{j}, :u{j})" for j in range(len(chunk)))
+                    params: dict = {"aid": admin_id}
+                    for j, (uid, (_i, name)) in enumerate(chunk):
+                        params[f"n{j}"] = name
+                        params[f"u{j}"] = uid
+                    conn.execute(
+                        text(f"INSERT INTO workers (admin_id, name, card_uid) VALUES {values}"),
+                        params,
+                    )
+                # 다중 행 INSERT 의 lastrowid 는 DB 마다 의미가 달라 (MySQL 첫 행, SQLite 마지막 행) 고유 키로
+                # id 와 created_at(DB 기본값) 만 한 번에 조회
+                inserted = _inserted_by_card(conn, [uid for uid, _ in items])
+            break
+        except IntegrityError as e:
+            if attempt or not _is_card_uid_conflict(e):
+                raise
+    created = [
+        _row_to_worker((inserted[uid][0], admin_id, name, uid, inserted[uid][1])) for uid, (_i, name) in items
+    ]
+    for worker in created:
+        directory.put(worker)
+    conflicts.sort(key=lambda c: c["index"])
+    return {"created": created, "conflicts": conflicts}
+
+
+def _existing_card_uids(conn, uids: list[str], use_directory: bool) -> set[str]:
+    if not uids:
+        return set()
+    if use_directory and directory.loaded():
+        return {u for u in uids if directory.get_by_card(u) is not None}
+    found: set[str] = set()
+    for start in range(0, len(uids), _INSERT_CHUNK):
+        chunk = uids[start : start + _INSERT_CHUNK]
+        marks = ", ".join(f":u{j}" for j in range(len(chunk)))
+        rows = conn.execute(
+            text(f"SELECT card_uid FROM workers WHERE card_uid IN ({marks})"),
+            {f"u{j}": u for j, u in enumerate(chunk)},
+        ).fetchall()
+        found.update(r[0] for r in rows)
+    return found
+
+
+def _inserted_by_card(conn, uids: list[str]) -> dict[str, tuple[int, Any]]:
+    """card_uid → (worker_id, created_at)."""
+    out: dict[str, tuple[int, Any]] = {}
+    for start in range(0, len(uids), _INSERT_CHUNK):
+        chunk = uids[start : start + _INSERT_CHUNK]
+        marks = ", ".join(f":u{j}" for j in range(len(chunk)))
+        rows = conn.execute(
+            text(f"SELECT card_uid, worker_id, created_at FROM workers WHERE card_uid IN ({marks})"),
+            {f"u{j}": u for j, u in enumerate(chunk)},
+        ).fetchall()
+        out.update((r[0], (int(r[1]), r[2])) for r in rows)
+    return out
+
+
+def update_worker_tx(
+    conn: Connection, worker_id: int, name: str | None, card_uid: str | None
+) -> None:
+    """UPDATE 한 번. 없으면 WorkerNotFound, card_uid 중복이면 WorkerCreateConflict. 바꿀 값이 없으면 아무것도 안 함."""
     updates = []
     params: dict = {"wid": worker_id}
     if name is not None:
         updates.append("name = :name")
-        params["name"] = name.strip()
+        params["name"] = name
     if card_uid is not None:
         updates.append("card_uid = :uid")
-        params["uid"] = card_uid.strip()
+        params["uid"] = card_uid
     if not updates:
-        with eng.connect() as conn:
-            row = conn.execute(
-                text(
-                    "SELECT worker_id, admin_id, name, card_uid, created_at FROM workers WHERE worker_id = :wid"
-                ),
-                {"wid": worker_id},
-            ).fetchone()
-            if not row:
-                raise WorkerNotFound()
-            return _row_to_worker(row)
+        return
+    try:
+        r = conn.execute(
+            text(f"UPDATE workers SET {', '.join(updates)} WHERE worker_id = :wid"),
+            params,
+        )
+    except IntegrityError as e:
+        if _is_card_uid_conflict(e):
+            raise WorkerCreateConflict(
+                "이 카드 UID는 이미 다른 작업자가 사용 중입니다."
+            ) from e
+        raise
+    if r.rowcount == 0:
+        raise WorkerNotFound()
+
+
+def apply_update(worker: dict, name: str | None, card_uid: str | None) -> dict:
+    """수정 전 작업자 dict 에 바뀐 필드를 반영한 새 dict (디렉터리에는 넣지 않는 응답용)."""
+    worker = dict(worker)
+    if name is not None:
+        worker["name"] = name
+    if card_uid is not None:
+        worker["card_uid"] = card_uid
+    return worker
+
+
+def update_worker(
+    worker_id: int,
+    *,
+    name: str | None = None,
+    card_uid: str | None = None,
+    engine: Engine | None = None,
+) -> dict:
+    """작업자 수정. UPDATE 한 번 — 바꾸지 않은 필드는 작업자 디렉터리의 지금 항목에서 채움 (디렉터리에 없을 때만 SELECT).
+    디렉터리에는 바뀐 필드만 반영 (directory.update) — 동시에 커밋된 다른 수정·삭제를 덮어쓰지 않음."""
+    eng = engine or get_engine()
+    name = name.strip() if name is not None else None
+    card_uid = card_uid.strip() if card_uid is not None else None
+    cached = directory.get(worker_id) if engine is None else None
+    if name is None and card_uid is None and cached is not None:
+        return cached
     with eng.begin() as conn:
-        try:
-            conn.execute(
-                text(f"UPDATE workers SET {', '.join(updates)} WHERE worker_id = :wid"),
-                params,
-            )
-        except IntegrityError as e:
-            orig = getattr(e, "orig", e)
-            if "Duplicate" in str(orig) or "card_uid" in str(orig):
-                raise WorkerCreateConflict(
-                    "이 카드 UID는 이미 다른 작업자가 사용 중입니다."
-                ) from e
-            raise
-        row = conn.execute(
-            text(
-                "SELECT worker_id, admin_id, name, card_uid, created_at FROM workers WHERE worker_id = :wid"
-            ),
-            {"wid": worker_id},
-        ).fetchone()
-    if not row:
+        update_worker_tx(conn, worker_id, name, card_uid)
+        if cached is None:
+            worker = select_worker_tx(conn, worker_id)
+    if cached is None:
+        directory.put(worker)
+        return worker
+    # None 이면 커밋 뒤 디렉터리 반영 전에 삭제됨 — 되살리지 않고 이 수정의 결과만 돌려줌
+    return directory.update(worker_id, name, card_uid) or apply_update(cached, name, card_uid)
+
+
+def delete_worker_tx(conn: Connection, worker_id: int) -> None:
+    r = conn.execute(
+        text("DELETE FROM workers WHERE worker_id = :wid"),
+        {"wid": worker_id},
+    )
+    if r.rowcount == 0:
         raise WorkerNotFound()
-    return _row_to_worker(row)
 
 
 def delete_worker(worker_id: int, engine: Engine | None = None) -> None:
     eng = engine or get_engine()
     with eng.begin() as conn:
-        r = conn.execute(
-            text("DELETE FROM workers WHERE worker_id = :wid"),
-            {"wid": worker_id},
-        )
-        if r.rowcount == 0:
-            raise WorkerNotFound()
+        delete_worker_tx(conn, worker_id)
+    directory.remove(worker_id)
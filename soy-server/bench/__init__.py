@@ -0,0 +1,3 @@
+"""
+SoyServer 마이크로벤치마크. soy-server 디렉터리에서 `uv run python -m bench.<이름>` 으로 실행.
+"""
@@ -0,0 +1,202 @@
+"""
+분류 판정 스풀 복구 검증 (app.classifier write-behind): 기록 전에 프로세스가 죽어도 판정이 빠지거나 두 번 세지지 않는지 확인.
+SOY_DATABASE_URL 또는 MYSQL_* 의 DB 사용 (alembic upgrade head 이후, 마이그레이션 003 products·008 write_checkpoints 필요).
+
+실행 (soy-server 디렉터리에서, 같은 DB 를 쓰는 서버는 끈 상태로 — 서버의 classifier 도 write_checkpoints 를 씀):
+    uv run python -m bench.classify_replay
+    uv run python -m bench.classify_replay --decisions 5000 --seed 3
+    uv run python -m bench.classify_replay --keep          # 시드한 입고 건을 지우지 않음
+
+라운드마다 새 입고 건(물품마다 --decisions 개 상자)을 만들고 임시 스풀로 자식 프로세스를 띄움.
+1. crash: 판정 앞 절반을 넣고 모두 DB 에 반영될 때까지 기다린 뒤, 뒤 절반을 넣자마자 (writer 가 돌기 전에) SIGKILL.
+2. replay: 같은 스풀로 다시 기동 → 뒤 절반만 기록되고 앞 절반은 checkpoint 로 건너뛰어야 함.
+3. replay: 한 번 더 기동 → 아무것도 기록되지 않아야 함.
+라운드는 두 가지: 스풀 압축 없음(이미 반영된 판정이 스풀에 남아 checkpoint 로 걸러짐),
+압축 매 묶음(SOY_CLASSIFY_SPOOL_COMPACT=1 — 남은 판정만으로 스풀을 바꿔 쓴 뒤 죽음).
+확인: 입고 건의 분류완료 상자 수와 (물품, 창고)별 수, warehouse_stock 증가분이 판정 수와 정확히 같은지.
+하나라도 다르면 종료 코드 1.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from sqlalchemy import text
+
+from app import classifier, inventory
+from app.database import get_engine
+from bench.kit_simulator import PRODUCTS
+
+_ROUNDS = (("no-compact", str(1 << 40)), ("compact", "1"))
+
+
+def _decisions(seed: int, n: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    return [PRODUCTS[rng.randrange(len(PRODUCTS))] for _ in range(n)]
+
+
+def _classify_all(inbound_id: int, decisions: list[tuple[str, str]]) -> None:
+    for name, brand in decisions:
+        classifier.classify({"product_name": name, "brand": brand, "inbound_id": inbound_id})
+
+
+async def _child_crash(args: argparse.Namespace) -> None:
+    decisions = _decisions(args.seed, args.decisions)
+    half = len(decisions) // 2
+    await classifier.start()
+    _classify_all(args.inbound_id, decisions[:half])
+    while classifier.backlog():
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.2)  # 마지막 묶음 뒤 스풀 압축까지 끝나도록
+    # 뒤 절반은 스풀에만 쓰고 (classify 는 대기 없음) writer 에 차례가 가기 전에 죽음
+    _classify_all(args.inbound_id, decisions[half:])
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+async def _child_replay(args: argparse.Namespace) -> None:
+    await classifier.start()
+    deadline = time.monotonic() + 60
+    while classifier.backlog() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    s = classifier.stats()
+    await classifier.stop()
+    print(json.dumps({k: s[k] for k in ("backlog", "written", "skipped", "unmatched", "write_errors")}))
+
+
+def _run_child(phase: str, inbound_id: int, args: argparse.Namespace, spool: str, compact: str):
+    env = dict(
+        os.environ,
+        SOY_CLASSIFY_SPOOL=spool,
+        SOY_CLASSIFY_SPOOL_COMPACT=compact,
+        SOY_CLASSIFY_WRITE_BATCH=str(args.batch),
+        SOY_PRODUCTS_REFRESH="0",
+    )
+    cmd = [
+        sys.executable, "-m", "bench.classify_replay", "--phase", phase,
+        "--inbound-id", str(inbound_id), "--decisions", str(args.decisions), "--seed", str(args.seed),
+    ]
+    return subprocess.run(cmd, env=env, capture_output=True, text=True)
+
+
+def _seed(engine, per_product: int) -> int:
+    with engine.begin() as conn:
+        inbound_id = int(conn.execute(text("SELECT COALESCE(MAX(inbound_id), 0) FROM inbounds")).scalar()) + 1
+        conn.execute(text("INSERT INTO inbounds (inbound_id) VALUES (:iid)"), {"iid": inbound_id})
+        pids = [r[0] for r in conn.execute(text("SELECT product_id FROM products"))]
+        conn.execute(
+            text("INSERT INTO inbound_items (inbound_id, product_id) VALUES (:iid, :pid)"),
+            [{"iid": inbound_id, "pid": pid} for pid in pids for _ in range(per_product)],
+        )
+    return inbound_id
+
+
+def _stock(engine) -> Counter:
+    with engine.connect() as conn:
+        return Counter({(r[0], r[1]): int(r[2]) for r in conn.execute(
+            text("SELECT product_id, warehouse, box_count FROM warehouse_stock")
+        )})
+
+
+def _classified(engine, inbound_id: int) -> Counter:
+    with engine.connect() as conn:
+        return Counter({(r[0], r[1]): int(r[2]) for r in conn.execute(
+            text(
+                "SELECT product_id, warehouse, COUNT(*) FROM inbound_items"
+                " WHERE inbound_id = :iid AND status = '분류완료' GROUP BY product_id, warehouse"
+            ),
+            {"iid": inbound_id},
+        )})
+
+
+def _cleanup(engine, inbound_id: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM inbound_items WHERE inbound_id = :iid"), {"iid": inbound_id})
+        conn.execute(text("DELETE FROM inbounds WHERE inbound_id = :iid"), {"iid": inbound_id})
+        inventory.reconcile_tx(conn)
+
+
+def _round(engine, name: str, compact: str, args: argparse.Namespace, expected: Counter) -> list[str]:
+    failures: list[str] = []
+    half = args.decisions // 2
+    inbound_id = _seed(engine, args.decisions)
+    before = _stock(engine)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = os.path.join(tmp, "classify.spool")
+            crash = _run_child("crash", inbound_id, args, spool, compact)
+            if crash.returncode != -signal.SIGKILL:
+                failures.append(f"crash: exit {crash.returncode} (SIGKILL 아님)\n{crash.stderr}")
+                return failures
+            done = _classified(engine, inbound_id)
+            print(f"[{name}] crashed with {sum(done.values()):,} / {args.decisions:,} decisions written,"
+                  f" spool {os.path.getsize(spool):,} bytes")
+            if sum(done.values()) != half:
+                failures.append(f"crash 직전 반영 {sum(done.values())} != {half}")
+            for i, want_written in enumerate((args.decisions - half, 0), 1):
+                r = _run_child("replay", inbound_id, args, spool, compact)
+                if r.returncode != 0:
+                    failures.append(f"replay {i}: exit {r.returncode}\n{r.stderr}")
+                    return failures
+                s = json.loads(r.stdout.strip().splitlines()[-1])
+                print(f"[{name}] replay {i}: {s}")
+                if s["written"] != want_written or s["backlog"] or s["unmatched"] or s["write_errors"]:
+                    failures.append(f"replay {i}: written {s['written']} (기대 {want_written}), {s}")
+        got = _classified(engine, inbound_id)
+        stock = _stock(engine)
+        delta = Counter({k: stock[k] - before[k] for k in set(stock) | set(before) if stock[k] != before[k]})
+        if got != expected:
+            failures.append(f"분류완료 상자 (물품, 창고)별 {dict(got)} != 판정 {dict(expected)}")
+        if delta != expected:
+            failures.append(f"warehouse_stock 증가 {dict(delta)} != 판정 {dict(expected)}")
+        print(f"[{name}] classified {sum(got.values()):,} boxes for {args.decisions:,} decisions,"
+              f" stock +{sum(delta.values()):,}: {'OK' if not failures else 'FAIL'}")
+    finally:
+        if not args.keep:
+            _cleanup(engine, inbound_id)
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="classifier spool crash/replay check")
+    parser.add_argument("--decisions", type=int, default=2000, help="라운드마다 보낼 판정 수")
+    parser.add_argument("--batch", type=int, default=100, help="SOY_CLASSIFY_WRITE_BATCH")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="시드한 입고 건을 지우지 않음")
+    parser.add_argument("--phase", choices=("crash", "replay"), help=argparse.SUPPRESS)
+    parser.add_argument("--inbound-id", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.phase == "crash":
+        asyncio.run(_child_crash(args))
+        return
+    if args.phase == "replay":
+        asyncio.run(_child_replay(args))
+        return
+
+    engine = get_engine()
+    with engine.connect() as conn:
+        classifier.replace_products(classifier.load_tx(conn))
+    expected: Counter = Counter()
+    for name, brand in _decisions(args.seed, args.decisions):
+        warehouse, pid = classifier.decide(name, brand)
+        if pid is None:
+            raise SystemExit(f"products 에 없는 물품: {name} ({brand}) — alembic upgrade head 먼저 실행")
+        expected[(pid, warehouse)] += 1
+
+    failures = []
+    for name, compact in _ROUNDS:
+        failures += [f"[{name}] {f}" for f in _round(engine, name, compact, args, expected)]
+    for f in failures:
+        print(f, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+컨베이어 시뮬레이터: 여러 분류키트가 UDP 로 센서 틱·QR 인식 이벤트와 classify 를 보내는 부하 테스트 (app.kit_bridge UDP).
+
+실행 (soy-server 디렉터리에서, 서버 기동 후):
+    uv run python -m bench.conveyor_simulator
+    uv run python -m bench.conveyor_simulator --kits 8 --boxes-per-sec 20 --tick-hz 200 --duration 20
+    uv run python -m bench.conveyor_simulator --loss 0.05          # 송신 패킷 5% 를 일부러 버려 재전송·중복 제거 확인
+
+키트마다 UDP 소켓 하나(= 서버가 보는 키트 하나). 키트는
+- 시작할 때 부팅 nonce(body.boot)를 하나 정해 모든 요청에 넣고 (서버는 boot 가 바뀌면 재시작으로 보고 순번 상태를 버림),
+- tick-hz 로 근접센서 틱 event 를 보내고 (ack 없음, 손실 허용),
+- boxes-per-sec 로 상자마다 qr_decoded event 와 classify 를 보냄. classify 응답(판정)이 retry-ms 안에 안 오면
+  같은 seq 로 재전송 (최대 --retries 번). 서버는 같은 seq 를 다시 처리하지 않고 저장해 둔 판정을 다시 보냄.
+출력: 보낸·받은 패킷 수와 초당 패킷 수, 판정 지연 p50/p95/p99/최대(ms, 첫 전송부터), 재전송·실패 수.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from bench.kit_simulator import PRODUCTS
+
+
+class _KitProtocol(asyncio.DatagramProtocol):
+    def __init__(self, kit: "_Kit"):
+        self.kit = kit
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.kit.on_response(data)
+
+
+class _Kit:
+    def __init__(self, args: argparse.Namespace, rng: random.Random):
+        self.args = args
+        self.rng = rng
+        self.transport: asyncio.DatagramTransport | None = None
+        self.boot = rng.getrandbits(32)
+        self.seq = 0
+        self.sent = 0
+        self.dropped_on_purpose = 0
+        self.received = 0
+        self.retries = 0
+        self.failed = 0
+        self.latencies: list[float] = []
+        self.pending: dict[int, tuple[float, bytes, asyncio.Future]] = {}
+
+    def _send(self, data: bytes) -> None:
+        self.sent += 1
+        if self.args.loss and self.rng.random() < self.args.loss:
+            self.dropped_on_purpose += 1
+            return
+        assert self.transport is not None
+        self.transport.sendto(data)
+
+    def _packet(self, action: str, body: dict) -> tuple[int, bytes]:
+        self.seq += 1
+        msg = {"type": "request", "id": self.seq, "action": action, "body": {**body, "boot": self.boot}}
+        return self.seq, json.dumps(msg, ensure_ascii=False).encode("utf-8")
+
+    def on_response(self, data: bytes) -> None:
+        self.received += 1
+        try:
+            resp = json.loads(data)
+        except ValueError:
+            return
+        entry = self.pending.pop(resp.get("id"), None)
+        if entry is None:
+            return  # 재전송에 대한 중복 응답
+        t0, _data, fut = entry
+        self.latencies.append((time.perf_counter() - t0) * 1000)
+        if not fut.done():
+            fut.set_result(resp)
+
+    async def _tick_loop(self, deadline: float) -> None:
+        interval = 1.0 / self.args.tick_hz
+        next_at = time.perf_counter()
+        while time.perf_counter() < deadline:
+            _seq, data = self._packet("event", {"kind": "tick", "sensor": "proximity"})
+            self._send(data)
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+    async def _classify(self, body: dict) -> None:
+        seq, data = self._packet("classify", body)
+        fut = asyncio.get_running_loop().create_future()
+        self.pending[seq] = (time.perf_counter(), data, fut)
+        self._send(data)
+        for attempt in range(self.args.retries + 1):
+            try:
+                await asyncio.wait_for(asyncio.shield(fut), timeout=self.args.retry_ms / 1000)
+                return
+            except asyncio.TimeoutError:
+                if attempt < self.args.retries:
+                    self.retries += 1
+                    self._send(data)
+        self.pending.pop(seq, None)
+        self.failed += 1
+
+    async def _box_loop(self, deadline: float) -> None:
+        interval = 1.0 / self.args.boxes_per_sec
+        next_at = time.perf_counter()
+        tasks = []
+        while time.perf_counter() < deadline:
+            name, brand = PRODUCTS[self.rng.randrange(len(PRODUCTS))]
+            body = {"product_name": name, "brand": brand}
+            if self.args.inbound_id is not None:
+                body["inbound_id"] = self.args.inbound_id
+            _seq, data = self._packet("event", {"kind": "qr_decoded"})
+            self._send(data)
+            tasks.append(asyncio.create_task(self._classify(body)))
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        await asyncio.gather(*tasks)
+
+    async def run(self, deadline: float) -> None:
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: _KitProtocol(self), remote_addr=(self.args.host, self.args.port)
+        )
+        try:
+            await asyncio.gather(self._tick_loop(deadline), self._box_loop(deadline))
+        finally:
+            self.transport.close()
+
+
+def _pct(values: list[float], p: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+async def _main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    kits = [_Kit(args, random.Random(rng.random())) for _ in range(args.kits)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(k.run(t0 + args.duration) for k in kits))
+    elapsed = time.perf_counter() - t0
+
+    sent = sum(k.sent for k in kits)
+    received = sum(k.received for k in kits)
+    lat = sorted(x for k in kits for x in k.latencies)
+    print(
+        f"kits={args.kits} tick={args.tick_hz}Hz boxes={args.boxes_per_sec}/s/kit"
+        f" loss={args.loss:.0%} duration={elapsed:.1f}s"
+    )
+    print(f"packets sent {sent:,} ({sent / elapsed:,.0f}/s), received {received:,} ({received / elapsed:,.0f}/s)")
+    print(
+        f"decisions {len(lat):,}: p50 {_pct(lat, 0.50):.2f}  p95 {_pct(lat, 0.95):.2f}"
+        f"  p99 {_pct(lat, 0.99):.2f}  max {lat[-1] if lat else 0:.2f} ms"
+    )
+    print(
+        f"retries {sum(k.retries for k in kits):,}, failed {sum(k.failed for k in kits):,},"
+        f" dropped on purpose {sum(k.dropped_on_purpose for k in kits):,}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SoyController UDP conveyor load generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9002, help="SOY_KIT_UDP_PORT")
+    parser.add_argument("--kits", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0, help="초")
+    parser.add_argument("--tick-hz", type=float, default=100.0, help="키트당 센서 틱 event 빈도")
+    parser.add_argument("--boxes-per-sec", type=float, default=10.0, help="키트당 상자(qr_decoded + classify) 빈도")
+    parser.add_argument("--retry-ms", type=float, default=50.0, help="classify 응답 대기 후 재전송까지(ms)")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--loss", type=float, default=0.0, help="송신 패킷을 일부러 버리는 비율 (0~1)")
+    parser.add_argument("--inbound-id", type=int, default=None, help="classify 에 넣을 입고 id (DB 반영 포함)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+NDJSON 프레이밍 벤치마크: 기존 방식(buf += chunk; split) vs app.framing.LineFramer.
+
+실행 (soy-server 디렉터리에서):
+    uv run python -m bench.framing
+    uv run python -m bench.framing --lines 2000 --chunk 4096
+
+1KB / 100KB 줄을 연속으로 붙인 스트림을 recv 크기(chunk) 단위로 잘라 넣고 초당 줄 수를 출력.
+"""
+import argparse
+import time
+
+from app.framing import LineFramer
+
+
+def _naive(chunks: list[bytes]) -> int:
+    n = 0
+    buf = b""
+    for chunk in chunks:
+        buf += chunk
+        while b"\n" in buf:
+            line, buf = buf.split(b"\n", 1)
+            n += 1
+    return n
+
+
+def _framer(chunks: list[bytes]) -> int:
+    n = 0
+    framer = LineFramer()
+    for chunk in chunks:
+        framer.feed(chunk)
+        while framer.next_line() is not None:
+            n += 1
+    return n
+
+
+def _make_chunks(payload_size: int, lines: int, chunk_size: int) -> list[bytes]:
+    line = b"{" + b"x" * (payload_size - 3) + b"}\n"
+    stream = line * lines
+    return [stream[i : i + chunk_size] for i in range(0, len(stream), chunk_size)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NDJSON framing benchmark")
+    parser.add_argument("--lines", type=int, default=5000, help="줄 수 (페이로드별)")
+    parser.add_argument("--chunk", type=int, default=65536, help="recv 크기(바이트)")
+    args = parser.parse_args()
+
+    print(f"{'payload':>8} {'method':>8} {'lines/s':>12} {'MB/s':>9}")
+    for payload in (1024, 100 * 1024):
+        # 100KB 줄은 줄 수를 줄여 스트림 크기를 비슷하게 맞춤
+        lines = args.lines if payload <= 1024 else max(50, args.lines // 20)
+        chunks = _make_chunks(payload, lines, args.chunk)
+        for name, fn in (("naive", _naive), ("framer", _framer)):
+            t0 = time.perf_counter()
+            n = fn(chunks)
+            dt = time.perf_counter() - t0
+            assert n == lines, (name, n, lines)
+            mb = payload * lines / dt / 1e6
+            print(f"{payload // 1024:>6}KB {name:>8} {n / dt:>12,.0f} {mb:>9,.1f}")
+
+
+if __name__ == "__main__":
+    main()
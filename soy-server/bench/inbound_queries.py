@@ -0,0 +1,149 @@
+"""
+inbound_items 조회 벤치마크 (마이그레이션 005 인덱스). MySQL 전용 — SOY_DATABASE_URL 또는 MYSQL_* 의 DB 사용.
+
+실행 (soy-server 디렉터리에서, alembic upgrade head 이후):
+    uv run python -m bench.inbound_queries
+    uv run python -m bench.inbound_queries --boxes 200000 --repeat 50
+    uv run python -m bench.inbound_queries --skip-seed      # 이미 있는 데이터로만 측정
+
+기존 최대 inbound_id 다음부터 --boxes 개의 상자(입고 1건당 --per-inbound 개)를 시드하고,
+창고 현황 / 입고별 진행률 / 하루 기간 집계 쿼리를 인덱스 사용 vs IGNORE INDEX 로 각각 --repeat 번 실행해
+중앙값·p95 지연(ms)과 EXPLAIN 의 key 를 출력. 끝나면 시드한 행을 지움 (--keep 이면 남김).
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.database import get_engine
+
+_STATUSES = (("분류완료", 60), ("출고됨", 25), ("미분류", 15))  # (상태, 비율 %)
+_INSERT_BATCH = 5000
+
+_QUERIES = [
+    (
+        "창고 현황",
+        "idx_inbound_items_status_product_warehouse",
+        "SELECT product_id, warehouse, COUNT(*) FROM inbound_items {hint}"
+        " WHERE status = '분류완료' GROUP BY product_id, warehouse",
+    ),
+    (
+        "입고별 진행률",
+        "idx_inbound_items_inbound_status",
+        "SELECT status, COUNT(*) FROM inbound_items {hint} WHERE inbound_id = :inbound_id GROUP BY status",
+    ),
+    (
+        "기간 집계(1일)",
+        "idx_inbound_items_classified_at",
+        "SELECT COUNT(*) FROM inbound_items {hint} WHERE classified_at >= :since AND classified_at < :until",
+    ),
+]
+
+
+def _seed(conn: Connection, base: int, boxes: int, per_inbound: int, rng: random.Random) -> None:
+    products = conn.execute(text("SELECT product_id, shipping_destination FROM products")).fetchall()
+    if not products:
+        raise SystemExit("products 테이블이 비어 있습니다 (alembic upgrade head 먼저 실행)")
+    statuses = [s for s, pct in _STATUSES for _ in range(pct)]
+    now = datetime.now().replace(microsecond=0)
+    inbounds = (boxes + per_inbound - 1) // per_inbound
+    raw = conn.connection.dbapi_connection
+    with raw.cursor() as cur:
+        for start in range(0, inbounds, _INSERT_BATCH):
+            cur.executemany(
+                "INSERT INTO inbounds (inbound_id, status) VALUES (%s, '완료')",
+                [(base + i,) for i in range(start, min(inbounds, start + _INSERT_BATCH))],
+            )
+        rows = []
+        for n in range(boxes):
+            product_id, destination = products[rng.randrange(len(products))]
+            status = statuses[rng.randrange(len(statuses))]
+            if status == "미분류":
+                classified, warehouse, outbound = None, None, None
+            else:
+                classified = now - timedelta(seconds=rng.randrange(365 * 86400))
+                warehouse = destination
+                outbound = classified + timedelta(days=1) if status == "출고됨" else None
+            rows.append((base + n // per_inbound, product_id, status, classified, warehouse, outbound))
+            if len(rows) >= _INSERT_BATCH:
+                _insert_items(cur, rows)
+                rows = []
+        if rows:
+            _insert_items(cur, rows)
+    raw.commit()
+
+
+def _insert_items(cur, rows: list[tuple]) -> None:
+    # pymysql executemany 는 INSERT ... VALUES 를 다중 행 문장으로 묶어 보냄
+    cur.executemany(
+        "INSERT INTO inbound_items (inbound_id, product_id, status, classified_at, warehouse, outbound_at)"
+        " VALUES (%s, %s, %s, %s, %s, %s)",
+        rows,
+    )
+
+
+def _measure(conn: Connection, sql: str, params: dict, repeat: int) -> tuple[float, float]:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return statistics.median(times), times[min(len(times) - 1, int(len(times) * 0.95))]
+
+
+def _explain_key(conn: Connection, sql: str, params: dict) -> str:
+    row = conn.execute(text("EXPLAIN " + sql), params).mappings().first()
+    return (row or {}).get("key") or "(full scan)"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="inbound_items index benchmark (MySQL)")
+    parser.add_argument("--boxes", type=int, default=1_000_000, help="시드할 상자(inbound_items 행) 수")
+    parser.add_argument("--per-inbound", type=int, default=50, help="입고 1건당 상자 수")
+    parser.add_argument("--repeat", type=int, default=20, help="쿼리당 반복 횟수")
+    parser.add_argument("--seed", type=int, default=1, help="난수 시드")
+    parser.add_argument("--skip-seed", action="store_true", help="시드하지 않고 기존 데이터로 측정")
+    parser.add_argument("--keep", action="store_true", help="시드한 행을 지우지 않음")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    if engine.dialect.name != "mysql":
+        raise SystemExit(f"MySQL 전용입니다 (현재: {engine.dialect.name})")
+
+    with engine.connect() as conn:
+        base = int(conn.execute(text("SELECT COALESCE(MAX(inbound_id), 0) FROM inbounds")).scalar()) + 1
+        seeded = False
+        if not args.skip_seed and args.boxes > 0:
+            t0 = time.perf_counter()
+            _seed(conn, base, args.boxes, max(1, args.per_inbound), random.Random(args.seed))
+            seeded = True
+            print(f"seeded {args.boxes:,} boxes in {time.perf_counter() - t0:.1f}s (inbound_id >= {base})")
+        conn.execute(text("ANALYZE TABLE inbound_items")).fetchall()
+        total = int(conn.execute(text("SELECT COUNT(*) FROM inbound_items")).scalar())
+        sample = conn.execute(text("SELECT MAX(inbound_id) FROM inbound_items")).scalar() or 0
+        day = (datetime.now() - timedelta(days=30)).replace(hour=0, minute=0, second=0, microsecond=0)
+        params = {"inbound_id": sample, "since": day, "until": day + timedelta(days=1)}
+        print(f"inbound_items rows: {total:,}")
+
+        try:
+            print(f"{'query':>14} {'mode':>13} {'key':>44} {'p50 ms':>9} {'p95 ms':>9}")
+            for label, index, sql in _QUERIES:
+                for mode, hint in (("index", ""), ("ignore index", f"IGNORE INDEX (`{index}`)")):
+                    q = sql.format(hint=hint)
+                    key = _explain_key(conn, q, params)
+                    p50, p95 = _measure(conn, q, params, max(1, args.repeat))
+                    print(f"{label:>14} {mode:>13} {key:>44} {p50:>9.2f} {p95:>9.2f}")
+        finally:
+            if seeded and not args.keep:
+                conn.execute(text("DELETE FROM inbound_items WHERE inbound_id >= :base"), {"base": base})
+                conn.execute(text("DELETE FROM inbounds WHERE inbound_id >= :base"), {"base": base})
+                conn.commit()
+
+
+if __name__ == "__main__":
+    main()
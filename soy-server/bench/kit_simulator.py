@@ -0,0 +1,141 @@
+"""
+분류키트 시뮬레이터: 여러 SoyController 가 SoyServer(app.kit_bridge)에 classify 요청을 보내는 부하 테스트.
+
+실행 (soy-server 디렉터리에서, 서버 기동 후):
+    uv run python -m bench.kit_simulator
+    uv run python -m bench.kit_simulator --kits 8 --requests 20000 --window 4
+    uv run python -m bench.kit_simulator --rate 50 --duration 30 --inbound-id 12   # 키트당 초당 50상자, DB 반영 포함
+
+키트마다 TCP 연결 하나. --rate 를 주지 않으면 응답을 받는 즉시 다음 요청 (window 개까지 응답 대기 없이 연달아).
+요청마다 왕복 시간을 재서 처리량과 p50/p95/p99/최대 지연(ms)을 출력.
+--inbound-id 를 주면 요청에 넣어 서버가 그 입고 건의 미분류 상자를 분류완료로 기록 (없으면 판정만).
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+# 마이그레이션 003 의 products (물품명, 브랜드)
+PRODUCTS = [
+    (name, brand)
+    for name in ("국간장", "진간장", "Soy sauce", "Dark soy sauce")
+    for brand in ("샘표", "청정원")
+]
+
+
+class _Kit:
+    def __init__(self, idx: int, args: argparse.Namespace, rng: random.Random):
+        self.idx = idx
+        self.args = args
+        self.rng = rng
+        self.latencies: list[float] = []
+        self.warehouses: dict[str, int] = {}
+        self.errors = 0
+        self._sent_at: dict[int, float] = {}
+        self._next_id = 0
+
+    def _request(self) -> bytes:
+        self._next_id += 1
+        if self.rng.random() < self.args.unknown:
+            name, brand = "알 수 없는 간장", "무명"
+        else:
+            name, brand = PRODUCTS[self.rng.randrange(len(PRODUCTS))]
+        body = {"product_name": name, "brand": brand}
+        if self.args.inbound_id is not None:
+            body["inbound_id"] = self.args.inbound_id
+        self._sent_at[self._next_id] = time.perf_counter()
+        msg = {"type": "request", "id": self._next_id, "action": "classify", "body": body}
+        return (json.dumps(msg, ensure_ascii=False) + "\n").encode("utf-8")
+
+    async def run(self, total: int, deadline: float | None) -> None:
+        reader, writer = await asyncio.open_connection(self.args.host, self.args.port)
+        interval = 1.0 / self.args.rate if self.args.rate else 0.0
+        window = asyncio.Semaphore(max(1, self.args.window))
+        sent = 0
+
+        async def read_loop() -> None:
+            done = 0
+            while done < sent or not sending_done.is_set():
+                line = await reader.readline()
+                if not line:
+                    return
+                resp = json.loads(line)
+                t0 = self._sent_at.pop(resp.get("id"), None)
+                if t0 is not None:
+                    self.latencies.append((time.perf_counter() - t0) * 1000)
+                if resp.get("ok"):
+                    wh = (resp.get("body") or {}).get("warehouse", "?")
+                    self.warehouses[wh] = self.warehouses.get(wh, 0) + 1
+                else:
+                    self.errors += 1
+                done += 1
+                window.release()
+
+        sending_done = asyncio.Event()
+        reader_task = asyncio.create_task(read_loop())
+        next_at = time.perf_counter()
+        while sent < total and (deadline is None or time.perf_counter() < deadline):
+            await window.acquire()
+            if interval:
+                next_at += interval
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            writer.write(self._request())
+            sent += 1
+            await writer.drain()
+        sending_done.set()
+        try:
+            await asyncio.wait_for(reader_task, timeout=10)
+        except asyncio.TimeoutError:
+            reader_task.cancel()
+        writer.close()
+
+
+def _pct(values: list[float], p: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+async def _main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    kits = [_Kit(i, args, random.Random(rng.random())) for i in range(args.kits)]
+    per_kit = args.requests // args.kits if args.duration is None else 1 << 62
+    t0 = time.perf_counter()
+    deadline = t0 + args.duration if args.duration is not None else None
+    await asyncio.gather(*(k.run(per_kit, deadline) for k in kits))
+    elapsed = time.perf_counter() - t0
+
+    lat = sorted(x for k in kits for x in k.latencies)
+    warehouses: dict[str, int] = {}
+    for k in kits:
+        for wh, n in k.warehouses.items():
+            warehouses[wh] = warehouses.get(wh, 0) + n
+    errors = sum(k.errors for k in kits)
+    print(f"kits={args.kits} window={args.window} rate={args.rate or 'max'}/s/kit")
+    print(f"responses {len(lat):,} in {elapsed:.2f}s -> {len(lat) / elapsed:,.0f} req/s, errors {errors}")
+    print(
+        f"latency ms: p50 {_pct(lat, 0.50):.2f}  p95 {_pct(lat, 0.95):.2f}"
+        f"  p99 {_pct(lat, 0.99):.2f}  max {lat[-1] if lat else 0:.2f}"
+    )
+    print("warehouses:", ", ".join(f"{wh} {n:,}" for wh, n in sorted(warehouses.items())))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SoyController classify load generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9002, help="SOY_KIT_TCP_PORT")
+    parser.add_argument("--kits", type=int, default=4, help="동시 키트(연결) 수")
+    parser.add_argument("--requests", type=int, default=10000, help="전체 요청 수 (--duration 이 없을 때)")
+    parser.add_argument("--duration", type=float, default=None, help="요청 수 대신 이 시간(초) 동안 전송")
+    parser.add_argument("--rate", type=float, default=0, help="키트당 초당 요청 수 (0=응답 받는 대로)")
+    parser.add_argument("--window", type=int, default=1, help="키트당 응답 대기 없이 보낼 수 있는 요청 수")
+    parser.add_argument("--unknown", type=float, default=0.02, help="등록되지 않은 물품 비율")
+    parser.add_argument("--inbound-id", type=int, default=None, help="요청에 넣을 입고 id (DB 반영 포함 측정)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+와이어 프로토콜 벤치마크: NDJSON(표준 json / app.codec) vs 길이 prefix MessagePack.
+
+실행 (soy-server 디렉터리에서):
+    uv run python -m bench.protocol
+    uv run python -m bench.protocol --rows 5000
+
+메시지별로 전송 바이트 수와 메시지 1개당 인코딩+프레이밍+디코딩 CPU 시간(µs)을 출력.
+"""
+import argparse
+import json
+import time
+
+from app import codec
+from app.framing import FrameReader, LineFramer, frame
+
+
+def _workers_response(rows: int) -> dict:
+    return {
+        "type": "response",
+        "id": 42,
+        "ok": True,
+        "body": [
+            {
+                "worker_id": i,
+                "admin_id": 1,
+                "name": f"작업자{i}",
+                "card_uid": f"{i:08X}",
+                "created_at": "2026-03-01T09:00:00",
+            }
+            for i in range(1, rows + 1)
+        ],
+        "error": None,
+    }
+
+
+def _messages(rows: int) -> list[tuple[str, dict]]:
+    return [
+        ("request", {"type": "request", "id": 7, "action": "list_workers", "body": {"auth_token": "0" * 36}}),
+        ("card_read", {"type": "card_read", "source": "register_controller", "uid": "A1B2C3D4"}),
+        (f"workers x{rows}", _workers_response(rows)),
+    ]
+
+
+def _stdlib_roundtrip(obj: dict) -> int:
+    data = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+    framer = LineFramer()
+    framer.feed(data)
+    json.loads(framer.next_line().decode("utf-8"))
+    return len(data)
+
+
+def _ndjson_roundtrip(obj: dict) -> int:
+    data = codec.dumps(obj) + b"\n"
+    framer = LineFramer()
+    framer.feed(data)
+    codec.decode_message(framer.next_line())
+    return len(data)
+
+
+def _msgpack_roundtrip(obj: dict) -> int:
+    data = frame(codec.pack(obj))
+    reader = FrameReader()
+    reader.feed(data)
+    codec.decode_message(reader.next_frame(), binary=True)
+    return len(data)
+
+
+def _measure(fn, obj: dict, min_time: float) -> tuple[int, float]:
+    size = fn(obj)
+    n = 0
+    t0 = time.process_time()
+    while True:
+        for _ in range(10):
+            fn(obj)
+        n += 10
+        dt = time.process_time() - t0
+        if dt >= min_time:
+            return size, dt / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NDJSON vs MessagePack wire benchmark")
+    parser.add_argument("--rows", type=int, default=2000, help="list_workers 응답 행 수")
+    parser.add_argument("--min-time", type=float, default=0.5, help="측정당 최소 CPU 시간(초)")
+    args = parser.parse_args()
+
+    methods = [("json(stdlib)", _stdlib_roundtrip), (f"ndjson({codec.BACKEND})", _ndjson_roundtrip)]
+    if codec.HAS_MSGPACK:
+        methods.append(("msgpack", _msgpack_roundtrip))
+    else:
+        print("(msgspec/msgpack 미설치: MessagePack 생략)")
+
+    print(f"{'message':>14} {'method':>16} {'bytes':>10} {'µs/msg':>10}")
+    for label, obj in _messages(args.rows):
+        for name, fn in methods:
+            size, us = _measure(fn, obj, args.min_time)
+            print(f"{label:>14} {name:>16} {size:>10,} {us:>10,.1f}")
+
+
+if __name__ == "__main__":
+    main()